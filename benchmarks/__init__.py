@@ -0,0 +1,2 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+"""Benchmarks of pyclinsci package."""
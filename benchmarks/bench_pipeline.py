@@ -0,0 +1,467 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+r"""Benchmark the load -> map -> figure pipeline of pyclinsci package.
+
+Synthetic patient-level datasets of increasing size and country cardinality
+are generated in a temporary directory, then each stage of the pipeline is
+timed (best of several runs) and memory-profiled. Peak memory is the peak of
+allocations traced with `tracemalloc` (Python objects, numpy and pandas
+buffers). Buffers allocated by Arrow (pyarrow readers, Arrow-backed columns)
+are not traced, so the peak of Arrow allocations is sampled separately.
+Benchmarked stages are:
+
+- package import (lazy import, and import of GeoData dependencies);
+- loading of each file format with `GenericData` (without and with cache);
+- ISO-3 mapping of the `Country` column;
+- parsing of the ISO-3 file with `load_iso3_file`;
+- per-country aggregation, and `build_figure` (built and cached).
+
+Results are written in a JSON file, and compared with a baseline file if one
+is given. The run fails if a stage is slower than the baseline by more than
+the threshold.
+
+.. code-block:: bash
+    :linenos:
+    :caption: Code example
+
+    # Run benchmarks up to 10^5 rows and store them as baseline
+    python benchmarks/bench_pipeline.py --sizes 1e3 1e4 1e5 \
+        --output benchmarks/baseline.json
+
+    # Compare a new run with the baseline
+    python benchmarks/bench_pipeline.py --sizes 1e3 1e4 1e5 \
+        --baseline benchmarks/baseline.json
+"""
+
+# Import libraries and objects
+import argparse
+import importlib
+import json
+import platform
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC, datetime
+from importlib.util import find_spec
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+
+import numpy as np
+import pyclinsci
+from loguru import logger
+from pandas import DataFrame
+from pyclinsci import DataCache, GeoData, config_logging
+from pyclinsci._iso3 import ISO3_REGISTRY
+from pyclinsci._loaders import load_file
+
+EXCEL_MAX_ROWS = 100_000
+"""Maximum number of rows of Excel benchmarks (writing and reading larger
+workbooks takes several minutes)."""
+
+FORMATS = {
+    "excel"  : ".xlsx",
+    "csv"    : ".csv",
+    "parquet": ".parquet",
+    "feather": ".feather",
+}
+"""File extension of each benchmarked file format."""
+
+
+def make_dataset(rows: int, countries: int, seed: int = 0) -> DataFrame:
+    """Generate a synthetic patient-level dataset.
+
+    Parameters:
+        rows (int): Number of rows (patients).
+        countries (int): Number of distinct countries, taken from the ISO-3
+            dictionary of the package.
+        seed (int, default=0): Seed of the random generator.
+
+    Returns:
+        DataFrame: The dataset, with `Country`, `Site`, `Arm`, `Age`, `Event`
+            and `Data` columns.
+
+    Raises:
+        ValueError: If the ISO-3 dictionary has fewer countries than requested.
+
+    """
+    # Control if enough countries are known
+    names = sorted(ISO3_REGISTRY.country_to_iso3)
+    if countries > len(names):
+        log_error  = f"Dataset cannot have {countries} countries, as the "
+        log_error += f"ISO-3 dictionary only has {len(names)} countries."
+        logger.error(log_error)
+        raise ValueError(log_error)
+
+    # Draw rows out of the first countries
+    rng = np.random.default_rng(seed)
+    names = names[:countries]
+    return DataFrame({
+        "Country": rng.choice(np.array(names, dtype=object), rows),
+        "Site"   : rng.integers(0, 500, rows).astype(str).astype(object),
+        "Arm"    : rng.choice(np.array(["A", "B"], dtype=object), rows),
+        "Age"    : rng.integers(18, 90, rows),
+        "Event"  : rng.random(rows) < 0.2,  # noqa: PLR2004
+        "Data"   : rng.random(rows),
+    })
+
+
+class ArrowSampler:
+    """Sample the peak of memory allocated by Arrow in a background thread.
+
+    Arrow buffers are allocated by the memory pool of `pyarrow`, which is not
+    seen by `tracemalloc`, and the pool only records the peak of the whole
+    process. Allocated bytes are therefore sampled while the context runs,
+    relative to the bytes allocated when it started.
+    """
+
+    def __init__(self: "ArrowSampler", interval: float = 0.001) -> None:
+        """Initialize the sampler with the sampling interval (in seconds)."""
+        self.interval = interval
+        self.peak_mb: float | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self: "ArrowSampler") -> "ArrowSampler":
+        """Start sampling if `pyarrow` is installed."""
+        if find_spec("pyarrow") is not None:
+            pyarrow = importlib.import_module("pyarrow")
+            start = pyarrow.total_allocated_bytes()
+            self.peak_mb = 0.0
+
+            def sample() -> None:
+                while True:
+                    used = pyarrow.total_allocated_bytes() - start
+                    self.peak_mb = max(self.peak_mb, used / 1024**2)
+                    if self._stop.wait(self.interval):
+                        return
+
+            self._thread = threading.Thread(target=sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self: "ArrowSampler", *args: object) -> None:
+        """Stop sampling, after a last sample."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def measure(
+    func: Callable[[], Any],
+    repeat: int = 3,
+    setup: Callable[[], Any] | None = None,
+) -> dict[str, float]:
+    """Time and memory-profile a function.
+
+    Parameters:
+        func (Callable[[], Any]): The function to be measured.
+        repeat (int, default=3): Number of timed runs (the best one is kept).
+        setup (Callable[[], Any], default=None): Function called before each
+            run, outside of measurements.
+
+    Returns:
+        dict[str, float]: Best duration (in seconds), peak memory traced by
+            `tracemalloc` and peak memory allocated by Arrow (in MB, sampled
+            every millisecond, None if `pyarrow` is not installed).
+
+    """
+    # Time function (without tracing memory)
+    durations = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start_time = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start_time)
+
+    # Profile memory in a separate run
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        with ArrowSampler() as arrow:
+            func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds" : min(durations),
+        "peak_mb" : peak / 1024**2,
+        "arrow_mb": arrow.peak_mb,
+    }
+
+
+def bench_import() -> list[dict[str, Any]]:
+    """Benchmark import of the package in fresh interpreters."""
+    results = []
+    for name, code in [
+        ("import", "import pyclinsci"),
+        ("import_geodata", "import pyclinsci; pyclinsci.GeoData"),
+    ]:
+        def run(code: str = code) -> None:
+            subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
+
+        results.append({"name": name, **measure(run)})
+        results[-1].update(peak_mb=None, arrow_mb=None)
+    return results
+
+
+def bench_dataset(
+    data: DataFrame,
+    countries: int,
+    work_dir: Path,
+    repeat: int,
+) -> list[dict[str, Any]]:
+    """Benchmark the pipeline on a dataset.
+
+    Parameters:
+        data (DataFrame): The synthetic dataset.
+        countries (int): Number of distinct countries of the dataset.
+        work_dir (Path): Directory where files are written.
+        repeat (int): Number of timed runs of each stage.
+
+    Returns:
+        list[dict[str, Any]]: The results of each stage.
+
+    """
+    results = []
+    key = {"rows": len(data), "countries": countries}
+
+    # Load each file format
+    for file_format, ext in FORMATS.items():
+        if file_format == "excel" and len(data) > EXCEL_MAX_ROWS:
+            continue
+        file_path = work_dir / f"data_{len(data)}_{countries}{ext}"
+        if file_format == "excel":
+            data.to_excel(file_path, index=False)
+        elif file_format == "csv":
+            data.to_csv(file_path, index=False)
+        else:
+            getattr(data, f"to_{file_format}")(file_path)
+
+        # Measure loader, GeoData without cache, and GeoData from cache
+        data_cache = DataCache(cache_dir=work_dir / "cache")
+        GeoData(file_path=file_path, cache=data_cache)
+        for name, func in [
+            ("load_file", lambda path=file_path: load_file(path)),
+            ("geodata_load", lambda path=file_path: GeoData(
+                file_path=path,
+                cache=False,
+            )),
+            ("geodata_cached", lambda path=file_path, cache=data_cache: \
+                GeoData(file_path=path, cache=cache)),
+        ]:
+            results.append({
+                "name"  : name,
+                "format": file_format,
+                **key,
+                **measure(func, repeat),
+            })
+        data_cache.clear()
+
+    # Map countries to ISO-3 codes
+    iso3_code = ISO3_REGISTRY.country_to_iso3
+    results.append({
+        "name": "map_iso3_codes",
+        **key,
+        **measure(
+            lambda: GeoData.map_iso3_codes(data["Country"], iso3_code),
+            repeat,
+        ),
+    })
+
+    # Aggregate data and build figure
+    geo_data = GeoData.from_frame(data)
+    results.append({
+        "name": "aggregate",
+        **key,
+        **measure(
+            lambda: geo_data.aggregate({
+                "Data": "count",
+                "Age" : ("median", "Age"),
+            }),
+            repeat,
+        ),
+    })
+    geo_map = geo_data.aggregate({"Data": "count"})
+    results.append({
+        "name": "build_figure",
+        **key,
+        **measure(
+            geo_map.build_figure,
+            repeat,
+            geo_map.invalidate_figure_cache,
+        ),
+    })
+    results.append({
+        "name": "build_figure_cached",
+        **key,
+        **measure(geo_map.build_figure, repeat),
+    })
+
+    return results
+
+
+def compare(
+    results: list[dict[str, Any]],
+    baseline: list[dict[str, Any]],
+    threshold: float,
+    min_delta: float,
+) -> list[dict[str, Any]]:
+    """Compare results with baseline results.
+
+    Parameters:
+        results (list[dict[str, Any]]): The results of the run.
+        baseline (list[dict[str, Any]]): The results of the baseline run.
+        threshold (float): Maximum ratio of durations before a stage is
+            considered as regressed.
+        min_delta (float): Minimum difference of durations (in seconds)
+            before a stage is considered as regressed, so that timer noise
+            of very fast stages is ignored.
+
+    Returns:
+        list[dict[str, Any]]: The results with `baseline_seconds`, `ratio`
+            and `regression` fields for stages found in the baseline.
+
+    """
+    # Index baseline results by stage
+    def key(result: dict[str, Any]) -> tuple:
+        return tuple(
+            result.get(field)
+            for field in ("name", "format", "rows", "countries")
+        )
+
+    base = {key(result): result for result in baseline}
+
+    # Compare durations
+    for result in results:
+        if (ref := base.get(key(result))) is None:
+            continue
+        result["baseline_seconds"] = ref["seconds"]
+        result["ratio"] = result["seconds"] / max(ref["seconds"], 1e-9)
+        result["regression"] = result["ratio"] > threshold and \
+            result["seconds"] - ref["seconds"] > min_delta
+
+    return results
+
+
+def report(results: list[dict[str, Any]]) -> str:
+    """Build a text table of results."""
+    lines = [
+        f"{'Stage':<20} {'Format':<8} {'Rows':>9} {'Ctry':>5} "
+        f"{'Seconds':>9} {'Peak MB':>8} {'Arrow MB':>8} {'Ratio':>6}",
+    ]
+    for result in results:
+        peak, ratio = result.get("peak_mb"), result.get("ratio")
+        arrow = result.get("arrow_mb")
+        lines.append(
+            f"{result['name']:<20} {result.get('format') or '':<8} "
+            f"{result.get('rows') or '':>9} "
+            f"{result.get('countries') or '':>5} "
+            f"{result['seconds']:>9.4f} "
+            f"{'' if peak is None else f'{peak:.1f}':>8} "
+            f"{'' if arrow is None else f'{arrow:.1f}':>8} "
+            f"{'' if ratio is None else f'{ratio:.2f}':>6}"
+            f"{' REGRESSION' if result.get('regression') else ''}",
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run benchmarks from the command line.
+
+    Parameters:
+        argv (list[str], default=None): Command line arguments.
+
+    Returns:
+        int: Exit code (1 if a stage regressed compared to the baseline).
+
+    """
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=float,
+        default=[1e3, 1e4, 1e5, 1e6, 1e7],
+        help="numbers of rows of the datasets",
+    )
+    parser.add_argument(
+        "--countries",
+        nargs="+",
+        type=int,
+        default=[10, 150],
+        help="numbers of distinct countries of the datasets (at most the "
+        "number of countries of the ISO-3 dictionary)",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks/results/latest.json"),
+    )
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument("--min-delta", type=float, default=0.005)
+    args = parser.parse_args(argv)
+    config_logging()
+    if max(args.countries) > len(ISO3_REGISTRY.country_to_iso3):
+        parser.error(
+            "--countries cannot exceed the "
+            f"{len(ISO3_REGISTRY.country_to_iso3)} countries of the ISO-3 "
+            "dictionary",
+        )
+
+    # Run benchmarks
+    results = bench_import()
+    ISO3_REGISTRY.invalidate()
+    results.append({"name": "load_iso3_file", **measure(
+        GeoData.load_iso3_file,
+        args.repeat,
+        ISO3_REGISTRY.invalidate,
+    )})
+    with TemporaryDirectory() as work_dir:
+        for size in args.sizes:
+            for countries in args.countries:
+                data = make_dataset(int(size), countries)
+                results += bench_dataset(
+                    data,
+                    countries,
+                    Path(work_dir),
+                    args.repeat,
+                )
+
+    # Compare with baseline
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        results = compare(
+            results,
+            baseline,
+            args.threshold,
+            args.min_delta,
+        )
+
+    # Write results
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({
+        "meta"   : {
+            "date"     : datetime.now(tz=UTC).isoformat(),
+            "python"   : platform.python_version(),
+            "platform" : platform.platform(),
+            "processor": platform.processor(),
+            "pyclinsci": pyclinsci.__version__,
+            "repeat"   : args.repeat,
+        },
+        "results": results,
+    }, indent=2))
+    print(report(results))  # noqa: T201
+
+    return int(any(result.get("regression") for result in results))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,29 +5,93 @@
 activities. Beyond gathering different tools, the objective of this module is
 to provide different method or classes to simplify development of new tools
 and accelerate development of these tools.
+
+Package objects are imported lazily: heavy dependencies (pandas, plotly,
+PyQt6...) are only imported when an object needing them is first accessed.
 """
 
 # Import libraries and objects
-from pyclinsci._data import GenericData, GeoData
-from pyclinsci._decorators import method_exec_dur
-from pyclinsci._files import dialog_select_file_dir
-from pyclinsci._settings import (
-    MODULE_NAME,
-    MODULE_PATH,
-    __version__,
-    __version_info__,
-    config_logging,
-)
+from importlib import import_module
+from typing import Any
+
+# Declare modules of package objects
+_LAZY_OBJECTS = {
+    "Aggregator"            : "pyclinsci._aggregate",
+    "Metric"                : "pyclinsci._aggregate",
+    "DataCache"             : "pyclinsci._cache",
+    "CountryResolver"       : "pyclinsci._countries",
+    "COUNTRY_RESOLVER"      : "pyclinsci._countries",
+    "GenericData"           : "pyclinsci._data",
+    "GeoData"               : "pyclinsci._data",
+    "compact_frame"         : "pyclinsci._dtypes",
+    "FigureSpec"            : "pyclinsci._render",
+    "render_figures"        : "pyclinsci._render",
+    "method_exec_dur"       : "pyclinsci._decorators",
+    "profiler"              : "pyclinsci._decorators",
+    "dialog_select_file_dir": "pyclinsci._files",
+    "select_files"          : "pyclinsci._files",
+    "register_loader"       : "pyclinsci._loaders",
+    "MODULE_NAME"           : "pyclinsci._settings",
+    "MODULE_PATH"           : "pyclinsci._settings",
+    "__version__"           : "pyclinsci._settings",
+    "__version_info__"      : "pyclinsci._settings",
+    "config_logging"        : "pyclinsci._settings",
+    "SharedData"            : "pyclinsci._shared",
+    "register_writer"       : "pyclinsci._writers",
+    "write_file"            : "pyclinsci._writers",
+}
 
 # Declare package methods
 __all__ = [
+    "Aggregator",
+    "Metric",
+    "DataCache",
+    "CountryResolver",
+    "COUNTRY_RESOLVER",
     "GenericData",
     "GeoData",
+    "compact_frame",
+    "FigureSpec",
+    "render_figures",
     "method_exec_dur",
+    "profiler",
     "dialog_select_file_dir",
+    "select_files",
+    "register_loader",
     "MODULE_NAME",
     "MODULE_PATH",
     "__version__",
     "__version_info__",
     "config_logging",
+    "SharedData",
+    "register_writer",
+    "write_file",
 ]
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import package objects on first access.
+
+    Parameters:
+        name (str): Name of the package object.
+
+    Returns:
+        Any: The package object.
+
+    Raises:
+        AttributeError: If the package has no such object.
+
+    """
+    if name not in _LAZY_OBJECTS:
+        err_msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(err_msg)
+
+    # Import object and store it in package namespace
+    value = getattr(import_module(_LAZY_OBJECTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List package objects, including objects not imported yet."""
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,309 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+
+# Import libraries and objects
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+import numpy as np
+from loguru import logger
+from pandas import DataFrame, Index, MultiIndex, Series, factorize
+
+AGGREGATIONS = ("count", "sum", "mean", "rate", "median", "weighted_mean")
+"""Aggregation functions supported by metrics."""
+
+
+@dataclass
+class Metric:
+    """Aggregated metric computed per group.
+
+    .. code-block:: python
+        :linenos:
+        :caption: Code example
+
+        # Number of patients, share of patients with an event (in percent),
+        # median age and mean dose weighted by exposure
+        metrics = {
+            "Data"    : Metric("count"),
+            "Events"  : Metric("rate", "Event", scale=100),
+            "Age"     : Metric("median", "Age"),
+            "Dose"    : Metric("weighted_mean", "Dose", weights="Exposure"),
+        }
+
+    """
+
+    func    : str
+    """Aggregation function - "count", "sum", "mean", "rate" (mean of a
+    boolean column multiplied by `scale`), "median" or "weighted_mean"."""
+
+    column  : str | None = None
+    """Aggregated column (rows are counted if not set for "count")."""
+
+    weights : str | None = None
+    """Column of weights (for "weighted_mean")."""
+
+    scale   : float      = 1.0
+    """Multiplier of rates (e.g. 100 for percents)."""
+
+    @classmethod
+    def parse(
+        cls: type["Metric"],
+        spec: "Metric | str | tuple",
+    ) -> "Metric":
+        """Build a metric from its specification.
+
+        Parameters:
+            spec (Metric | str | tuple): A metric, an aggregation function, or
+                a tuple of Metric arguments (e.g. `("mean", "Age")`).
+
+        Returns:
+            Metric: The validated metric.
+
+        Raises:
+            ValueError: If the function is not supported, or if a column is
+                missing.
+
+        """
+        # Build metric
+        if isinstance(spec, str):
+            spec = cls(spec)
+        elif not isinstance(spec, Metric):
+            spec = cls(*spec)
+
+        # Control metric arguments
+        log_error = None
+        if spec.func not in AGGREGATIONS:
+            log_error  = f"Metric cannot handle '{spec.func}' function. "
+            log_error += f"Supported functions are {list(AGGREGATIONS)}."
+        elif spec.column is None and spec.func != "count":
+            log_error = f"Metric '{spec.func}' requires a column."
+        elif spec.weights is None and spec.func == "weighted_mean":
+            log_error = "Metric 'weighted_mean' requires a weights column."
+        if log_error:
+            logger.error(log_error)
+            raise ValueError(log_error)
+
+        return spec
+
+
+@dataclass
+class PartialAggregate:
+    """Mergeable state of an aggregation over part of the data.
+
+    Counts and sums are stored per group, so that partial states of chunks
+    are merged by addition. Medians are computed from counts of values per
+    group, which are also merged by addition.
+    """
+
+    sums         : DataFrame         = field(default_factory=DataFrame)
+    """Counts and sums indexed by group."""
+
+    value_counts : dict[str, Series] = field(default_factory=dict)
+    """Counts of values indexed by group and value, by median metric."""
+
+    def merge(
+        self: "PartialAggregate",
+        other: "PartialAggregate",
+    ) -> "PartialAggregate":
+        """Merge two partial states.
+
+        Parameters:
+            other (PartialAggregate): The partial state to be merged.
+
+        Returns:
+            PartialAggregate: The merged partial state.
+
+        """
+        return PartialAggregate(
+            sums=self.sums.add(other.sums, fill_value=0),
+            value_counts={
+                key: val.add(other.value_counts[key], fill_value=0)
+                for key, val in self.value_counts.items()
+            },
+        )
+
+
+@dataclass
+class Aggregator:
+    """Vectorized aggregation of several metrics per group in one pass.
+
+    Groups are identified by the codes of a categorical key column (e.g. the
+    `ISO3` column of GeoData), and sums are computed with `numpy.bincount`,
+    without sorting the data. Large inputs can be aggregated by chunks, by
+    merging the partial states of chunks.
+
+    .. code-block:: python
+        :linenos:
+        :caption: Code example
+
+        aggregator = Aggregator({"Data": "count", "Age": ("median", "Age")})
+        state = None
+        for chunk in chunks:
+            state = aggregator.merge(state, aggregator.partial(chunk))
+        data = aggregator.finalize(state)
+
+    """
+
+    metrics : Mapping[str, Metric | str | tuple]
+    """Metrics to be computed, indexed by output column name."""
+
+    key     : str = "ISO3"
+    """Column identifying the groups."""
+
+    def __post_init__(self: "Aggregator") -> None:
+        """Validate the metrics."""
+        self.metrics = {
+            name: Metric.parse(spec) for name, spec in self.metrics.items()
+        }
+
+    def partial(self: "Aggregator", data: DataFrame) -> PartialAggregate:
+        """Aggregate data into a partial state.
+
+        Parameters:
+            data (DataFrame): The data, with the key column and the columns of
+                the metrics. Rows with a missing key are ignored.
+
+        Returns:
+            PartialAggregate: The partial state of the data.
+
+        """
+        # Extract group codes of the key column
+        key = data[self.key]
+        if hasattr(key, "cat"):
+            codes, labels = key.cat.codes.to_numpy(), key.cat.categories
+        else:
+            codes, labels = factorize(key)
+            labels = Index(labels)
+        size = len(labels)
+        rows = codes >= 0
+
+        # Compute counts and sums by group
+        sums = {"_rows": np.bincount(codes[rows], minlength=size)}
+        value_counts = {}
+        for name, metric in self.metrics.items():
+            if metric.column is None:
+                continue
+            column = data[metric.column]
+            if metric.func == "median":
+                value_counts[name] = _value_counts(codes, column, labels)
+                continue
+            if metric.func == "count":
+                valid = rows & column.notna().to_numpy()
+                sums[f"{name}:n"] = np.bincount(codes[valid], minlength=size)
+                continue
+            val = column.to_numpy(dtype="float64", na_value=np.nan)
+            valid = rows & ~np.isnan(val)
+            if metric.func == "weighted_mean":
+                weights = data[metric.weights].to_numpy(
+                    dtype="float64",
+                    na_value=np.nan,
+                )
+                valid &= ~np.isnan(weights)
+                sums[f"{name}:w"] = np.bincount(
+                    codes[valid],
+                    weights=weights[valid],
+                    minlength=size,
+                )
+                val = val * weights
+            sums[f"{name}:n"] = np.bincount(codes[valid], minlength=size)
+            sums[f"{name}:s"] = np.bincount(
+                codes[valid],
+                weights=val[valid],
+                minlength=size,
+            )
+
+        # Keep groups present in the data
+        sums = DataFrame(sums, index=labels)
+        return PartialAggregate(
+            sums=sums[sums["_rows"] > 0],
+            value_counts=value_counts,
+        )
+
+    @staticmethod
+    def merge(
+        state: PartialAggregate | None,
+        other: PartialAggregate,
+    ) -> PartialAggregate:
+        """Merge a partial state into a running state.
+
+        Parameters:
+            state (PartialAggregate): The running state (None for the first
+                partial state).
+            other (PartialAggregate): The partial state to be merged.
+
+        Returns:
+            PartialAggregate: The merged state.
+
+        """
+        return other if state is None else state.merge(other)
+
+    def finalize(
+        self: "Aggregator",
+        state: PartialAggregate | None,
+    ) -> DataFrame:
+        """Compute the metrics out of the final state.
+
+        Parameters:
+            state (PartialAggregate): The final state (None if no data was
+                aggregated).
+
+        Returns:
+            DataFrame: The metrics, indexed by group (named after the key) and
+                sorted by group.
+
+        """
+        # Compute metrics from counts and sums
+        if state is None:
+            return DataFrame(columns=list(self.metrics), index=Index(
+                [],
+                name=self.key,
+            ))
+        sums, data = state.sums, {}
+        for name, metric in self.metrics.items():
+            if metric.func == "count":
+                col = "_rows" if metric.column is None else f"{name}:n"
+                data[name] = sums[col].astype("int64")
+            elif metric.func == "sum":
+                data[name] = sums[f"{name}:s"]
+            elif metric.func in ("mean", "rate"):
+                count = sums[f"{name}:n"].where(sums[f"{name}:n"] > 0)
+                data[name] = sums[f"{name}:s"] / count * metric.scale
+            elif metric.func == "weighted_mean":
+                weights = sums[f"{name}:w"].where(sums[f"{name}:w"] != 0)
+                data[name] = sums[f"{name}:s"] / weights
+            else:
+                medians = _median(state.value_counts[name])
+                data[name] = medians.reindex(sums.index)
+
+        data = DataFrame(data, index=sums.index)
+        data.index.name = self.key
+        return data.sort_index()
+
+
+def _value_counts(codes: np.ndarray, column: Series, labels: Index) -> Series:
+    """Count values by group (ignoring missing values)."""
+    # Combine group and value codes into a single code
+    val_codes, val_uniques = factorize(column)
+    valid = (codes >= 0) & (val_codes >= 0)
+    combined = codes[valid].astype("int64") * len(val_uniques) \
+        + val_codes[valid]
+
+    # Count combined codes and split them back
+    uniques, counts = np.unique(combined, return_counts=True)
+    index = MultiIndex.from_arrays([
+        labels[uniques // max(len(val_uniques), 1)],
+        np.asarray(val_uniques)[uniques % max(len(val_uniques), 1)],
+    ])
+    return Series(counts, index=index, dtype="int64")
+
+
+def _median(counts: Series) -> Series:
+    """Compute medians by group out of counts of values by group."""
+    medians = {}
+    for key, group in counts.sort_index().groupby(level=0, sort=False):
+        # Find values at the middle positions of cumulated counts
+        values = group.index.get_level_values(1).to_numpy(dtype="float64")
+        cumul = np.cumsum(group.to_numpy())
+        low = values[np.searchsorted(cumul, (cumul[-1] - 1) // 2, "right")]
+        high = values[np.searchsorted(cumul, cumul[-1] // 2, "right")]
+        medians[key] = (low + high) / 2
+    return Series(medians, dtype="float64")
@@ -0,0 +1,264 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+
+# Import libraries and objects
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from importlib.util import find_spec
+from pathlib import Path
+from threading import get_ident
+from typing import Any
+
+from loguru import logger
+from pandas import DataFrame, read_parquet, read_pickle
+
+from pyclinsci._settings import MODULE_NAME
+
+
+def default_cache_dir() -> Path:
+    """Return the default directory of the data cache.
+
+    The directory can be set with the `PYCLINSCI_CACHE_DIR` environment
+    variable. Otherwise, it is located in the user cache directory
+    (`XDG_CACHE_HOME` or `~/.cache`).
+
+    Returns:
+        Path: The directory where cached data are stored.
+
+    """
+    # Use directory defined by the user
+    if "PYCLINSCI_CACHE_DIR" in os.environ:
+        return Path(os.environ["PYCLINSCI_CACHE_DIR"])
+
+    # Use user cache directory
+    cache_home = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+    return Path(cache_home) / MODULE_NAME
+
+
+@dataclass
+class DataCache:
+    """On-disk columnar cache of the data imported from files.
+
+    Parsed DataFrames are saved in Parquet format (or pickle format if
+    `pyarrow` is not installed or data cannot be stored as Parquet). An entry
+    is identified by the source file path and the options used to read it.
+    Each entry records the size, modification time and content hash of the
+    source file: the entry is used as long as size and modification time are
+    unchanged, or if the content hash is unchanged (e.g. file was touched or
+    copied). Least recently used entries are evicted once the cache exceeds
+    `max_size` bytes or `max_entries` entries.
+
+    .. code-block:: python
+        :linenos:
+        :caption: Code example
+
+        # Use a dedicated cache limited to 500 MB
+        cache = DataCache(cache_dir="cache", max_size=500 * 1024**2)
+        geo_data = GeoData(file_path="data/geo.xlsx", cache=cache)
+
+        # Disable cache for one instance
+        geo_data = GeoData(file_path="data/geo.xlsx", cache=False)
+
+    """
+
+    cache_dir   : Path = field(default_factory=default_cache_dir)
+    """Directory where cached data are stored."""
+
+    max_size    : int  = 2 * 1024**3
+    """Maximum size of the cache in bytes."""
+
+    max_entries : int  = 128
+    """Maximum number of entries in the cache."""
+
+    def __post_init__(self: "DataCache") -> None:
+        """Convert cache directory to a Path instance."""
+        self.cache_dir = Path(self.cache_dir)
+
+    def get(
+        self: "DataCache",
+        file_path: Path,
+        options: dict[str, Any] | None = None,
+    ) -> DataFrame | None:
+        """Load the cached data of a file.
+
+        Parameters:
+            file_path (Path): Path to the source file.
+            options (dict[str, Any], default=None): Options used to read the
+                source file.
+
+        Returns:
+            DataFrame | None: The cached data, or None if the cache does not
+                contain valid data for this file or cannot be read.
+
+        """
+        try:
+            return self._get(file_path, options)
+        except OSError as err:
+            logger.warning(f"Data cache <{self.cache_dir}> failed: {err}.")
+            return None
+
+    def _get(
+        self: "DataCache",
+        file_path: Path,
+        options: dict[str, Any] | None,
+    ) -> DataFrame | None:
+        """Load the cached data of a file (see `get`)."""
+        # Look for cache entry
+        key = self._entry_key(file_path, options)
+        meta_path = self.cache_dir / f"{key}.json"
+        if not meta_path.is_file():
+            return None
+        meta = json.loads(meta_path.read_text())
+        data_path = self.cache_dir / meta["data_file"]
+        if not data_path.is_file():
+            self._remove_entry(key)
+            return None
+
+        # Control if source file changed since it was cached
+        stat = Path(file_path).stat()
+        if (stat.st_size, stat.st_mtime_ns) != (meta["size"],meta["mtime_ns"]):
+            if stat.st_size != meta["size"] or \
+                    self._file_digest(file_path) != meta["digest"]:
+                logger.debug(f"Cached data of <{file_path}> are outdated.")
+                self._remove_entry(key)
+                return None
+            meta["mtime_ns"] = stat.st_mtime_ns
+            meta_path.write_text(json.dumps(meta))
+
+        # Load cached data and mark entry as recently used
+        if data_path.suffix == ".parquet":
+            data = read_parquet(data_path)
+        else:
+            data = read_pickle(data_path)  # noqa: S301
+        os.utime(data_path)
+        logger.debug(f"Data of <{file_path}> were loaded from cache.")
+
+        return data
+
+    def put(
+        self: "DataCache",
+        file_path: Path,
+        data: DataFrame,
+        options: dict[str, Any] | None = None,
+    ) -> None:
+        """Store the data imported from a file in the cache.
+
+        Data are not cached if the cache directory cannot be written (e.g.
+        read-only home directory), and a warning is logged.
+
+        Parameters:
+            file_path (Path): Path to the source file.
+            data (DataFrame): Data imported from the source file.
+            options (dict[str, Any], default=None): Options used to read the
+                source file.
+
+        """
+        try:
+            self._put(file_path, data, options)
+        except OSError as err:
+            logger.warning(f"Data cache <{self.cache_dir}> failed: {err}.")
+
+    def _put(
+        self: "DataCache",
+        file_path: Path,
+        data: DataFrame,
+        options: dict[str, Any] | None,
+    ) -> None:
+        """Store the data imported from a file in the cache (see `put`)."""
+        # Build entry metadata
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        key = self._entry_key(file_path, options)
+        stat = Path(file_path).stat()
+        meta = {
+            "source"   : str(Path(file_path).resolve()),
+            "size"     : stat.st_size,
+            "mtime_ns" : stat.st_mtime_ns,
+            "digest"   : self._file_digest(file_path),
+            "options"  : self._options_key(options),
+        }
+
+        # Save data in a temporary file then move it to cache atomically
+        tmp_key = f"{key}.{os.getpid()}.{get_ident()}"
+        tmp_path = self.cache_dir / f"{tmp_key}.tmp"
+        try:
+            if find_spec("pyarrow") is None or \
+                    not all(isinstance(col, str) for col in data.columns):
+                raise TypeError  # noqa: TRY301
+            data.to_parquet(tmp_path)
+            meta["data_file"] = f"{key}.parquet"
+        except Exception:  # noqa: BLE001
+            data.to_pickle(tmp_path)
+            meta["data_file"] = f"{key}.pkl"
+        self._remove_entry(key)
+        tmp_path.replace(self.cache_dir / meta["data_file"])
+        tmp_path = self.cache_dir / f"{tmp_key}.json.tmp"
+        tmp_path.write_text(json.dumps(meta))
+        tmp_path.replace(self.cache_dir / f"{key}.json")
+        logger.debug(f"Data of <{file_path}> were stored in cache.")
+
+        # Evict least recently used entries
+        self.evict()
+
+    def evict(self: "DataCache") -> None:
+        """Remove least recently used entries exceeding the cache limits."""
+        # List data files from the most to the least recently used
+        if not self.cache_dir.is_dir():
+            return
+        entries = [
+            (path, path.stat())
+            for path in self.cache_dir.iterdir()
+            if path.suffix in (".parquet", ".pkl")
+        ]
+        entries.sort(key=lambda entry: entry[1].st_mtime_ns, reverse=True)
+
+        # Remove entries exceeding limits
+        total_size = 0
+        for count, (path, stat) in enumerate(entries, start=1):
+            total_size += stat.st_size
+            if count > self.max_entries or total_size > self.max_size:
+                self._remove_entry(path.stem)
+                logger.debug(f"Evicted <{path.name}> from data cache.")
+
+    def clear(self: "DataCache") -> None:
+        """Remove all entries from the cache."""
+        if not self.cache_dir.is_dir():
+            return
+        for path in self.cache_dir.iterdir():
+            if path.suffix in (".parquet", ".pkl", ".json", ".tmp"):
+                path.unlink(missing_ok=True)
+        logger.info(f"Cleared data cache in <{self.cache_dir}>.")
+
+    def _remove_entry(self: "DataCache", key: str) -> None:
+        """Remove data and metadata files of a cache entry."""
+        for suffix in (".parquet", ".pkl", ".json"):
+            (self.cache_dir / f"{key}{suffix}").unlink(missing_ok=True)
+
+    def _entry_key(
+        self: "DataCache",
+        file_path: Path,
+        options: dict[str, Any] | None,
+    ) -> str:
+        """Build the key of the entry from file path and read options."""
+        key = f"{Path(file_path).resolve()}|{self._options_key(options)}"
+        return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _options_key(options: dict[str, Any] | None) -> str:
+        """Serialize read options in a stable way."""
+        return json.dumps(options or {}, sort_keys=True, default=repr)
+
+    @staticmethod
+    def _file_digest(file_path: Path) -> str:
+        """Compute the content hash of a file."""
+        with Path(file_path).open(mode="rb") as file:
+            return hashlib.file_digest(file, "blake2b").hexdigest()
+
+
+DATA_CACHE = DataCache()
+"""Default data cache shared by GenericData instances."""
+
+CACHED_FORMATS = frozenset({"excel"})
+"""File formats stored in the default data cache when it is not explicitly
+enabled (columnar and CSV files are read faster from their source than from
+the cache)."""
@@ -0,0 +1,657 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+"""Command-line batch pipeline of pyclinsci package.
+
+A TOML job file declares data sources (loaded with a GenericData class,
+optionally mapped and aggregated, and exported) and figures built out of
+them. Targets (figures and exports) are only rebuilt when the fingerprint of
+their inputs changed: content of the source file and of the files used to map
+countries, parameters of the source and of the target, and package version.
+Sources with targets to be rebuilt are processed in parallel, and each step
+is timed.
+
+.. code-block:: toml
+    :linenos:
+    :caption: Code example
+
+    [settings]
+    output_dir  = "output"
+    formats     = ["html", "json"]
+    max_workers = 4
+
+    [sources.enrollment]
+    file_path     = "data/enrollment.xlsx"
+    resolve_names = true
+    aliases       = { "Kingdom of Eswatini" = "SWZ" }
+    aggregate     = { Data = "count", Age = ["median", "Age"] }
+    export        = "enrollment.parquet"
+
+    [figures.enrollment_europe]
+    source = "enrollment"
+    scope  = "europe"
+    title  = "Enrollment in Europe"
+
+.. code-block:: bash
+    :linenos:
+    :caption: Code example
+
+    # Rebuild outdated targets and write a timing report
+    pyclinsci jobs.toml --report output/timings.json
+"""
+
+# Import libraries and objects
+import argparse
+import hashlib
+import json
+import sys
+import time
+import tomllib
+from collections.abc import Callable
+from concurrent.futures import as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+from plotly.offline import get_plotlyjs
+
+from pyclinsci._countries import (
+    ALIAS_FILE_PATH,
+    CODES_FILE_PATH,
+    COUNTRY_RESOLVER,
+)
+from pyclinsci._data import GenericData, GeoData
+from pyclinsci._iso3 import ISO3_FILE_PATH
+from pyclinsci._partitions import make_executor
+from pyclinsci._render import PLOTLYJS_FILE
+from pyclinsci._settings import __version__, config_logging
+
+STATE_FILE = ".pyclinsci.state.json"
+"""Name of the file storing fingerprints of built targets, in the output
+directory."""
+
+DATA_CLASSES: dict[str, type[GenericData]] = {"GeoData": GeoData}
+"""Classes of data sources, indexed by name in job files."""
+
+MAPPING_FILES = (ISO3_FILE_PATH, ALIAS_FILE_PATH, CODES_FILE_PATH)
+"""Files used to map countries of GeoData sources."""
+
+
+@dataclass
+class SourceJob:
+    """Data source declared in a job file."""
+
+    name      : str
+    """Name of the source."""
+
+    file_path : Path
+    """Path to the file containing the data."""
+
+    data_cls  : str                   = "GeoData"
+    """Name of the class loading the data."""
+
+    data_args : dict[str, Any]        = field(default_factory=dict)
+    """Keyword arguments passed to the class constructor."""
+
+    aliases   : dict[str, str]        = field(default_factory=dict)
+    """Aliases of country names added to the country resolver (used with
+    `resolve_names`), indexed by alias."""
+
+    aggregate : dict[str, Any] | None = None
+    """Metrics computed per country (see `GeoData.aggregate`)."""
+
+    export    : Path | None            = None
+    """Path to the file where loaded (and aggregated) data are exported."""
+
+    def dependencies(self: "SourceJob") -> list[Path]:
+        """List the files the source depends on."""
+        if self.data_cls == "GeoData":
+            return [self.file_path, *MAPPING_FILES]
+        return [self.file_path]
+
+
+@dataclass
+class FigureJob:
+    """Figure declared in a job file."""
+
+    name        : str
+    """Name of the figure, used as name of the output files."""
+
+    source      : str
+    """Name of the data source of the figure."""
+
+    formats     : list[str]      = field(default_factory=lambda: ["html"])
+    """Output formats of the figure (e.g. "html", "json", "png")."""
+
+    figure_args : dict[str, Any] = field(default_factory=dict)
+    """Keyword arguments passed to the `build_figure` method."""
+
+
+@dataclass
+class StepReport:
+    """Execution report of a step of the pipeline."""
+
+    target  : str
+    """Name of the target (or source) of the step."""
+
+    step    : str
+    """Name of the step - "load", "aggregate", "export" or "figure"."""
+
+    status  : str
+    """Status of the step - "built", "up-to-date", "planned" or "failed"."""
+
+    seconds : float     = 0.0
+    """Execution duration of the step (in seconds)."""
+
+    outputs : list[str] = field(default_factory=list)
+    """Paths to the files written by the step."""
+
+
+def _pop_path(spec: dict[str, Any], key: str, base_dir: Path) -> Path | None:
+    """Pop a path from a specification, relative to a base directory."""
+    path = spec.pop(key, None)
+    return None if path is None else base_dir / path
+
+
+def _control(valid: bool, log_error: str) -> None:  # noqa: FBT001
+    """Raise a ValueError if a condition of the job file is not valid."""
+    if not valid:
+        logger.error(log_error)
+        raise ValueError(log_error)
+
+
+@dataclass
+class Pipeline:
+    """Batch pipeline of data sources and figures declared in a job file.
+
+    .. code-block:: python
+        :linenos:
+        :caption: Code example
+
+        pipeline = Pipeline.from_file("jobs.toml")
+        reports = pipeline.run(max_workers=4)
+        print(Pipeline.report(reports))
+
+    """
+
+    output_dir  : Path
+    """Directory where figures and exports are written."""
+
+    sources     : dict[str, SourceJob] = field(default_factory=dict)
+    """Data sources, indexed by name."""
+
+    figures     : dict[str, FigureJob] = field(default_factory=dict)
+    """Figures, indexed by name."""
+
+    max_workers : int | None           = None
+    """Maximum number of processes (number of CPUs if not set)."""
+
+    @classmethod
+    def from_file(cls: type["Pipeline"], job_path: Path) -> "Pipeline":
+        """Read a pipeline from a TOML job file.
+
+        Paths of the job file are relative to its directory.
+
+        Parameters:
+            job_path (Path): Path to the job file.
+
+        Returns:
+            Pipeline: The pipeline.
+
+        Raises:
+            ValueError: If a source or a figure is not valid.
+
+        """
+        # Read job file and settings
+        job_path = Path(job_path)
+        with job_path.open(mode="rb") as file:
+            jobs = tomllib.load(file)
+        base_dir = job_path.parent
+        settings = jobs.get("settings", {})
+        formats = settings.get("formats", ["html"])
+        pipeline = cls(
+            output_dir=base_dir / settings.get("output_dir", "output"),
+            max_workers=settings.get("max_workers"),
+        )
+
+        # Read data sources
+        for name, spec in jobs.get("sources", {}).items():
+            spec = dict(spec)  # noqa: PLW2901
+            _control(
+                "file_path" in spec,
+                f"Source '{name}' of <{job_path}> requires a file_path.",
+            )
+            source = SourceJob(
+                name=name,
+                file_path=_pop_path(spec, "file_path", base_dir),
+                data_cls=spec.pop("class", "GeoData"),
+                aliases=spec.pop("aliases", {}),
+                aggregate=spec.pop("aggregate", None),
+                export=_pop_path(spec, "export", pipeline.output_dir),
+                data_args=spec,
+            )
+            _control(
+                source.data_cls in DATA_CLASSES,
+                f"Source '{name}' cannot use '{source.data_cls}' class. "
+                f"Supported classes are {sorted(DATA_CLASSES)}.",
+            )
+            pipeline.sources[name] = source
+
+        # Read figures
+        for name, spec in jobs.get("figures", {}).items():
+            spec = dict(spec)  # noqa: PLW2901
+            _control(
+                spec.get("source") in pipeline.sources,
+                f"Figure '{name}' of <{job_path}> requires a declared source.",
+            )
+            pipeline.figures[name] = FigureJob(
+                name=name,
+                source=spec.pop("source"),
+                formats=spec.pop("formats", formats),
+                figure_args=spec,
+            )
+
+        return pipeline
+
+    def fingerprints(
+        self: "Pipeline",
+        files: dict[str, list],
+    ) -> dict[str, str | None]:
+        """Compute the fingerprints of the targets of the pipeline.
+
+        The fingerprint of a source combines the content hash of the files it
+        depends on, its parameters and the package version. The fingerprint
+        of a target combines the fingerprint of its source and its
+        parameters.
+
+        Parameters:
+            files (dict[str, list]): Size, modification time and content hash
+                of files, indexed by path, from the previous run. Content
+                hashes are only computed for new or modified files, and the
+                dictionary is updated.
+
+        Returns:
+            dict[str, str | None]: The fingerprints, indexed by target name
+                (figure name, or `<source>.export`), None if a file of the
+                source cannot be read (e.g. missing file).
+
+        """
+        # Fingerprint data sources
+        sources = {}
+        for name, source in self.sources.items():
+            try:
+                digests = [
+                    _file_digest(path, files)
+                    for path in source.dependencies()
+                ]
+            except OSError as err:
+                logger.error(f"Source '{name}' cannot be read: {err}.")
+                sources[name] = None
+                continue
+            sources[name] = _digest(digests, asdict(source), __version__)
+
+        # Fingerprint targets out of their source
+        targets = {
+            f"{name}.export": sources[name] and \
+                _digest(sources[name], str(source.export))
+            for name, source in self.sources.items()
+            if source.export is not None
+        }
+        for name, figure in self.figures.items():
+            targets[name] = sources[figure.source] and _digest(
+                sources[figure.source],
+                asdict(figure),
+                str(self.output_dir),
+            )
+        return targets
+
+    def run(
+        self: "Pipeline",
+        max_workers: int | None = None,
+        force: bool = False,  # noqa: FBT001, FBT002
+        dry_run: bool = False,  # noqa: FBT001, FBT002
+    ) -> list[StepReport]:
+        """Rebuild the targets whose fingerprint changed.
+
+        Sources with targets to be rebuilt are processed in parallel: each
+        source is loaded once, then its targets are built. Fingerprints of
+        built targets are saved in the state file of the output directory.
+        Targets of sources whose files cannot be read are reported as failed,
+        and other targets are still built.
+
+        Parameters:
+            max_workers (int, default=None): Maximum number of processes
+                (`max_workers` setting of the job file if not set).
+            force (bool, default=False): Whether all targets are rebuilt.
+            dry_run (bool, default=False): Whether targets to be rebuilt are
+                only reported.
+
+        Returns:
+            list[StepReport]: The reports of the steps.
+
+        """
+        # Find outdated targets
+        state_path = self.output_dir / STATE_FILE
+        state = {"files": {}, "targets": {}}
+        if state_path.is_file():
+            state = json.loads(state_path.read_text(encoding="utf-8"))
+        targets = self.fingerprints(state["files"])
+        outdated = {
+            name for name, fingerprint in targets.items()
+            if fingerprint is not None and (force or
+                not _is_built(state["targets"].get(name), fingerprint))
+        }
+        reports = [
+            StepReport(
+                name,
+                _target_step(name),
+                "up-to-date" if fingerprint else "failed",
+            )
+            for name, fingerprint in targets.items() if name not in outdated
+        ]
+        if dry_run:
+            return reports + [
+                StepReport(name, _target_step(name), "planned")
+                for name in sorted(outdated)
+            ]
+
+        # Group outdated targets by source
+        jobs = {
+            name: (
+                f"{name}.export" in outdated,
+                [
+                    figure for figure in self.figures.values()
+                    if figure.source == name and figure.name in outdated
+                ],
+            )
+            for name in self.sources
+        }
+        jobs = {key: val for key, val in jobs.items() if val[0] or val[1]}
+
+        # Build outdated targets of each source in parallel
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        max_workers = max_workers or self.max_workers
+        for name, job_reports in _run_jobs(self, jobs, max_workers):
+            reports += job_reports
+
+            # Save fingerprints of built targets
+            for report in job_reports:
+                if report.status == "built" and \
+                        report.step in {"export", "figure"}:
+                    state["targets"][report.target] = {
+                        "fingerprint": targets[report.target],
+                        "outputs"    : report.outputs,
+                    }
+            logger.info(f"Jobs of source '{name}' were executed.")
+        _write_state(state_path, state)
+
+        return reports
+
+    @staticmethod
+    def report(reports: list[StepReport]) -> str:
+        """Build a text table of step reports.
+
+        Parameters:
+            reports (list[StepReport]): The reports of the steps.
+
+        Returns:
+            str: The text table, with the total duration.
+
+        """
+        width = max([len(report.target) for report in reports] + [6])
+        lines = [f"{'Target':<{width}} {'Step':<10} {'Status':<11} {'Sec':>8}"]
+        lines += [
+            f"{report.target:<{width}} {report.step:<10} "
+            f"{report.status:<11} {report.seconds:>8.3f}"
+            for report in reports
+        ]
+        total = sum(report.seconds for report in reports)
+        lines.append(f"{'Total':<{width}} {'':<10} {'':<11} {total:>8.3f}")
+        return "\n".join(lines)
+
+
+def _digest(*items: Any) -> str:  # noqa: ANN401
+    """Compute the fingerprint of serializable items."""
+    text = json.dumps(items, sort_keys=True, default=str)
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def _file_digest(path: Path, files: dict[str, list]) -> str:
+    """Compute the content hash of a file, unless it was not modified."""
+    stat = Path(path).stat()
+    key = str(Path(path).resolve())
+    size, mtime, digest = files.get(key, (None, None, None))
+    if (size, mtime) != (stat.st_size, stat.st_mtime_ns):
+        with Path(path).open(mode="rb") as file:
+            digest = hashlib.file_digest(file, "blake2b").hexdigest()
+        files[key] = [stat.st_size, stat.st_mtime_ns, digest]
+    return digest
+
+
+def _target_step(name: str) -> str:
+    """Name the step building a target out of its name."""
+    return "export" if name.endswith(".export") else "figure"
+
+
+def _is_built(target: dict[str, Any] | None, fingerprint: str) -> bool:
+    """Control if a target was built with the same fingerprint."""
+    return target is not None and target["fingerprint"] == fingerprint and \
+        all(Path(path).is_file() for path in target["outputs"])
+
+
+def _failed_targets(
+    name: str,
+    export: bool,  # noqa: FBT001
+    figures: list[FigureJob],
+) -> list[StepReport]:
+    """Report the targets of a source which was not loaded as failed."""
+    targets = [f"{name}.export"] * export + [fig.name for fig in figures]
+    return [
+        StepReport(target, _target_step(target), "failed")
+        for target in targets
+    ]
+
+
+def _write_state(state_path: Path, state: dict[str, Any]) -> None:
+    """Write the state file atomically."""
+    tmp_path = state_path.with_name(f"{state_path.name}.tmp")
+    tmp_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    tmp_path.replace(state_path)
+
+
+def run_source(
+    source: SourceJob,
+    export: bool,  # noqa: FBT001
+    figures: list[FigureJob],
+    output_dir: Path,
+) -> list[StepReport]:
+    """Load a data source and build its outdated targets (used by workers).
+
+    Failures are reported by step: targets of a source which cannot be
+    loaded are reported as failed, and a failed target does not prevent other
+    targets from being built.
+
+    Parameters:
+        source (SourceJob): The data source.
+        export (bool): Whether the data are exported.
+        figures (list[FigureJob]): The figures to be built.
+        output_dir (Path): Directory where figures are written.
+
+    Returns:
+        list[StepReport]: The reports of the steps.
+
+    """
+    reports = []
+
+    # Define timer of steps, returning None if the step failed
+    def timed(target: str, step: str, func: Callable[[], Any]) -> Any:  # noqa: ANN401
+        start_time = time.perf_counter()
+        try:
+            result = func()
+        except Exception as err:  # noqa: BLE001
+            logger.error(f"Step {step} of '{target}' failed: {err!r}.")
+            status, result = "failed", None
+        else:
+            status = "built"
+        reports.append(StepReport(
+            target,
+            step,
+            status,
+            time.perf_counter() - start_time,
+            [str(path) for path in result] if isinstance(result, list) \
+                else [],
+        ))
+        return result
+
+    # Load, map and aggregate data (aliases only apply to this source)
+    data_cls = DATA_CLASSES[source.data_cls]
+    with COUNTRY_RESOLVER.temporary_aliases(source.aliases):
+        instance = timed(source.name, "load", lambda: data_cls(
+            file_path=source.file_path,
+            **source.data_args,
+        ))
+    if instance is not None and source.aggregate:
+        metrics = {
+            key: tuple(val) if isinstance(val, list) else val
+            for key, val in source.aggregate.items()
+        }
+        instance = timed(
+            source.name,
+            "aggregate",
+            lambda: instance.aggregate(metrics),
+        )
+    if instance is None:
+        return reports + _failed_targets(source.name, export, figures)
+
+    # Export data
+    if export:
+        timed(
+            f"{source.name}.export",
+            "export",
+            lambda: instance.export(source.export),
+        )
+
+    # Build and save figures
+    for figure in figures:
+        def build(figure: FigureJob = figure) -> list[Path]:
+            instance.build_figure(**figure.figure_args)
+            return [
+                instance.save_figure(
+                    output_dir / f"{figure.name}.{fmt}",
+                    include_plotlyjs=PLOTLYJS_FILE,
+                )
+                for fmt in figure.formats
+            ]
+
+        timed(figure.name, "figure", build)
+
+    return reports
+
+
+def _run_jobs(
+    pipeline: Pipeline,
+    jobs: dict[str, tuple[bool, list[FigureJob]]],
+    max_workers: int | None,
+) -> list[tuple[str, list[StepReport]]]:
+    """Run the jobs of sources in processes (in the current one if single)."""
+    # Save shared plotly.js bundle
+    if any("html" in fig.formats for _, figs in jobs.values() for fig in figs):
+        plotlyjs_path = pipeline.output_dir / PLOTLYJS_FILE
+        if not plotlyjs_path.is_file():
+            plotlyjs_path.write_text(get_plotlyjs(), encoding="utf-8")
+    args = {
+        name: (pipeline.sources[name], export, figs, pipeline.output_dir)
+        for name, (export, figs) in jobs.items()
+    }
+
+    # Run a single job in the current process
+    if max_workers == 1 or len(jobs) <= 1:
+        return [(name, run_source(*val)) for name, val in args.items()]
+
+    # Run jobs in processes, collecting crashed workers
+    results = []
+    with make_executor("process", max_workers) as pool:
+        futures = {
+            pool.submit(run_source, *val): name for name, val in args.items()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results.append((name, future.result()))
+            except Exception as err:  # noqa: BLE001
+                logger.error(f"Jobs of source '{name}' failed: {err!r}.")
+                results.append((name, [
+                    StepReport(name, "load", "failed"),
+                    *_failed_targets(name, *jobs[name]),
+                ]))
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the batch pipeline of a job file from the command line.
+
+    Parameters:
+        argv (list[str], default=None): Command line arguments.
+
+    Returns:
+        int: Exit code (1 if a job failed).
+
+    """
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(
+        prog="pyclinsci",
+        description="Rebuild outdated figures and exports of a job file.",
+    )
+    parser.add_argument("job_file", type=Path, help="TOML job file")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="maximum number of sources processed in parallel",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="rebuild all targets",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="only report targets to be rebuilt",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        default=None,
+        help="JSON file where step reports are written",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="WARNING",
+        help="logging level of console messages",
+    )
+    args = parser.parse_args(argv)
+    config_logging(console=args.log_level)
+
+    # Run pipeline
+    try:
+        pipeline = Pipeline.from_file(args.job_file)
+    except (OSError, ValueError, tomllib.TOMLDecodeError) as err:
+        print(f"pyclinsci: {err}", file=sys.stderr)  # noqa: T201
+        return 2
+    reports = pipeline.run(args.jobs, force=args.force, dry_run=args.dry_run)
+
+    # Write reports
+    print(Pipeline.report(reports))  # noqa: T201
+    if args.report is not None:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(json.dumps(
+            [asdict(report) for report in reports],
+            indent=2,
+        ), encoding="utf-8")
+
+    return int(any(report.status == "failed" for report in reports))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
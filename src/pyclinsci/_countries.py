@@ -0,0 +1,362 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+
+# Import libraries and objects
+import re
+import unicodedata
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher, get_close_matches
+from numbers import Number
+from pathlib import Path
+from threading import RLock
+from typing import Any
+
+import numpy as np
+from loguru import logger
+from pandas import Categorical, DataFrame, Series, factorize, isna
+
+from pyclinsci._iso3 import ISO3_REGISTRY, Iso3Registry
+from pyclinsci._settings import MODULE_PATH
+
+ALIAS_FILE_PATH = Path(MODULE_PATH / "ini_files/geodata.alias.ini")
+"""Path to the alias file of the package, with one `ISO3:Alias` per line."""
+
+CODES_FILE_PATH = Path(MODULE_PATH / "ini_files/geodata.codes.ini")
+"""Path to the codes file of the package, with one `ISO3:ISO2:Numeric` entry
+per line."""
+
+STOP_WORDS = frozenset({"the", "of", "and"})
+"""Words ignored when country names are normalized."""
+
+TOKEN_ALIASES = {"st": "saint", "rep": "republic", "dem": "democratic"}
+"""Abbreviations expanded when country names are normalized."""
+
+
+def normalize_name(name: Any) -> str:  # noqa: ANN401
+    """Normalize a country name into a comparison key.
+
+    The name is case-folded, accents and punctuation are removed, common
+    abbreviations are expanded, stop words are removed, and words are sorted,
+    so that "Côte d'Ivoire", "COTE D IVOIRE" or "Korea, Republic of" and
+    "Republic of Korea" share the same key.
+
+    Parameters:
+        name (Any): The country name.
+
+    Returns:
+        str: The normalized key.
+
+    """
+    text = unicodedata.normalize("NFKD", str(name)).casefold()
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    tokens = re.sub(r"[^a-z0-9]+", " ", text.replace("&", " and ")).split()
+    tokens = [
+        TOKEN_ALIASES.get(token, token)
+        for token in tokens if token not in STOP_WORDS
+    ]
+    return " ".join(sorted(tokens))
+
+
+def _code_key(value: Any) -> str | None:  # noqa: ANN401
+    """Build the key of a country code (ISO-2, ISO-3 or numeric code)."""
+    # Numeric codes are padded to 3 digits
+    if isinstance(value, Number) and not isinstance(value, bool):
+        if float(value).is_integer():
+            return f"{int(value):03d}"
+        return None
+    text = str(value).strip()
+    if text.isdigit() and len(text) <= 3:  # noqa: PLR2004
+        return text.zfill(3)
+    if text.isalpha() and len(text) in (2, 3):
+        return text.upper()
+    return None
+
+
+@dataclass
+class ResolutionReport:
+    """Diagnostics of the resolution of country names to ISO-3 codes."""
+
+    exact      : dict[str, str]               = field(default_factory=dict)
+    """ISO-3 codes of names found in the ISO-3 dictionary."""
+
+    normalized : dict[str, str]               = field(default_factory=dict)
+    """ISO-3 codes of names found after normalization, in the alias table or
+    as ISO-2, ISO-3 or numeric codes."""
+
+    fuzzy      : dict[str, tuple[str, float]] = field(default_factory=dict)
+    """ISO-3 codes and similarity scores of names found by approximate
+    matching (to be checked, and added as aliases if correct)."""
+
+    unresolved : dict[str, int]               = field(default_factory=dict)
+    """Number of rows of each name that could not be resolved."""
+
+    def to_frame(self: "ResolutionReport") -> DataFrame:
+        """Convert the report into a DataFrame with one row per name.
+
+        Returns:
+            DataFrame: The report, with `Name`, `Method`, `ISO3` and `Score`
+                columns.
+
+        """
+        rows = [
+            *[(key, "exact", val, 1.0) for key, val in self.exact.items()],
+            *[
+                (key, "normalized", val, 1.0)
+                for key, val in self.normalized.items()
+            ],
+            *[
+                (key, "fuzzy", *val) for key, val in self.fuzzy.items()
+            ],
+            *[
+                (key, "unresolved", None, None)
+                for key in self.unresolved
+            ],
+        ]
+        return DataFrame(rows, columns=["Name", "Method", "ISO3", "Score"])
+
+    def merge(self: "ResolutionReport", other: "ResolutionReport") -> None:
+        """Add the report of other rows (e.g. appended rows) to the report.
+
+        Resolved names are gathered, and rows of unresolved names are added.
+
+        Parameters:
+            other (ResolutionReport): The report of other rows.
+
+        """
+        self.exact.update(other.exact)
+        self.normalized.update(other.normalized)
+        self.fuzzy.update(other.fuzzy)
+        for key, val in other.unresolved.items():
+            self.unresolved[key] = self.unresolved.get(key, 0) + val
+
+    def __str__(self: "ResolutionReport") -> str:
+        """Summarize the report in a single line."""
+        log_txt  = f"{len(self.exact)} exact, {len(self.normalized)} "
+        log_txt += f"normalized, {len(self.fuzzy)} fuzzy and "
+        log_txt += f"{len(self.unresolved)} unresolved names"
+        return log_txt
+
+
+@dataclass
+class CountryResolver:
+    """Precomputed index resolving messy country names to ISO-3 codes.
+
+    The index gathers normalized names of the ISO-3 dictionary, aliases of
+    the alias file and ISO-2, ISO-3 and numeric codes of the codes file. It
+    is rebuilt only when the ISO-3 dictionary changed. Names are resolved by
+    exact match, then by normalized key or code, and finally by approximate
+    matching. Only unique values are resolved, and approximate matching is
+    only applied to values left unmatched.
+
+    .. code-block:: python
+        :linenos:
+        :caption: Code example
+
+        countries, iso3, report = COUNTRY_RESOLVER.map(data["Country"])
+        print(report.to_frame())
+
+        # Fix a name without rewriting the ISO-3 file
+        COUNTRY_RESOLVER.add_alias("Kingdom of Eswatini", "SWZ")
+
+    """
+
+    registry   : Iso3Registry = field(default_factory=lambda: ISO3_REGISTRY)
+    """ISO-3 registry providing country names."""
+
+    alias_path : Path | None  = ALIAS_FILE_PATH
+    """Path to the alias file (None to disable aliases)."""
+
+    codes_path : Path | None  = CODES_FILE_PATH
+    """Path to the codes file (None to disable ISO-2 and numeric codes)."""
+
+    cutoff     : float        = 0.85
+    """Minimum similarity score of approximate matches (1 to disable)."""
+
+    _names : dict[str, str] | None = field(default=None, init=False)
+    _aliases : dict[str, str] = field(default_factory=dict, init=False)
+    _index : dict[str, str] = field(default_factory=dict, init=False)
+    _codes : dict[str, str] = field(default_factory=dict, init=False)
+    _lock : RLock = field(default_factory=RLock, init=False, repr=False)
+
+    def add_alias(self: "CountryResolver", alias: str, iso3: str) -> None:
+        """Add an alias of a country in memory.
+
+        Parameters:
+            alias (str): The alternative country name.
+            iso3 (str): The ISO-3 code of the country.
+
+        """
+        with self._lock:
+            self._aliases[alias] = iso3
+            self._index[normalize_name(alias)] = iso3
+
+    @contextmanager
+    def temporary_aliases(
+        self: "CountryResolver",
+        aliases: Mapping[str, str],
+    ) -> Iterator["CountryResolver"]:
+        """Add aliases of countries in memory within a context.
+
+        Aliases replaced or added in the context are restored when it exits,
+        so that they do not apply to data resolved afterwards.
+
+        Parameters:
+            aliases (Mapping[str, str]): ISO-3 codes indexed by alias.
+
+        Yields:
+            CountryResolver: The resolver.
+
+        """
+        # Add aliases, saving replaced ones
+        with self._lock:
+            previous = {alias: self._aliases.get(alias) for alias in aliases}
+            for alias, iso3 in aliases.items():
+                self.add_alias(alias, iso3)
+        try:
+            yield self
+
+        # Restore replaced aliases and rebuild the index on next access
+        finally:
+            with self._lock:
+                for alias, iso3 in previous.items():
+                    if iso3 is None:
+                        self._aliases.pop(alias, None)
+                    else:
+                        self._aliases[alias] = iso3
+                self._names = None
+
+    def index(self: "CountryResolver") -> tuple[dict, dict]:
+        """Return the index of names and codes, rebuilt if needed.
+
+        Returns:
+            tuple[dict, dict]: ISO-3 codes indexed by normalized name, and by
+                ISO-2, ISO-3 or numeric code.
+
+        """
+        names = self.registry.country_to_iso3
+        if self._names is not None and names == self._names:
+            return self._index, self._codes
+
+        with self._lock:
+            # Load aliases and codes files
+            if self._names is None:
+                for line in _read_lines(self.alias_path):
+                    iso3, alias = line.split(":", 1)
+                    self._aliases.setdefault(alias, iso3)
+                for line in _read_lines(self.codes_path):
+                    iso3, iso2, numeric = line.split(":")
+                    self._codes.update({iso2: iso3, numeric: iso3})
+                self._codes.pop("", None)
+
+            # Index normalized names, aliases and ISO-3 codes
+            self._index = {
+                normalize_name(key): val
+                for key, val in [*self._aliases.items(), *names.items()]
+            }
+            self._codes.update({val: val for val in names.values()})
+            self._names = dict(names)
+            logger.debug(f"Country index was built ({len(self._index)} keys).")
+
+        return self._index, self._codes
+
+    def resolve(
+        self: "CountryResolver",
+        names: Any,  # noqa: ANN401
+        report: ResolutionReport | None = None,
+    ) -> list[str | None]:
+        """Resolve unique country names to ISO-3 codes.
+
+        Parameters:
+            names (Any): Unique country names (strings or numeric codes).
+            report (ResolutionReport, default=None): Report to be filled.
+
+        Returns:
+            list[str | None]: The ISO-3 codes (None for unresolved names).
+
+        """
+        report = report or ResolutionReport()
+        iso3_code = self.registry.country_to_iso3
+        index, codes = self.index()
+
+        # Resolve names by exact match, normalized name and code
+        resolved, unmatched = [], {}
+        for pos, name in enumerate(names):
+            if (iso3 := iso3_code.get(name)) is not None:
+                report.exact[name] = iso3
+            elif (iso3 := index.get(normalize_name(name)) or \
+                    codes.get(_code_key(name))) is not None:
+                report.normalized[str(name)] = iso3
+            else:
+                unmatched[pos] = normalize_name(name)
+            resolved.append(iso3)
+
+        # Resolve remaining names by approximate matching
+        candidates = [key for key in index if len(key) > 3]  # noqa: PLR2004
+        for pos, key in unmatched.items():
+            matches = get_close_matches(key, candidates, 1, self.cutoff)
+            if matches:
+                resolved[pos] = index[matches[0]]
+                score = SequenceMatcher(None, key, matches[0]).ratio()
+                report.fuzzy[str(names[pos])] = \
+                    (resolved[pos], round(score, 3))
+
+        return resolved
+
+    def map(
+        self: "CountryResolver",
+        countries: Series,
+    ) -> tuple[Categorical, Categorical, ResolutionReport]:
+        """Map country names to ISO-3 codes in one vectorized pass.
+
+        Countries are factorized once, and only unique countries are
+        resolved. Unresolved countries keep their name as ISO-3 code, as in
+        `GeoData.map_iso3_codes`.
+
+        Parameters:
+            countries (Series): Country names (or ISO-2, ISO-3 or numeric
+                codes).
+
+        Returns:
+            tuple[Categorical, Categorical, ResolutionReport]: Country names
+                and ISO-3 codes as categorical arrays, and the diagnostics
+                report.
+
+        """
+        # Factorize countries and resolve unique countries only
+        codes, uniques = factorize(countries)
+        report = ResolutionReport()
+        iso3 = np.array(self.resolve(list(uniques), report), dtype=object)
+
+        # Count rows of unresolved countries
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        for pos in np.flatnonzero(isna(iso3)):
+            report.unresolved[str(uniques[pos])] = int(counts[pos])
+            iso3[pos] = uniques[pos]
+        if report.unresolved:
+            log_txt = f"Countries could not be resolved: {report.unresolved}."
+            logger.warning(log_txt)
+        logger.debug(f"Countries were resolved: {report}.")
+
+        # Factorize ISO-3 codes (missing countries keep the -1 code)
+        iso3_codes, iso3_uniques = factorize(iso3)
+        iso3_codes = np.append(iso3_codes, -1)[codes]
+
+        return (
+            Categorical.from_codes(codes, categories=uniques),
+            Categorical.from_codes(iso3_codes, categories=iso3_uniques),
+            report,
+        )
+
+
+def _read_lines(file_path: Path | None) -> list[str]:
+    """Read the non-empty lines of an optional file."""
+    if file_path is None:
+        return []
+    with Path(file_path).open(encoding="utf-8") as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+COUNTRY_RESOLVER = CountryResolver()
+"""Country resolver shared by GeoData instances."""
+
@@ -1,19 +1,156 @@
 # Copyright 2024 pyclinsci authors. See license.md file for details.
 
 # Import libraries and objects
+import asyncio
+import hashlib
+import json
+import os
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import Executor
+from contextlib import AbstractContextManager
+from copy import deepcopy
+from dataclasses import dataclass, field, fields, replace
+from functools import partial, reduce
+from inspect import signature
+from io import BytesIO
 from os import R_OK, access
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import plotly.express as px
 from loguru import logger
-from pandas import DataFrame, read_excel
+from pandas import (
+    ArrowDtype,
+    Categorical,
+    CategoricalDtype,
+    DataFrame,
+    Series,
+    concat,
+    factorize,
+)
+from pandas.api.types import is_numeric_dtype, union_categoricals
+from pandas.util import hash_pandas_object
+from plotly.graph_objs import Choropleth, Frame
 from plotly.graph_objs._figure import Figure
 
+from pyclinsci._aggregate import Aggregator, Metric
+from pyclinsci._cache import CACHED_FORMATS, DATA_CACHE, DataCache
+from pyclinsci._countries import COUNTRY_RESOLVER, ResolutionReport
+from pyclinsci._decorators import method_exec_dur
+from pyclinsci._dtypes import MemoryReport, compact_frame
 from pyclinsci._files import dialog_select_file_dir
-from pyclinsci._settings import MODULE_PATH
+from pyclinsci._iso3 import ISO3_REGISTRY, Iso3Transaction
+from pyclinsci._loaders import (
+    STREAMERS,
+    excel_sheet_names,
+    file_filters,
+    get_file_format,
+    is_line_start,
+    load_excel,
+    load_file,
+    stream_file,
+)
+from pyclinsci._partitions import (
+    combine_results,
+    make_executor,
+    run_partitions,
+)
+from pyclinsci._settings import import_optional
+from pyclinsci._shared import SharedData, publish_frame
+from pyclinsci._writers import write_file
+
+
+def concat_frames(
+    frames: Iterable[DataFrame],
+    keys: Iterable[Any] | None = None,
+    key_name: str = "Source",
+) -> DataFrame:
+    """Concatenate DataFrames, keeping categorical columns categorical.
+
+    Categorical columns with different categories are converted to object
+    columns by `pandas.concat`. Their categories are unified beforehand, so
+    that concatenated columns stay categorical.
+
+    Parameters:
+        frames (Iterable[DataFrame]): DataFrames to be concatenated.
+        keys (Iterable[Any], default=None): Key of each DataFrame, stored as
+            a categorical column named `key_name`.
+        key_name (str, default="Source"): Name of the key column.
+
+    Returns:
+        DataFrame: The concatenated DataFrame.
+
+    """
+    frames = list(frames)
+    if not frames:
+        return DataFrame()
+
+    # Add key column
+    if keys is not None:
+        frames = [
+            frame.assign(**{key_name: str(key)})
+            for frame, key in zip(frames, keys, strict=True)
+        ]
+
+    # Unify categories of categorical columns
+    columns = {
+        col for frame in frames for col in frame.columns
+        if isinstance(frame[col].dtype, CategoricalDtype)
+    }
+    for col in columns:
+        categories = union_categoricals(
+            [frame[col].astype("category") for frame in frames \
+                if col in frame],
+            ignore_order=True,
+        ).categories
+        frames = [
+            frame.assign(**{col: frame[col].astype(
+                CategoricalDtype(categories),
+            )}) if col in frame else frame
+            for frame in frames
+        ]
+
+    # Concatenate frames
+    data = concat(frames, ignore_index=True)
+    if keys is not None:
+        data[key_name] = data[key_name].astype("category")
+
+    return data
+
+
+def _load_instance(
+    cls: type["GenericData"],
+    file_path: Path,
+    kwargs: dict[str, Any],
+) -> "GenericData":
+    """Create an instance out of a file (used by executor workers)."""
+    return cls(file_path=Path(file_path), **kwargs)
+
+
+_WORKBOOK: dict[str, bytes] = {}
+"""Workbook bytes received once by each worker process of `load_sheets`."""
+
+
+def _set_workbook(content: bytes) -> None:
+    """Store workbook bytes in a worker process (executor initializer)."""
+    _WORKBOOK["content"] = content
+
+
+def _load_sheet(
+    sheet_name: str,
+    read_args: dict[str, Any],
+    content: bytes | None = None,
+) -> DataFrame:
+    """Load a worksheet out of workbook bytes (used by executor workers).
+
+    Worker processes read the bytes received by `_set_workbook` if `content`
+    is not set.
+    """
+    content = _WORKBOOK["content"] if content is None else content
+    return load_excel(BytesIO(content), sheet_name=sheet_name, **read_args)
 
 
 @dataclass
@@ -22,7 +159,15 @@ class GenericData(ABC):
 
     This class represents a generic data handler that allows importing data
     from a file path into a DataFrame and displaying it using a figure. It can
-    also be initialized with a DataFrame instance.
+    also be initialized with a DataFrame instance, an Arrow table or records
+    without any file I/O (see `from_frame`, `from_arrow` and `from_records`).
+    Files are imported with the loader registered for their format (Excel, CSV,
+    Parquet, Feather...), and imported data of formats slow to parse (Excel)
+    are stored in an on-disk cache so that next imports of an unchanged file
+    are fast. Large files can also be read by chunks and folded into a
+    running aggregate with `from_stream`.
+    Built figures are kept in a least recently used cache, so that a figure
+    built again out of unchanged data and parameters is not rebuilt.
 
     """
 
@@ -35,6 +180,33 @@ class GenericData(ABC):
     fig       : Figure    = field(default_factory=Figure   )
     """Figure handler of the data display."""
 
+    cache     : bool | DataCache | None = None
+    """Data cache used to import data (default cache for file formats slow to
+    parse if not set, True for the default cache whatever the format, False
+    to disable the cache)."""
+
+    file_format : str | None = None
+    """Format of the file (identified from the file extension if not set)."""
+
+    read_args : dict[str, Any] = field(default_factory=dict)
+    """Keyword arguments passed to the loader of the file format (e.g.
+    `usecols`, `nrows` or `filters` to load only needed data)."""
+
+    fig_cache_size : int = 16
+    """Maximum number of built figures kept in cache (0 to disable)."""
+
+    compact : bool | dict[str, Any] = False
+    """Whether imported data are compacted to reduce their memory footprint
+    (True, or keyword arguments passed to `compact_data`)."""
+
+    _fig_cache : OrderedDict[str, Figure] = \
+        field(default_factory=OrderedDict, init=False, repr=False)
+    _data_version : int = field(default=0, init=False, repr=False)
+    _source_stat : tuple[int, int] | None = \
+        field(default=None, init=False, repr=False)
+    _source_rows : int | None = field(default=None, init=False, repr=False)
+
+    @method_exec_dur
     def __post_init__(self: "GenericData") -> None:
         """Initialize the GenericData instance after its creation.
 
@@ -42,8 +214,8 @@ class GenericData(ABC):
         a DataFrame. It then verifies if the file path is readable by checking
         its accessibility. If the file path is not provided, it prompts the
         user to select a file using a dialog box. Finally, it imports the data
-        from the file path using the read_excel function and logs the
-        successful data loading.
+        from the data cache, or from the file path using the loader of the
+        file format, and logs the successful data loading.
 
         Raises:
             ValueError: If the file path is not readable.
@@ -51,7 +223,9 @@ class GenericData(ABC):
         """
         # GenericData instance has been initiated out of a DataFrame
         if len(list(self.data.columns)) > 0:
-            pass
+            logger.info("Data were loaded from a DataFrame.")
+            self._compact_loaded_data()
+            return
 
         # Check if file is readable
         if not access(self.file_path, R_OK):
@@ -62,13 +236,989 @@ class GenericData(ABC):
 
         # Select file to be imported
         if self.file_path == Path():
-            self.file_path  = dialog_select_file_dir(
-                opt={"*.xlsx": "Excel files"},
+            self.file_path  = dialog_select_file_dir(opt=file_filters())
+
+        # Import data from cache or from file_path
+        stat = Path(self.file_path).stat()
+        file_format = get_file_format(self.file_path, self.file_format)
+        options = {"file_format": file_format, **self.read_args}
+        data_cache = self.cache
+        if data_cache is None:
+            data_cache = DATA_CACHE if file_format in CACHED_FORMATS else None
+        elif data_cache is True:
+            data_cache = DATA_CACHE
+        if data_cache and \
+                (data := data_cache.get(self.file_path, options)) is not None:
+            self.data = data
+        else:
+            self.data = load_file(self.file_path, **options)
+            if data_cache:
+                data_cache.put(self.file_path, self.data, options)
+        logger.info(f"Data were loaded from <{self.file_path}>.")
+        self._record_source(stat, len(self.data))
+        self._compact_loaded_data()
+
+    def _record_source(
+        self: "GenericData",
+        stat: os.stat_result,
+        rows: int,
+    ) -> None:
+        """Record the state of the source file for incremental refreshes."""
+        self._source_stat = (stat.st_size, stat.st_mtime_ns)
+        self._source_rows = rows
+
+        # Rows of the file cannot be located if only part of them was loaded
+        if {"filters", "nrows"} & self.read_args.keys() or \
+                not isinstance(self.read_args.get("sheet_name", 0), str | int):
+            self._source_rows = None
+
+    def _compact_loaded_data(self: "GenericData") -> None:
+        """Compact imported data if requested by the `compact` field."""
+        if self.compact:
+            self.compact_data(
+                **(self.compact if isinstance(self.compact, dict) else {}),
             )
 
-        # Import data from file_path
-        self.data = read_excel(io=self.file_path)
-        logger.info(f"Data were loaded from <{self.file_path}>.")
+    @method_exec_dur
+    def compact_data(
+        self: "GenericData",
+        max_category_ratio: float = 0.5,
+        arrow_strings: bool = False,  # noqa: FBT001, FBT002
+        exclude: Iterable[str] = (),
+    ) -> MemoryReport:
+        """Reduce the memory footprint of the data.
+
+        Numeric columns are downcast, string columns with few distinct values
+        (countries, sites, arms...) are converted to categorical columns and,
+        optionally, other string columns are converted to pyarrow-backed
+        strings (see `compact_frame`). Cached figures are invalidated.
+
+        Parameters:
+            max_category_ratio (float, default=0.5): Maximum ratio of distinct
+                values to rows for a string column to be made categorical.
+            arrow_strings (bool, default=False): Whether other string columns
+                are converted to pyarrow-backed strings.
+            exclude (Iterable[str], default=()): Columns kept unchanged.
+
+        Returns:
+            MemoryReport: Memory footprint before and after compaction.
+
+        .. code-block:: python
+            :linenos:
+            :caption: Code example
+
+            geo_data = GeoData(file_path="data/enrollment.xlsx")
+            report = geo_data.compact_data(arrow_strings=True)
+            print(report.before, report.after, report.columns)
+
+        """
+        self.data, report = compact_frame(
+            self.data,
+            max_category_ratio=max_category_ratio,
+            arrow_strings=arrow_strings,
+            exclude=exclude,
+        )
+        self.invalidate_figure_cache()
+        logger.info(f"Data were compacted: {report}.")
+        return report
+
+    def publish(self: "GenericData", path: Path | None = None) -> SharedData:
+        """Publish the data for zero-copy access from other processes.
+
+        The data are written once in an uncompressed Arrow IPC file (in a
+        memory-backed directory if available), which worker processes
+        memory-map with `SharedData.attach` instead of loading or unpickling
+        their own copy. Attached instances are built with the same field
+        values as the instance (besides data and figure).
+
+        Parameters:
+            path (Path, default=None): Path to the published file (a new file
+                of a shared directory if not set).
+
+        Returns:
+            SharedData: The handle of the published data, which removes the
+                file when it is unlinked or when its context exits.
+
+        .. code-block:: python
+            :linenos:
+            :caption: Code example
+
+            with geo_data.publish() as shared:
+                specs = [
+                    FigureSpec(
+                        name=f"enrollment_{scope}",
+                        shared=shared,
+                        figure_args={"scope": scope},
+                    )
+                    for scope in ["europe", "asia", "africa"]
+                ]
+                render_figures(specs, output_dir="output")
+
+        """
+        kwargs = {
+            item.name: getattr(self, item.name) for item in fields(self)
+            if item.init and item.name not in ("data", "fig", "cache")
+        }
+        return publish_frame(
+            self.data,
+            type(self),
+            path,
+            **{**kwargs, "cache": False, "compact": False},
+        )
+
+    @method_exec_dur
+    def map_partitions(  # noqa: PLR0913
+        self: "GenericData",
+        func: Callable[..., Any],
+        *args: Any,  # noqa: ANN401
+        partitions: int | None = None,
+        by: str | None = None,
+        max_workers: int | None = None,
+        executor: str = "process",
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Any:  # noqa: ANN401
+        """Run a function on partitions of the data across cores.
+
+        Rows are split by position, or by key so that all rows of a key
+        belong to the same partition. With processes, the data are published
+        once in a memory-mapped file (see `publish`), and each worker reads
+        its partition without copy. Execution durations of partitions are
+        logged and recorded by the profiler (see `method_exec_dur`).
+
+        Parameters:
+            func (Callable[..., Any]): The function, called with a partition
+                (DataFrame of read-only columns) as first argument. It must be
+                defined at module level to be run by processes.
+            *args (Any): Additional positional arguments of the function.
+            partitions (int, default=None): Maximum number of partitions
+                (number of workers if not set).
+            by (str, default=None): Column of the keys, so that all rows of a
+                key belong to the same partition (rows with a missing key are
+                dropped).
+            max_workers (int, default=None): Maximum number of workers (number
+                of CPUs if not set).
+            executor (str, default="process"): Type of workers - "thread" or
+                "process".
+            **kwargs (Any): Keyword arguments of the function.
+
+        Returns:
+            Any: The results of partitions concatenated if they are
+                DataFrames or Series (rows keep their index, and are sorted by
+                partition), or the list of results by partition otherwise.
+
+        Raises:
+            ValueError: If the executor parameter is not valid.
+
+        .. code-block:: python
+            :linenos:
+            :caption: Code example
+
+            def add_bmi(data: DataFrame) -> Series:
+                return data["Weight"] / (data["Height"] / 100) ** 2
+
+            patients.data["BMI"] = patients.map_partitions(add_bmi)
+
+        """
+        return combine_results(run_partitions(
+            self.data,
+            func,
+            args,
+            kwargs,
+            partitions=partitions,
+            by=by,
+            max_workers=max_workers,
+            executor=executor,
+        ))
+
+    @method_exec_dur
+    def reduce(  # noqa: PLR0913
+        self: "GenericData",
+        func: Callable[..., Any],
+        combine: Callable[[Any, Any], Any],
+        *args: Any,  # noqa: ANN401
+        partitions: int | None = None,
+        by: str | None = None,
+        max_workers: int | None = None,
+        executor: str = "process",
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Any:  # noqa: ANN401
+        """Run a function on partitions of the data and combine the results.
+
+        Parameters:
+            func (Callable[..., Any]): The function, called with a partition
+                as first argument (see `map_partitions`).
+            combine (Callable[[Any, Any], Any]): The function combining two
+                results (e.g. `operator.add`), applied in partition order.
+            *args (Any): Additional positional arguments of the function.
+            partitions (int, default=None): Maximum number of partitions.
+            by (str, default=None): Column of the keys, so that all rows of a
+                key belong to the same partition.
+            max_workers (int, default=None): Maximum number of workers.
+            executor (str, default="process"): Type of workers - "thread" or
+                "process".
+            **kwargs (Any): Keyword arguments of the function.
+
+        Returns:
+            Any: The combined result.
+
+        .. code-block:: python
+            :linenos:
+            :caption: Code example
+
+            # Count adverse events of all patients
+            events = patients.reduce(count_events, operator.add)
+
+        """
+        return reduce(combine, run_partitions(
+            self.data,
+            func,
+            args,
+            kwargs,
+            partitions=partitions,
+            by=by,
+            max_workers=max_workers,
+            executor=executor,
+        ))
+
+    @method_exec_dur
+    def groupby_agg(  # noqa: PLR0913
+        self: "GenericData",
+        by: str,
+        metrics: Mapping[str, Metric | str | tuple],
+        partitions: int | None = None,
+        max_workers: int | None = None,
+        executor: str = "process",
+    ) -> DataFrame:
+        """Aggregate metrics by group across cores.
+
+        Each partition of rows is aggregated into a partial state (counts,
+        sums and counts of values by group, see `Aggregator`), and partial
+        states are merged into the final metrics, so that groups can span
+        several partitions.
+
+        Parameters:
+            by (str): Column of the groups.
+            metrics (Mapping[str, Metric | str | tuple]): Metrics to be
+                computed, indexed by output column name (see `Metric`).
+            partitions (int, default=None): Maximum number of partitions.
+            max_workers (int, default=None): Maximum number of workers.
+            executor (str, default="process"): Type of workers - "thread" or
+                "process".
+
+        Returns:
+            DataFrame: The metrics, indexed and sorted by group.
+
+        .. code-block:: python
+            :linenos:
+            :caption: Code example
+
+            sites = patients.groupby_agg("Site", {
+                "Patients": "count",
+                "Age"     : ("median", "Age"),
+                "Events"  : ("rate", "Event", None, 100),
+            })
+
+        """
+        aggregator = Aggregator(metrics, key=by)
+        states = run_partitions(
+            self.data,
+            aggregator.partial,
+            partitions=partitions,
+            max_workers=max_workers,
+            executor=executor,
+        )
+        return aggregator.finalize(reduce(aggregator.merge, states, None))
+
+    def diagnostics(self: "GenericData") -> dict[str, DataFrame]:
+        """Build diagnostics tables of the data, exported with the data.
+
+        Subclasses can override this method to export tables describing how
+        the data were prepared.
+
+        Returns:
+            dict[str, DataFrame]: The diagnostics tables, indexed by name.
+
+        """
+        return {}
+
+    @method_exec_dur
+    def export(  # noqa: PLR0913
+        self: "GenericData",
+        file_path: Path,
+        file_format: str | None = None,
+        chunk_size: int = 100_000,
+        compression: str | None = None,
+        diagnostics: bool = True,  # noqa: FBT001, FBT002
+        **kwargs: Any,  # noqa: ANN401
+    ) -> list[Path]:
+        """Export the data in a file by chunks.
+
+        Rows are streamed to the file chunk by chunk (write-only workbooks
+        for Excel, row groups for Parquet, record batches for Feather and
+        appended chunks for CSV), so that memory used on top of the data is
+        bounded by the chunk size.
+
+        Parameters:
+            file_path (Path): Path to the exported file.
+            file_format (str, default=None): Format of the file (identified
+                from the file extension if not set).
+            chunk_size (int, default=100_000): Maximum number of rows per
+                chunk.
+            compression (str, default=None): Compression codec (see
+                `write_file`).
+            diagnostics (bool, default=True): Whether diagnostics tables are
+                exported, as sheets of Excel files or in separate files named
+                `<stem>.<table>.<ext>` for other formats.
+            **kwargs (Any): Keyword arguments passed to the writer of the
+                file format.
+
+        Returns:
+            list[Path]: Paths to the exported files.
+
+        .. code-block:: python
+            :linenos:
+            :caption: Code example
+
+            geo_data = GeoData(file_path="data/sites.xlsx", resolve_names=True)
+
+            # Export mapped data with a sheet of country diagnostics
+            geo_data.export("output/sites.xlsx")
+
+            # Export compressed Parquet file without diagnostics
+            geo_data.export(
+                "output/sites.parquet",
+                compression="zstd",
+                diagnostics=False,
+            )
+
+        """
+        return write_file(
+            self.data,
+            file_path,
+            file_format=file_format,
+            chunk_size=chunk_size,
+            compression=compression,
+            tables=self.diagnostics() if diagnostics else None,
+            **kwargs,
+        )
+
+    def prepare_rows(self: "GenericData", rows: DataFrame) -> DataFrame:
+        """Prepare rows before they are added to the data.
+
+        This method is called on rows passed to `append`, so that subclasses
+        can derive their columns (e.g. ISO-3 codes) for new rows only. By
+        default, rows are returned unchanged.
+
+        Parameters:
+            rows (DataFrame): The rows to be prepared.
+
+        Returns:
+            DataFrame: The prepared rows.
+
+        """
+        return rows
+
+    @method_exec_dur
+    def append(
+        self: "GenericData",
+        rows: DataFrame | Mapping[str, Any] | Iterable[Mapping[str, Any]],
+    ) -> None:
+        """Add rows to the data without reloading existing rows.
+
+        New rows are prepared with `prepare_rows` and compacted if requested
+        by the `compact` field, then concatenated to the data. Categorical
+        columns are kept categorical. Cached figures are invalidated.
+
+        Parameters:
+            rows (DataFrame | Mapping[str, Any] | Iterable[Mapping[str, Any]]):
+                The rows to be added, as a DataFrame, a mapping of columns, or
+                records.
+
+        .. code-block:: python
+            :linenos:
+            :caption: Code example
+
+            geo_data.append([{"Country": "France", "Data": 12}])
+
+        """
+        # Convert and prepare new rows
+        if not isinstance(rows, DataFrame | Mapping):
+            rows = list(rows)
+        rows = DataFrame(rows)
+        if rows.empty:
+            return
+        rows = self.prepare_rows(rows)
+        if self.compact:
+            rows = compact_frame(
+                rows,
+                **(self.compact if isinstance(self.compact, dict) else {}),
+            )[0]
+
+        # Concatenate new rows to the data
+        self.data = concat_frames([self.data, rows])
+        self.invalidate_figure_cache()
+        logger.info(f"{len(rows)} rows were added to the data.")
+
+    @method_exec_dur
+    def refresh(self: "GenericData") -> int:
+        """Add rows appended to the source file since it was loaded.
+
+        The source file is assumed to be append-only: if its size or
+        modification time changed, only rows following the loaded rows are
+        read (by chunks, with the streamer of the file format) and added with
+        `append`. If only part of the file was loaded (`filters` or `nrows`
+        read arguments, or several sheets), or new rows cannot be read by
+        chunks (read arguments not supported by the streamer, CSV file not
+        ending with a line break), the file is fully reloaded and rows added
+        with `append` are discarded.
+
+        Returns:
+            int: Number of rows read from the file (0 if it did not change).
+
+        Raises:
+            ValueError: If the data were not loaded from a file.
+
+        .. code-block:: python
+            :linenos:
+            :caption: Code example
+
+            geo_data = GeoData(file_path="data/enrollment.csv")
+
+            # Add rows exported since the last refresh
+            geo_data.refresh()
+
+        """
+        # Control if data were loaded from a file
+        if self._source_stat is None:
+            log_error  = "Data cannot be refreshed as they were not loaded "
+            log_error += "from a file."
+            logger.error(log_error)
+            raise ValueError(log_error)
+
+        # Control if the file changed
+        stat = Path(self.file_path).stat()
+        if (stat.st_size, stat.st_mtime_ns) == self._source_stat:
+            logger.info(f"File <{self.file_path}> did not change.")
+            return 0
+
+        # Reload the whole file if appended rows cannot be read by chunks
+        file_format = get_file_format(self.file_path, self.file_format)
+        stream_args = self._refresh_args(file_format)
+        if stream_args is None:
+            self._take_loaded_state(
+                replace(self, data=DataFrame(), fig=Figure()),
+            )
+            return len(self.data)
+
+        # Read new rows only
+        chunks = list(stream_file(self.file_path, file_format, **stream_args))
+        rows = sum(len(chunk) for chunk in chunks)
+        self._record_source(stat, self._source_rows + rows)
+        if rows:
+            self.append(concat(chunks, ignore_index=True))
+
+        return rows
+
+    def _take_loaded_state(self: "GenericData", other: "GenericData") -> None:
+        """Copy the data and every state recorded while loading them.
+
+        Fields not set at initialization (source state, resolution report of
+        country names...) are copied, except the figure cache which is cleared.
+        """
+        self.data = other.data
+        for item in fields(self):
+            if not item.init and item.name not in {
+                "_fig_cache",
+                "_data_version",
+            }:
+                setattr(self, item.name, getattr(other, item.name))
+        self.invalidate_figure_cache()
+
+    def _refresh_args(
+        self: "GenericData",
+        file_format: str,
+    ) -> dict[str, Any] | None:
+        """Build streamer arguments reading rows appended to the source file.
+
+        CSV files are read from the end of the bytes already read, so that
+        previous rows are not even parsed, and other formats skip the rows
+        already loaded.
+
+        Returns:
+            dict[str, Any] | None: The streamer arguments, or None if appended
+                rows cannot be located (partial load, file not ending with a
+                line break) or read arguments are not supported by the
+                streamer.
+
+        """
+        # Control if loaded rows can be located
+        if self._source_rows is None or file_format not in STREAMERS:
+            return None
+        position = {"offset": self._source_rows}
+        if file_format == "csv":
+            position = {"start_byte": self._source_stat[0]}
+            if not is_line_start(self.file_path, position["start_byte"]):
+                return None
+
+        # Control if read arguments are supported by the streamer
+        params = signature(STREAMERS[file_format]).parameters
+        if not any(val.kind == val.VAR_KEYWORD for val in params.values()) \
+                and not self.read_args.keys() <= params.keys():
+            logger.debug("Read arguments cannot be used to read by chunks.")
+            return None
+
+        return {**self.read_args, **position}
+
+    @classmethod
+    def from_frame(
+        cls: type["GenericData"],
+        data: DataFrame,
+        copy: bool = False,  # noqa: FBT001, FBT002
+        **kwargs: Any,  # noqa: ANN401
+    ) -> "GenericData":
+        """Create an instance out of a DataFrame without any file I/O.
+
+        Parameters:
+            data (DataFrame): Data of the instance.
+            copy (bool, default=False): Whether data are copied. Otherwise,
+                the instance wraps the DataFrame of the caller.
+            **kwargs (Any): Keyword arguments passed to the class constructor.
+
+        Returns:
+            GenericData: The instance wrapping the data.
+
+        """
+        return cls(data=data.copy() if copy else data, **kwargs)
+
+    @classmethod
+    def from_arrow(
+        cls: type["GenericData"],
+        table: Any,  # noqa: ANN401
+        arrow_dtypes: bool = False,  # noqa: FBT001, FBT002
+        **kwargs: Any,  # noqa: ANN401
+    ) -> "GenericData":
+        """Create an instance out of an Arrow table without any file I/O.
+
+        Parameters:
+            table (pyarrow.Table | pyarrow.RecordBatch): Data of the instance.
+            arrow_dtypes (bool, default=False): Whether columns keep Arrow
+                dtypes, so that no column is copied. Otherwise, columns are
+                converted to NumPy dtypes (without copy for numerical columns
+                without missing values).
+            **kwargs (Any): Keyword arguments passed to the class constructor.
+
+        Returns:
+            GenericData: The instance wrapping the data.
+
+        """
+        # Convert Arrow table to DataFrame
+        if arrow_dtypes:
+            data = table.to_pandas(types_mapper=ArrowDtype)
+        else:
+            data = table.to_pandas(split_blocks=True)
+
+        return cls(data=data, **kwargs)
+
+    @classmethod
+    def from_records(
+        cls: type["GenericData"],
+        records: Any,  # noqa: ANN401
+        columns: list[str] | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> "GenericData":
+        """Create an instance out of records or arrays without any file I/O.
+
+        Mappings of arrays, 2-D arrays and structured arrays are wrapped
+        without copy. Other records (e.g. lists of tuples or dictionaries)
+        are converted with `DataFrame.from_records`.
+
+        Parameters:
+            records (Any): Data of the instance.
+            columns (list[str], default=None): Column names.
+            **kwargs (Any): Keyword arguments passed to the class constructor.
+
+        Returns:
+            GenericData: The instance wrapping the data.
+
+        """
+        # Wrap structured array fields, mappings and 2-D arrays
+        if isinstance(records, np.ndarray) and records.dtype.names:
+            records = {name: records[name] for name in records.dtype.names}
+        if isinstance(records, Mapping) or \
+                (isinstance(records, np.ndarray) and records.ndim == 2):  # noqa: PLR2004
+            data = DataFrame(records, columns=columns, copy=False)
+
+        # Convert other records
+        else:
+            data = DataFrame.from_records(records, columns=columns)
+
+        return cls(data=data, **kwargs)
+
+    @classmethod
+    @method_exec_dur
+    async def aload(
+        cls: type["GenericData"],
+        file_path: Path,
+        executor: Executor | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> "GenericData":
+        """Create an instance out of a file without blocking the event loop.
+
+        The file is loaded and parsed in an executor (the default thread pool
+        of the event loop if not set). If the awaiting task is cancelled, the
+        result of the load is discarded.
+
+        Parameters:
+            file_path (Path): Path to the file.
+            executor (Executor, default=None): Executor running the load. A
+                `ProcessPoolExecutor` allows parsing files in parallel.
+            **kwargs (Any): Keyword arguments passed to the class constructor.
+
+        Returns:
+            GenericData: The instance built out of the file.
+
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor,
+            partial(cls, file_path=Path(file_path), **kwargs),
+        )
+
+    @classmethod
+    async def aload_many(
+        cls: type["GenericData"],
+        file_paths: Iterable[Path],
+        max_concurrency: int = 4,
+        executor: Executor | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> list["GenericData"]:
+        """Create instances out of several files concurrently.
+
+        At most `max_concurrency` files are loaded at the same time. If a
+        load fails or the awaiting task is cancelled, pending loads are
+        cancelled.
+
+        Parameters:
+            file_paths (Iterable[Path]): Paths to the files.
+            max_concurrency (int, default=4): Maximum number of files loaded
+                at the same time.
+            executor (Executor, default=None): Executor running the loads.
+            **kwargs (Any): Keyword arguments passed to the class constructor.
+
+        Returns:
+            list[GenericData]: The instances, in the order of `file_paths`.
+
+        Raises:
+            ExceptionGroup: If at least one file cannot be loaded.
+
+        .. code-block:: python
+            :linenos:
+            :caption: Code example
+
+            geo_data = await GeoData.aload_many(
+                ["data/site_1.xlsx", "data/site_2.xlsx"],
+                max_concurrency=2,
+            )
+
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        # Define bounded load of a file
+        async def load(file_path: Path) -> "GenericData":
+            async with semaphore:
+                return await cls.aload(file_path, executor, **kwargs)
+
+        # Load files concurrently
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(load(path)) for path in file_paths]
+
+        return [task.result() for task in tasks]
+
+    @classmethod
+    @method_exec_dur
+    def load_many(  # noqa: PLR0913
+        cls: type["GenericData"],
+        file_paths: Iterable[Path],
+        max_workers: int | None = None,
+        executor: str = "thread",
+        concat: bool = False,  # noqa: FBT001, FBT002
+        key_name: str = "Source",
+        **kwargs: Any,  # noqa: ANN401
+    ) -> "list[GenericData] | GenericData":
+        """Create instances out of several files in parallel.
+
+        Parameters:
+            file_paths (Iterable[Path]): Paths to the files (e.g. selected
+                with `select_files`).
+            max_workers (int, default=None): Maximum number of workers.
+            executor (str, default="thread"): Type of workers - "thread" or
+                "process". Processes allow parsing files in parallel, but
+                loaded data must be sent back to the main process.
+            concat (bool, default=False): Whether loaded data are concatenated
+                in a single instance, with a `key_name` column storing the
+                file path of each row.
+            key_name (str, default="Source"): Name of the column storing the
+                file paths if data are concatenated.
+            **kwargs (Any): Keyword arguments passed to the class constructor.
+
+        Returns:
+            list[GenericData] | GenericData: The instances, in the order of
+                `file_paths`, or a single instance if data are concatenated.
+
+        Raises:
+            ValueError: If the executor parameter is not valid.
+
+        .. code-block:: python
+            :linenos:
+            :caption: Code example
+
+            geo_data = GeoData.load_many(
+                select_files("data", pattern="site_*.xlsx"),
+                executor="process",
+                concat=True,
+            )
+
+        """
+        # Load files in parallel
+        file_paths = [Path(path) for path in file_paths]
+        with make_executor(executor, max_workers) as pool:
+            instances = list(pool.map(
+                partial(_load_instance, cls, kwargs=kwargs),
+                file_paths,
+            ))
+        logger.info(f"Data were loaded from {len(file_paths)} files.")
+
+        # Concatenate loaded data
+        if not concat:
+            return instances
+        return cls.from_frame(
+            concat_frames(
+                [instance.data for instance in instances],
+                keys=file_paths,
+                key_name=key_name,
+            ),
+            **{key: val for key, val in kwargs.items() if key != "read_args"},
+        )
+
+    @classmethod
+    @method_exec_dur
+    def load_sheets(  # noqa: PLR0913
+        cls: type["GenericData"],
+        file_path: Path,
+        sheet_names: Iterable[str | int] | None = None,
+        max_workers: int | None = None,
+        executor: str = "process",
+        concat: bool = False,  # noqa: FBT001, FBT002
+        key_name: str = "Sheet",
+        read_args: dict[str, Any] | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> "dict[str, GenericData] | GenericData":
+        """Create instances out of several sheets of a workbook in parallel.
+
+        The workbook is read from disk once, and its bytes are sent once to
+        each worker (not with each sheet), each task parsing a single sheet.
+        Parsing of Excel files is CPU-bound, so sheets are parsed in parallel
+        by processes (threads only overlap parsing with I/O).
+
+        Parameters:
+            file_path (Path): Path to the workbook.
+            sheet_names (Iterable[str | int], default=None): Names or indexes
+                of the sheets to be loaded (all sheets if not set).
+            max_workers (int, default=None): Maximum number of workers.
+            executor (str, default="process"): Type of workers - "thread" or
+                "process".
+            concat (bool, default=False): Whether loaded data are concatenated
+                in a single instance, with a `key_name` column storing the
+                sheet name of each row.
+            key_name (str, default="Sheet"): Name of the column storing the
+                sheet names if data are concatenated.
+            read_args (dict[str, Any], default=None): Keyword arguments passed
+                to the Excel loader (e.g. `usecols` or `filters`).
+            **kwargs (Any): Keyword arguments passed to the class constructor.
+
+        Returns:
+            dict[str, GenericData] | GenericData: The instances indexed by
+                sheet name, or a single instance if data are concatenated.
+
+        Raises:
+            ValueError: If the executor parameter is not valid.
+
+        .. code-block:: python
+            :linenos:
+            :caption: Code example
+
+            # Load one instance per site sheet
+            sites = GeoData.load_sheets("data/sites.xlsx")
+            print(sites["Site 1"].data)
+
+            # Load visit sheets in a single instance
+            visits = GeoData.load_sheets(
+                "data/visits.xlsx",
+                sheet_names=["Screening", "Baseline", "Week 4"],
+                concat=True,
+                key_name="Visit",
+            )
+
+        """
+        # Read workbook once and select sheets
+        file_path = Path(file_path)
+        stat = file_path.stat()
+        content = file_path.read_bytes()
+        names = excel_sheet_names(BytesIO(content))
+        sheet_names = names if sheet_names is None else [
+            names[name] if isinstance(name, int) else name
+            for name in sheet_names
+        ]
+        read_args = {
+            key: val for key, val in (read_args or {}).items()
+            if key != "sheet_name"
+        }
+
+        # Parse sheets in parallel (worker processes receive the workbook
+        # once, when they start, rather than with each sheet)
+        max_workers = max_workers or os.cpu_count() or 1
+        max_workers = max(min(max_workers, len(sheet_names)), 1)
+        worker = partial(_load_sheet, read_args=read_args, content=content)
+        pool_args = {}
+        if executor == "process":
+            worker = partial(_load_sheet, read_args=read_args)
+            pool_args = {"initializer": _set_workbook, "initargs": (content,)}
+        with make_executor(executor, max_workers, **pool_args) as pool:
+            frames = list(pool.map(worker, sheet_names))
+        log_txt  = f"Data were loaded from {len(sheet_names)} sheets of "
+        log_txt += f"<{file_path}>."
+        logger.info(log_txt)
+
+        # Concatenate loaded data
+        if concat:
+            return cls.from_frame(
+                concat_frames(frames, keys=sheet_names, key_name=key_name),
+                **kwargs,
+            )
+
+        # Create one instance per sheet, which can be refreshed
+        instances = {}
+        for name, frame in zip(sheet_names, frames, strict=True):
+            instances[name] = cls.from_frame(
+                frame,
+                file_path=file_path,
+                read_args={**read_args, "sheet_name": name},
+                **kwargs,
+            )
+            instances[name]._record_source(stat, len(frame))  # noqa: SLF001
+        return instances
+
+    @staticmethod
+    def iter_chunks(
+        file_path: Path,
+        chunk_size: int = 100_000,
+        file_format: str | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Iterator[DataFrame]:
+        """Read a file by chunks of bounded size.
+
+        Parameters:
+            file_path (Path): Path to the file.
+            chunk_size (int, default=100_000): Maximum number of rows per
+                chunk.
+            file_format (str, default=None): Format of the file (identified
+                from the file extension if not set).
+            **kwargs (Any): Keyword arguments passed to the streamer of the
+                file format (e.g. `usecols`, `nrows`, `filters`).
+
+        Yields:
+            DataFrame: The successive chunks of data.
+
+        """
+        yield from stream_file(file_path, file_format, chunk_size, **kwargs)
+
+    @classmethod
+    @method_exec_dur
+    def from_stream(
+        cls: type["GenericData"],
+        file_path: Path,
+        chunk_size: int = 100_000,
+        file_format: str | None = None,
+        read_args: dict[str, Any] | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> "GenericData":
+        """Create an instance by folding a file read by chunks.
+
+        Each chunk is folded into a running state with `fold_chunk`, then the
+        final state is converted into the instance data with `finalize_fold`.
+        Subclasses can override these methods to aggregate chunks, so that
+        peak memory is proportional to the chunk size instead of the file
+        size.
+
+        Parameters:
+            file_path (Path): Path to the file.
+            chunk_size (int, default=100_000): Maximum number of rows per
+                chunk.
+            file_format (str, default=None): Format of the file (identified
+                from the file extension if not set).
+            read_args (dict[str, Any], default=None): Keyword arguments passed
+                to the streamer of the file format.
+            **kwargs (Any): Keyword arguments passed to the class constructor.
+
+        Returns:
+            GenericData: The instance built out of the folded data.
+
+        """
+        # Fold chunks of data
+        state = None
+        for chunk in cls.iter_chunks(
+            file_path,
+            chunk_size,
+            file_format,
+            **(read_args or {}),
+        ):
+            state = cls.fold_chunk(state, chunk)
+        logger.info(f"Data were streamed from <{file_path}>.")
+
+        # Build instance
+        return cls(
+            file_path=Path(file_path),
+            data=cls.finalize_fold(state),
+            **kwargs,
+        )
+
+    @classmethod
+    def fold_chunk(
+        cls: type["GenericData"],
+        state: Any,  # noqa: ANN401
+        chunk: DataFrame,
+    ) -> Any:  # noqa: ANN401
+        """Fold a chunk of data into the running state.
+
+        By default, chunks are gathered in a list to be concatenated.
+
+        Parameters:
+            state (Any): The running state (None for the first chunk).
+            chunk (DataFrame): The chunk of data to be folded.
+
+        Returns:
+            Any: The updated running state.
+
+        """
+        return [*(state or []), chunk]
+
+    @classmethod
+    def finalize_fold(
+        cls: type["GenericData"],
+        state: Any,  # noqa: ANN401
+    ) -> DataFrame:
+        """Convert the final running state into the instance data.
+
+        Parameters:
+            state (Any): The final running state (None if no chunk was read).
+
+        Returns:
+            DataFrame: The instance data.
+
+        """
+        if not state:
+            return DataFrame()
+        return concat(state, ignore_index=True)
 
     def display_data(
         self: "GenericData",
@@ -90,6 +1240,117 @@ class GenericData(ABC):
         # Show figure
         self.fig.show()
 
+    def save_figure(
+        self: "GenericData",
+        file_path: Path,
+        include_plotlyjs: bool | str = True,  # noqa: FBT002
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Path:
+        """Save the figure in a file.
+
+        The file format is identified from the file extension: HTML (.html),
+        plotly JSON (.json) or static image (.png, .svg, .pdf...). Static
+        images require the `kaleido` package.
+
+        Parameters:
+            file_path (Path): Path to the output file.
+            include_plotlyjs (bool | str, default=True): How plotly.js is
+                included in HTML files - True to embed it, "cdn" to reference
+                it online, or a path ending with ".js" to reference a shared
+                local bundle.
+            **kwargs (Any): Keyword arguments passed to the plotly writer.
+
+        Returns:
+            Path: The path to the output file.
+
+        """
+        # Write figure according to file extension
+        file_path = Path(file_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        if file_path.suffix.lower() in (".html", ".htm"):
+            self.fig.write_html(
+                file_path,
+                include_plotlyjs=include_plotlyjs,
+                **kwargs,
+            )
+        elif file_path.suffix.lower() == ".json":
+            self.fig.write_json(file_path, **kwargs)
+        else:
+            import_optional("kaleido", "Saving static images")
+            self.fig.write_image(file_path, **kwargs)
+
+        logger.info(f"Figure was saved in <{file_path}>.")
+        return file_path
+
+    def invalidate_figure_cache(self: "GenericData") -> None:
+        """Remove all cached figures after the data were modified.
+
+        Methods modifying the data must call this method. Figures are also
+        rebuilt when the content of columns used in the figure changed.
+        """
+        self._data_version += 1
+        self._fig_cache.clear()
+
+    def figure_key(
+        self: "GenericData",
+        columns: list[str],
+        params: dict[str, Any],
+    ) -> str:
+        """Build the cache key of a figure.
+
+        Parameters:
+            columns (list[str]): Columns of the data used in the figure.
+            params (dict[str, Any]): Parameters of the figure.
+
+        Returns:
+            str: The key of the figure, based on a fingerprint of the used
+                columns and on the normalized parameters.
+
+        """
+        # Fingerprint used columns
+        columns = sorted({col for col in columns if col in self.data.columns})
+        key = hashlib.blake2b(digest_size=16)
+        key.update(hash_pandas_object(self.data[columns]).to_numpy().tobytes())
+        key.update(str(self.data[columns].dtypes.to_dict()).encode())
+
+        # Add normalized parameters
+        key.update(json.dumps(params, sort_keys=True, default=repr).encode())
+        key.update(str(self._data_version).encode())
+
+        return key.hexdigest()
+
+    def cached_figure(self: "GenericData", key: str) -> Figure | None:
+        """Return a copy of a cached figure.
+
+        Parameters:
+            key (str): The key of the figure.
+
+        Returns:
+            Figure | None: A copy of the cached figure, or None if the figure
+                is not in cache.
+
+        """
+        if key not in self._fig_cache:
+            return None
+        self._fig_cache.move_to_end(key)
+        logger.debug("Figure was loaded from cache.")
+        return Figure(self._fig_cache[key])
+
+    def cache_figure(self: "GenericData", key: str, fig: Figure) -> None:
+        """Store a copy of a built figure in cache.
+
+        Parameters:
+            key (str): The key of the figure.
+            fig (Figure): The built figure.
+
+        """
+        if self.fig_cache_size <= 0:
+            return
+        self._fig_cache[key] = Figure(fig)
+        self._fig_cache.move_to_end(key)
+        while len(self._fig_cache) > self.fig_cache_size:
+            self._fig_cache.popitem(last=False)
+
     @abstractmethod
     def build_figure(
         self: "GenericData",
@@ -108,6 +1369,7 @@ class GenericData(ABC):
 
         """
 
+@dataclass
 class GeoData(GenericData):
     """Represent a class for handling geographical data.
 
@@ -115,7 +1377,12 @@ class GeoData(GenericData):
     building and displaying geographical data using plotly choropleth maps. It
     includes functionality to extract ISO-3 codes from a configuration file,
     add or replace ISO-3 codes for countries, and remove specific ISO-3 codes
-    from the dictionary.
+    from the dictionary, one by one or in batches. When read by chunks with
+    `from_stream`, records are folded into per-country counts stored in the
+    `Data` column. Patient-level data can be aggregated into per-country
+    metrics with `aggregate`, or with `aggregate_stream` for large files.
+    Messy country names (case, accents, aliases, ISO-2 or numeric codes,
+    misspellings) can be resolved with `resolve_names`.
 
     See Also:
         GenericData : Abstract class for storing and managing data.
@@ -141,28 +1408,106 @@ class GeoData(GenericData):
         # Remove an existing ISO-3 code
         GeoData.remove_iso3_code("OLD")
 
+        # Add and remove ISO-3 codes in a single write
+        GeoData.update_iso3_codes(add={"UK": "GBR"}, remove=["NEW"])
+
+        # Resolve messy country names and check unresolved names
+        geo_data = GeoData(file_path="data/sites.xlsx", resolve_names=True)
+        print(geo_data.resolution_report.unresolved)
+
     """
 
+    resolve_names : bool = False
+    """Whether country names are resolved with the country resolver (names
+    normalization, aliases, ISO-2 and numeric codes, approximate matching)
+    instead of exact match in the ISO-3 dictionary."""
+
+    resolution_report : ResolutionReport | None = \
+        field(default=None, init=False, repr=False)
+    """Diagnostics of the resolution of country names of all rows."""
+
+    @method_exec_dur
     def __post_init__(self: "GenericData") -> None:
         """Execute post-initialization steps for the GeoData class.
 
         This method calls the post-initialization method of the parent class
-        GenericData using super(). It extracts ISO-3 codes from the
-        `geodata.iso3.ini` file using the load_iso3_file() method and assigns
-        them to the instance variable iso3_code. It adds ISO-3 codes to the
-        geographical data by mapping the `Country` column to the `ISO3` column
-        based on the iso3_code dictionary.
+        GenericData using super(). It assigns the ISO-3 codes of the shared
+        ISO-3 registry (parsed once from the `geodata.iso3.ini` file) to the
+        instance variable iso3_code. It adds ISO-3 codes to the
+        geographical data by mapping the `Country` column to the categorical
+        `ISO3` column based on the iso3_code dictionary.
         """
         # Execute post initialization for GenericData class
         super().__post_init__()
 
         # Extract ISO-3 code from ini_files/geodata.iso.ini
-        self.iso3_code = GeoData.load_iso3_file()
+        self.iso3_code = ISO3_REGISTRY.country_to_iso3
 
         # Add ISO-3 code to the geographical data
-        self.data["ISO3"] = self.data["Country"]
-        self.data = self.data.replace({"ISO3": self.iso3_code})
+        self.data = self.prepare_rows(self.data)
+
+    def prepare_rows(self: "GeoData", rows: DataFrame) -> DataFrame:
+        """Add ISO-3 codes to rows of geographical data.
+
+        The `Country` column is mapped to the categorical `ISO3` column,
+        without modifying a DataFrame provided by the caller. If names are
+        resolved with the country resolver, the diagnostics report of the
+        rows is added to `resolution_report`.
+
+        Parameters:
+            rows (DataFrame): The rows to be prepared.
+
+        Returns:
+            DataFrame: The rows with the `ISO3` column.
+
+        """
+        rows = rows.copy(deep=False)
+        if self.resolve_names:
+            rows["Country"], rows["ISO3"], report = \
+                COUNTRY_RESOLVER.map(rows["Country"])
+            if self.resolution_report is None:
+                self.resolution_report = report
+            else:
+                self.resolution_report.merge(report)
+        else:
+            rows["Country"], rows["ISO3"] = \
+                GeoData.map_iso3_codes(rows["Country"], self.iso3_code)
+        return rows
+
+    def diagnostics(self: "GeoData") -> dict[str, DataFrame]:
+        """Build the diagnostics table of country names.
+
+        The table is the resolution report of all rows if names are resolved
+        with the country resolver. Otherwise, it lists countries without ISO-3
+        code.
 
+        Returns:
+            dict[str, DataFrame]: The `Countries` diagnostics table.
+
+        """
+        report = self.resolution_report
+        if report is None:
+            iso3 = self.data["ISO3"]
+            counts = self.data.loc[
+                ~iso3.isin(set(self.iso3_code.values())),
+                "Country",
+            ].value_counts()
+            report = ResolutionReport(unresolved={
+                str(key): int(val) for key, val in counts.items() if val > 0
+            })
+        return {"Countries": report.to_frame()}
+
+    def __getstate__(self: "GeoData") -> dict[str, Any]:
+        """Return the state of the instance, e.g. to send it to a process.
+
+        The read-only view of the ISO-3 registry cannot be pickled, so it is
+        replaced by a copy of the dictionary.
+        """
+        state = self.__dict__.copy()
+        state["iso3_code"] = dict(state["iso3_code"])
+        return state
+
+    @method_exec_dur
     def build_figure(
         self: "GeoData",
         **kwargs: Any,  # noqa: ANN401
@@ -170,7 +1515,9 @@ class GeoData(GenericData):
         """Build choropleth map based on the geographical data.
 
         This method builds a choropleth map figure using plotly based on the
-        geographical data stored in the class instance.
+        geographical data stored in the class instance. If the figure was
+        already built out of the same data and parameters, a copy of the
+        cached figure is used.
 
         Parameters:
             kwargs (Any): Keyword arguments.
@@ -183,7 +1530,8 @@ class GeoData(GenericData):
                 data.
             hover_name (str, default="Country"): Column name for hover
                 information.
-            hover_data (str): Additional data to display on hover.
+            hover_data (str | list[str]): Additional column names of data to
+                display on hover.
             color_discrete_sequence (list[str]): List of colors to use for
                 discrete data.
             color_discrete_map (dict[str,str]): Mapping of values to colors
@@ -200,9 +1548,35 @@ class GeoData(GenericData):
             title (str): Title for the map.
             width (int): Width of the map figure.
             height (int):  Height of the map figure.
+            period (str): Column name of the periods (e.g. enrollment month).
+                If set, a single animated map is built, with one frame per
+                period and slider and play controls. Geometry and layout are
+                shared, frames only carry the color values (and hover data)
+                of each period, and the color range is shared by all frames.
+            frame_duration (int, default=500): Duration of animation frames
+                (in milliseconds).
+
+        Raises:
+            ValueError: If the data contain several rows for a location and a
+                period, or if the color column is not numeric, when the
+                `period` parameter is set.
+
+        .. code-block:: python
+            :linenos:
+            :caption: Code example
+
+            # Animate enrollment by country and month
+            geo_data = GeoData(file_path="data/enrollment_by_month.xlsx")
+            geo_data.build_figure(period="Month", scope="europe")
 
         """
         # Extract choropleth parameters
+        kwargs = deepcopy(kwargs)
+        fig_params = deepcopy(kwargs)
+        animation_args = {
+            key: kwargs.pop(key)
+            for key in ["period", "frame_duration"] if key in kwargs
+        }
         display_keys = [
             "lat",
             "lon",
@@ -229,20 +1603,38 @@ class GeoData(GenericData):
             {key:val for key,val in kwargs.items() if key not in display_keys}
 
         # Set choropleth default values
-        if "locations" not in display_args:
-            display_args["locations"] = "ISO3"
-        if "color" not in display_args:
-            display_args["color"] = "Data"
-        if "hover_name" not in display_args:
-            display_args["hover_name"] = "Country"
-        if "color_continuous_scale" not in display_args:
-            display_args["color_continuous_scale"]=["#BFD1D7", "#00485E"]
+        display_args = {
+            "locations"             : "ISO3",
+            "color"                 : "Data",
+            "hover_name"            : "Country",
+            "color_continuous_scale": ["#BFD1D7", "#00485E"],
+            **display_args,
+        }
+        if isinstance(hover_data := display_args.get("hover_data"), str):
+            display_args["hover_data"] = [hover_data]
+
+        # Use cached figure if data and parameters are unchanged
+        columns = [
+            col
+            for key in ["lat", "lon", "locations", "color", "hover_name"]
+            if isinstance(col := display_args.get(key), str)
+        ]
+        if period := animation_args.get("period"):
+            columns.append(period)
+        columns += list(display_args.get("hover_data") or [])
+        fig_key = self.figure_key(columns, fig_params)
+        if (fig := self.cached_figure(fig_key)) is not None:
+            self.fig = fig
+            return
 
         # Build geographical map
-        self.fig = px.choropleth(
-            self.data,
-            **display_args,
-        )
+        if "period" in animation_args:
+            self.fig = self.build_animation(display_args, **animation_args)
+        else:
+            self.fig = px.choropleth(
+                self.data,
+                **display_args,
+            )
 
         # Extract borders information
         if "marker" not in update_args:
@@ -269,28 +1661,377 @@ class GeoData(GenericData):
 
         # Update and show figure
         self.fig.update(**update_args)
+        self.cache_figure(fig_key, self.fig)
+
+    def build_animation(
+        self: "GeoData",
+        display_args: dict[str, Any],
+        period: str,
+        frame_duration: int = 500,
+    ) -> Figure:
+        """Build an animated choropleth map with one frame per period.
+
+        Values are pivoted into one row per location and one column per
+        period. The base map is built out of the first period, and frames only
+        carry the color values (and hover data) of the other periods, so that
+        locations, hover names and layout are not repeated in each frame.
+
+        Parameters:
+            display_args (dict[str, Any]): Choropleth parameters (see
+                `build_figure`).
+            period (str): Column name of the periods.
+            frame_duration (int, default=500): Duration of frames (in
+                milliseconds).
+
+        Returns:
+            Figure: The animated map.
+
+        Raises:
+            ValueError: If the data contain several rows for a location and a
+                period, or if the color column is not numeric.
+
+        """
+        # Control data to be animated
+        locations, color = display_args["locations"], display_args["color"]
+        hover_name = display_args.get("hover_name")
+        hover_data = [
+            col for col in display_args.get("hover_data") or []
+            if col not in (locations, color, hover_name, period)
+        ]
+        data = self.data[self.data[locations].notna()]
+        log_error = None
+        if not is_numeric_dtype(data[color]):
+            log_error = f"Animated maps require a numeric '{color}' column."
+        elif data.duplicated([locations, period]).any():
+            log_error  = f"Data contain several rows for a '{locations}' and "
+            log_error += f"a '{period}' value. You should aggregate them."
+        if log_error:
+            logger.error(log_error)
+            raise ValueError(log_error)
+
+        # Pivot values into one column per period
+        data = data.assign(**{locations: data[locations].astype(str)})
+        pivots = {
+            col: data.pivot(  # noqa: PD010
+                index=locations,
+                columns=period,
+                values=col,
+            )
+            for col in [color, *hover_data]
+        }
+        periods = list(pivots[color].columns)
+        index = pivots[color].index
+
+        # Build base map out of the first period
+        names = data.groupby(locations)[hover_name].first() \
+            if hover_name else None
+        base = DataFrame({
+            locations: index,
+            **({hover_name: names.reindex(index).to_numpy()} if hover_name \
+                else {}),
+            **{col: pivot[periods[0]].to_numpy() for col, pivot in \
+                pivots.items()},
+        })
+        values = pivots[color].to_numpy(dtype="float64")
+        fig = px.choropleth(base, **{
+            "range_color": [np.nanmin(values), np.nanmax(values)],
+            **display_args,
+            "hover_data": hover_data or None,
+        })
+
+        # Build frames carrying only values of each period
+        fig.frames = [
+            Frame(
+                name=str(val),
+                traces=[0],
+                data=[Choropleth(
+                    z=pivots[color][val].to_numpy(),
+                    customdata=np.column_stack([
+                        pivots[col][val].to_numpy() for col in hover_data
+                    ]) if hover_data else None,
+                )],
+            )
+            for val in periods
+        ]
+
+        # Add slider and play controls
+        frame_args = {
+            "frame"     : {"duration": frame_duration, "redraw": True},
+            "transition": {"duration": 0},
+            "mode"      : "immediate",
+        }
+        fig.update_layout(
+            sliders=[{
+                "active"      : 0,
+                "currentvalue": {"prefix": f"{period}: "},
+                "pad"         : {"t": 30},
+                "steps"       : [
+                    {
+                        "label" : str(val),
+                        "method": "animate",
+                        "args"  : [[str(val)], frame_args],
+                    }
+                    for val in periods
+                ],
+            }],
+            updatemenus=[{
+                "type"      : "buttons",
+                "showactive": False,
+                "x"         : 0,
+                "y"         : 0,
+                "xanchor"   : "right",
+                "yanchor"   : "top",
+                "pad"       : {"t": 30, "r": 10},
+                "buttons"   : [
+                    {
+                        "label" : "Play",
+                        "method": "animate",
+                        "args"  : [None, {**frame_args, "fromcurrent": True}],
+                    },
+                    {
+                        "label" : "Pause",
+                        "method": "animate",
+                        "args"  : [[None], {
+                            **frame_args,
+                            "frame": {"duration": 0, "redraw": False},
+                        }],
+                    },
+                ],
+            }],
+        )
+
+        return fig
+
+    @staticmethod
+    @method_exec_dur
+    def map_iso3_codes(
+        countries: Series,
+        iso3_code: Mapping[str, str],
+    ) -> tuple[Categorical, Categorical]:
+        """Map country names to ISO-3 codes.
+
+        Countries are factorized once, and only unique countries are mapped
+        to their ISO-3 code, so that the mapping cost depends on the number of
+        distinct countries and not on the number of rows. Countries without
+        ISO-3 code are kept unchanged.
+
+        Parameters:
+            countries (Series): Country names.
+            iso3_code (Mapping[str, str]): Dictionary mapping country names
+                to ISO-3 codes.
+
+        Returns:
+            tuple[Categorical, Categorical]: Country names and ISO-3 codes as
+                categorical arrays.
+
+        """
+        # Factorize countries and map unique countries only
+        codes, uniques = factorize(countries)
+        iso3 = np.array(
+            [iso3_code.get(country, country) for country in uniques],
+            dtype=object,
+        )
+
+        # Factorize ISO-3 codes as several countries can share the same code
+        # (missing countries keep the -1 code)
+        iso3_codes, iso3_uniques = factorize(iso3)
+        iso3_codes = np.append(iso3_codes, -1)[codes]
+
+        return (
+            Categorical.from_codes(codes, categories=uniques),
+            Categorical.from_codes(iso3_codes, categories=iso3_uniques),
+        )
+
+    @classmethod
+    def fold_chunk(
+        cls: type["GeoData"],
+        state: Series | None,
+        chunk: DataFrame,
+    ) -> Series:
+        """Fold a chunk of data into running per-country counts.
+
+        Parameters:
+            state (Series): The running counts indexed by country (None for
+                the first chunk).
+            chunk (DataFrame): The chunk of data, with a `Country` column.
+
+        Returns:
+            Series: The updated counts indexed by country.
+
+        """
+        counts = chunk["Country"].value_counts()
+        if state is None:
+            return counts
+        return state.add(counts, fill_value=0)
+
+    @classmethod
+    def finalize_fold(
+        cls: type["GeoData"],
+        state: Series | None,
+    ) -> DataFrame:
+        """Convert per-country counts into geographical data.
+
+        Parameters:
+            state (Series): The counts indexed by country.
+
+        Returns:
+            DataFrame: The data with one row per country, and `Country` and
+                `Data` (count) columns.
+
+        """
+        if state is None:
+            state = Series(dtype="int64")
+        return DataFrame({
+            "Country": state.index.astype(str),
+            "Data"   : state.to_numpy(dtype="int64"),
+        })
+
+    @method_exec_dur
+    def aggregate(
+        self: "GeoData",
+        metrics: Mapping[str, Metric | str | tuple],
+        **kwargs: Any,  # noqa: ANN401
+    ) -> "GeoData":
+        """Aggregate patient-level data into per-country metrics.
+
+        Rows are grouped on the codes of the categorical `ISO3` column, and
+        all metrics (counts, rates, medians, weighted means...) are computed
+        in a single vectorized pass (see `Aggregator`).
+
+        Parameters:
+            metrics (Mapping[str, Metric | str | tuple]): Metrics indexed by
+                output column name. Name a metric `Data` to use it as default
+                color of `build_figure`.
+            **kwargs (Any): Keyword arguments passed to the class constructor.
+
+        Returns:
+            GeoData: A new instance with one row per country, and `Country`,
+                `ISO3` and metric columns.
+
+        .. code-block:: python
+            :linenos:
+            :caption: Code example
+
+            patients = GeoData(file_path="data/patients.xlsx")
+            geo_data = patients.aggregate({
+                "Data"  : "count",
+                "Age"   : ("median", "Age"),
+                "Events": Metric("rate", "Event", scale=100),
+            })
+            geo_data.build_figure(hover_data=["Age", "Events"])
+
+        """
+        aggregator = Aggregator(metrics)
+        data = aggregator.finalize(aggregator.partial(self.data))
+        return type(self).from_frame(GeoData.country_frame(data), **kwargs)
+
+    @classmethod
+    @method_exec_dur
+    def aggregate_stream(  # noqa: PLR0913
+        cls: type["GeoData"],
+        file_path: Path,
+        metrics: Mapping[str, Metric | str | tuple],
+        chunk_size: int = 100_000,
+        file_format: str | None = None,
+        read_args: dict[str, Any] | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> "GeoData":
+        """Aggregate a large patient-level file into per-country metrics.
+
+        The file is read by chunks: ISO-3 codes are mapped and metrics are
+        aggregated into a partial state for each chunk, and partial states
+        are merged. Peak memory is therefore proportional to the chunk size
+        (and to the number of distinct values of median columns), and not to
+        the file size.
+
+        Parameters:
+            file_path (Path): Path to the file.
+            metrics (Mapping[str, Metric | str | tuple]): Metrics indexed by
+                output column name (see `aggregate`).
+            chunk_size (int, default=100_000): Maximum number of rows per
+                chunk.
+            file_format (str, default=None): Format of the file (identified
+                from the file extension if not set).
+            read_args (dict[str, Any], default=None): Keyword arguments passed
+                to the streamer of the file format.
+            **kwargs (Any): Keyword arguments passed to the class constructor.
+
+        Returns:
+            GeoData: The instance with one row per country.
+
+        """
+        # Aggregate chunks of data
+        aggregator, state = Aggregator(metrics), None
+        iso3_code = ISO3_REGISTRY.country_to_iso3
+        mapper = COUNTRY_RESOLVER.map if kwargs.get("resolve_names") else \
+            partial(cls.map_iso3_codes, iso3_code=iso3_code)
+        for chunk in cls.iter_chunks(
+            file_path,
+            chunk_size,
+            file_format,
+            **(read_args or {}),
+        ):
+            iso3 = mapper(chunk["Country"])[1]
+            state = aggregator.merge(
+                state,
+                aggregator.partial(chunk.assign(ISO3=iso3)),
+            )
+        logger.info(f"Data were aggregated from <{file_path}>.")
+
+        # Build instance
+        return cls(
+            file_path=Path(file_path),
+            data=GeoData.country_frame(aggregator.finalize(state)),
+            **kwargs,
+        )
+
+    @staticmethod
+    def country_frame(data: DataFrame) -> DataFrame:
+        """Convert metrics indexed by ISO-3 code into geographical data.
+
+        Parameters:
+            data (DataFrame): Metrics indexed by ISO-3 code.
+
+        Returns:
+            DataFrame: The data with `Country`, `ISO3` and metric columns.
+                Countries without ISO-3 code keep their name.
+
+        """
+        iso3 = data.index.astype(str)
+        return DataFrame({
+            "Country": [
+                (ISO3_REGISTRY.countries(code) or (code,))[0] for code in iso3
+            ],
+            "ISO3"   : iso3,
+            **{col: data[col].to_numpy() for col in data.columns},
+        })
 
     @staticmethod
     def load_iso3_file() -> dict[str, str]:
         """Build a dictionary of ISO-3 codes.
 
-        Open and read the 'geodata.iso3.ini' file to build a dictionary
-        of ISO-3 codes.
+        Return a copy of the ISO-3 dictionary of the shared ISO-3 registry,
+        which parses the 'geodata.iso3.ini' file only when it changed.
 
         Returns:
             dict[str, str]: A dictionary mapping keys to ISO-3 values.
 
         """
-        # Open ini_files/geodata.iso.ini and build iso3_code dictionary
-        iso3_code = {}
-        iso3_file_path = Path(MODULE_PATH / "ini_files/geodata.iso3.ini")
-        with iso3_file_path.open() as file:
-            for line in file:
-                iso3, country = line.strip().split(":")
-                iso3_code[country] = iso3
+        return dict(ISO3_REGISTRY.country_to_iso3)
+
+    @staticmethod
+    def find_countries(iso3: str) -> tuple[str, ...]:
+        """Find the countries set to an ISO-3 code.
 
-        # Return dictionary
-        return iso3_code
+        Parameters:
+            iso3 (str): The ISO-3 code.
+
+        Returns:
+            tuple[str, ...]: Country names set to this ISO-3 code (empty if
+                the code does not exist).
+
+        """
+        return ISO3_REGISTRY.countries(iso3)
 
     @staticmethod
     def add_iso3_code(country: str, iso3: str) -> None:
@@ -306,23 +2047,7 @@ class GeoData(GenericData):
                 country.
 
         """
-        # Load and extract ISO3 codes
-        iso3_code = GeoData.load_iso3_file()
-
-        # Control if ISO code already exists
-        if iso3 in iso3_code.values():
-            keys = [key for key, val in iso3_code.items() if val == iso3]
-            log_error = f"<{iso3}> is already set to <{keys}>"
-            logger.error(log_error)
-            raise ValueError(log_error)
-
-        # Add new code to country
-        iso3_code[country] = iso3
-        iso3_file_path = Path(MODULE_PATH / "ini_files/geodata.iso3.ini")
-        with iso3_file_path.open(mode="w") as file:
-            for key, value in iso3_code.items():
-                file.write(f"{value}:{key}\n")
-
+        GeoData.update_iso3_codes(add={country: iso3})
         logger.info(f"Added <{iso3}:{country}> to the ISO-3 dictionary.")
 
     @staticmethod
@@ -333,16 +2058,57 @@ class GeoData(GenericData):
             iso3 (str): The ISO-3 code to be removed from the dictionary.
 
         """
-        # Load and extract ISO3 codes
-        iso3_code = GeoData.load_iso3_file()
+        GeoData.update_iso3_codes(remove=[iso3])
+        logger.info(f"Removed ISO-3 <{iso3}> from the ISO-3 dictionary.")
 
-        # Remove ISO3 code
-        iso3_code = {key:val for key, val in iso3_code.items() if val != iso3}
+    @staticmethod
+    @method_exec_dur
+    def update_iso3_codes(
+        add: Mapping[str, str] | None = None,
+        remove: Iterable[str] | None = None,
+    ) -> None:
+        """Apply a batch of changes to the ISO-3 dictionary in a single write.
 
-        # Save updated ISO3 dictionary
-        iso3_file_path = Path(MODULE_PATH / "ini_files/geodata.iso3.ini")
-        with iso3_file_path.open(mode="w") as file:
-            for key, value in iso3_code.items():
-                file.write(f"{value}:{key}\n")
+        The ISO-3 file is updated under an inter-process lock and replaced
+        atomically, so that parallel processes can safely extend it.
 
-        logger.info(f"Removed ISO-3 <{iso3}> from the ISO-3 dictionary.")
+        Parameters:
+            add (Mapping[str, str], default=None): ISO-3 codes to be added or
+                replaced, indexed by country name.
+            remove (Iterable[str], default=None): ISO-3 codes to be removed.
+
+        Raises:
+            ValueError: If an ISO-3 code to be added already exists for
+                another country.
+
+        .. code-block:: python
+            :linenos:
+            :caption: Code example
+
+            # Apply changes in a single write
+            GeoData.update_iso3_codes(
+                add={"UK": "GBR", "USA": "USA"},
+                remove=["NCO"],
+            )
+
+            # Gather changes in a transaction
+            with GeoData.edit_iso3_codes() as batch:
+                batch.add("UK", "GBR")
+                batch.remove("NCO")
+
+        """
+        ISO3_REGISTRY.update(add=add, remove=remove)
+
+    @staticmethod
+    def edit_iso3_codes() -> AbstractContextManager[Iso3Transaction]:
+        """Gather changes of the ISO-3 dictionary in a transaction.
+
+        Changes are written in a single write when the context exits without
+        exception.
+
+        Returns:
+            AbstractContextManager[Iso3Transaction]: Context manager yielding
+                the batch of changes to be filled.
+
+        """
+        return ISO3_REGISTRY.transaction()
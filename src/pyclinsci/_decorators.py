@@ -1,14 +1,298 @@
 # Import libraries and objects
+import json
 import time
-from collections.abc import Callable
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from inspect import iscoroutinefunction
+from math import ceil
 from typing import Any
 
 from loguru import logger
 
 
+@dataclass
+class MethodStats:
+    """Aggregated execution statistics of a method."""
+
+    calls       : int            = 0
+    """Number of calls of the method."""
+
+    durations   : list[float]    = field(default_factory=list)
+    """Execution durations of the method (in seconds)."""
+
+    peak_memory : int            = 0
+    """Peak memory allocated during an execution (in bytes)."""
+
+    parents     : Counter[str]   = field(default_factory=Counter)
+    """Number of calls by calling method."""
+
+    children    : Counter[str]   = field(default_factory=Counter)
+    """Number of calls by called method."""
+
+    def percentile(self: "MethodStats", rank: float) -> float:
+        """Compute a percentile of execution durations (nearest-rank).
+
+        Parameters:
+            rank (float): Rank of the percentile, between 0 and 100.
+
+        Returns:
+            float: The percentile of execution durations (in seconds).
+
+        """
+        durations = sorted(self.durations)
+        return durations[max(ceil(rank / 100 * len(durations)) - 1, 0)]
+
+    def summary(self: "MethodStats") -> dict[str, Any]:
+        """Summarize execution statistics of the method.
+
+        Returns:
+            dict[str, Any]: Number of calls, total, mean, minimum, median,
+                95th percentile and maximum durations, peak memory, calling
+                and called methods.
+
+        """
+        return {
+            "calls"      : self.calls,
+            "total"      : sum(self.durations),
+            "mean"       : sum(self.durations) / self.calls,
+            "min"        : min(self.durations),
+            "p50"        : self.percentile(50),
+            "p95"        : self.percentile(95),
+            "max"        : max(self.durations),
+            "peak_memory": self.peak_memory,
+            "parents"    : dict(self.parents),
+            "children"   : dict(self.children),
+        }
+
+
+@dataclass
+class _Span:
+    """Execution of a profiled method."""
+
+    qualname   : str
+    start_mem  : int = 0
+    child_peak : int = 0
+
+
+_SPANS: ContextVar[tuple[_Span, ...]] = ContextVar("_SPANS", default=())
+"""Stack of profiled methods being executed in the current context."""
+
+
+@dataclass
+class ExecProfiler:
+    """Registry of execution statistics of decorated methods.
+
+    When enabled, each call of a method decorated with `method_exec_dur` is
+    recorded: number of calls, durations, calling and called methods and,
+    optionally, peak memory allocated (traced with `tracemalloc`). When
+    disabled, decorated methods only log their execution duration.
+
+    .. code-block:: python
+        :linenos:
+        :caption: Code example
+
+        # Profile a batch of figures
+        with profiler.profile(trace_memory=True):
+            for file_path in file_paths:
+                GeoData(file_path=file_path).build_figure()
+
+        # Print aggregated statistics
+        print(profiler.report())
+
+    """
+
+    enabled      : bool                   = False
+    """Whether calls of decorated methods are recorded."""
+
+    trace_memory : bool                   = False
+    """Whether peak memory of decorated methods is recorded."""
+
+    stats        : dict[str, MethodStats] = field(default_factory=dict)
+    """Execution statistics indexed by method qualified name."""
+
+    _started_tracing : bool = field(default=False, init=False, repr=False)
+
+    def enable(
+        self: "ExecProfiler",
+        trace_memory: bool = False,  # noqa: FBT001, FBT002
+    ) -> None:
+        """Start recording calls of decorated methods.
+
+        Parameters:
+            trace_memory (bool, default=False): Whether peak memory is
+                recorded (starts `tracemalloc` if needed, which slows down
+                execution, and stops it on `disable` if it was started).
+
+        """
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self.enabled = True
+
+    def disable(self: "ExecProfiler") -> None:
+        """Stop recording calls of decorated methods."""
+        self.enabled = False
+
+        # Leave tracing started by the caller running
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self.trace_memory = False
+
+    def reset(self: "ExecProfiler") -> None:
+        """Remove all recorded statistics."""
+        self.stats.clear()
+
+    @contextmanager
+    def profile(
+        self: "ExecProfiler",
+        trace_memory: bool = False,  # noqa: FBT001, FBT002
+    ) -> Iterator["ExecProfiler"]:
+        """Record calls of decorated methods within a context.
+
+        Parameters:
+            trace_memory (bool, default=False): Whether peak memory is
+                recorded.
+
+        Yields:
+            ExecProfiler: The profiler.
+
+        """
+        self.enable(trace_memory=trace_memory)
+        try:
+            yield self
+        finally:
+            self.disable()
+
+    def summary(self: "ExecProfiler") -> dict[str, dict[str, Any]]:
+        """Summarize execution statistics of all recorded methods.
+
+        Returns:
+            dict[str, dict[str, Any]]: Statistics indexed by method qualified
+                name, sorted by decreasing total duration.
+
+        """
+        summary = {
+            key: val.summary() for key, val in self.stats.items() if val.calls
+        }
+        return dict(
+            sorted(summary.items(), key=lambda item: -item[1]["total"]),
+        )
+
+    def report(self: "ExecProfiler", fmt: str = "table") -> str:
+        """Build a report of execution statistics.
+
+        Parameters:
+            fmt (str, default="table"): Format of the report - "table" for a
+                text table, or "json" for a JSON document.
+
+        Returns:
+            str: The report.
+
+        Raises:
+            ValueError: If the format is not valid.
+
+        """
+        # Build JSON report
+        summary = self.summary()
+        if fmt == "json":
+            return json.dumps(summary, indent=2)
+        if fmt != "table":
+            log_error = f"Method cannot handle '{fmt}' fmt-parameter."
+            logger.error(log_error)
+            raise ValueError(log_error)
+
+        # Build table report
+        width = max([len(key) for key in summary] + [6])
+        lines = [
+            f"{'Method':<{width}} {'Calls':>7} {'Total':>9} {'Mean':>9} "
+            f"{'Min':>9} {'P50':>9} {'P95':>9} {'Max':>9} {'Peak MB':>8}",
+        ]
+        for key, val in summary.items():
+            lines.append(
+                f"{key:<{width}} {val['calls']:>7} {val['total']:>9.4f} "
+                f"{val['mean']:>9.4f} {val['min']:>9.4f} {val['p50']:>9.4f} "
+                f"{val['p95']:>9.4f} {val['max']:>9.4f} "
+                f"{val['peak_memory'] / 1024**2:>8.2f}",
+            )
+        return "\n".join(lines)
+
+    def record(self: "ExecProfiler", qualname: str, duration: float) -> None:
+        """Record an execution measured out of the profiler.
+
+        Executions of decorated methods in worker processes are not seen by
+        the profiler of the main process, so their durations are recorded
+        once they are sent back, as calls of the method being executed.
+
+        Parameters:
+            qualname (str): Qualified name of the executed method.
+            duration (float): Execution duration (in seconds).
+
+        """
+        if self.enabled:
+            token, span = self.enter_span(qualname)
+            self.exit_span(token, span, duration)
+
+    def enter_span(self: "ExecProfiler", qualname: str) -> tuple[Any, _Span]:
+        """Record the start of a decorated method."""
+        # Record memory state
+        span = _Span(qualname)
+        if self.trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            for parent in _SPANS.get():
+                parent.child_peak = max(parent.child_peak, peak)
+            tracemalloc.reset_peak()
+            span.start_mem = current
+
+        # Push method in stack of methods being executed
+        return _SPANS.set((*_SPANS.get(), span)), span
+
+    def exit_span(
+        self: "ExecProfiler",
+        token: Any,  # noqa: ANN401
+        span: _Span,
+        duration: float,
+    ) -> None:
+        """Record the end of a decorated method."""
+        # Pop method from stack of methods being executed
+        _SPANS.reset(token)
+        spans = _SPANS.get()
+
+        # Update execution statistics
+        stats = self.stats.setdefault(span.qualname, MethodStats())
+        stats.calls += 1
+        stats.durations.append(duration)
+        if spans:
+            stats.parents[spans[-1].qualname] += 1
+            parent = self.stats.setdefault(spans[-1].qualname, MethodStats())
+            parent.children[span.qualname] += 1
+
+        # Update peak memory
+        if self.trace_memory and tracemalloc.is_tracing():
+            peak = max(tracemalloc.get_traced_memory()[1], span.child_peak)
+            stats.peak_memory = max(stats.peak_memory, peak - span.start_mem)
+            for parent in spans:
+                parent.child_peak = max(parent.child_peak, peak)
+
+
+profiler = ExecProfiler()
+"""Profiler recording calls of methods decorated with `method_exec_dur`."""
+
+
 def method_exec_dur(func: Callable[..., Any]) -> Callable[..., Any]:
     """Log the execution duration of a method.
 
+    The execution is also recorded by `profiler` when it is enabled. The
+    decorator supports both functions and coroutine functions, and keeps the
+    metadata of the decorated method. Log messages are only formatted if a
+    handler accepts debug messages.
+
     Parameters:
         func (Callable[..., Any])): The method to be decorated.
 
@@ -17,26 +301,53 @@ def method_exec_dur(func: Callable[..., Any]) -> Callable[..., Any]:
             duration of the input method.
 
     """
+    qualname = func.__qualname__
+
+    # Define wrapper functions to be called before and after the method
+    def enter() -> tuple[Any, _Span | None, float]:
+        logger.debug("Enter {} method.", qualname)
+        token, span = None, None
+        if profiler.enabled:
+            token, span = profiler.enter_span(qualname)
+        return token, span, time.perf_counter()
+
+    def leave(
+        token: Any,  # noqa: ANN401
+        span: _Span | None,
+        start_time: float,
+    ) -> None:
+        duration = time.perf_counter() - start_time
+        if span is not None:
+            profiler.exit_span(token, span, duration)
+        logger.debug(
+            "Method ({}) was executed in {:.2f} sec.",
+            qualname,
+            duration,
+        )
+        logger.debug("Exit {} method.", qualname)
+
+    # Define wrapper coroutine function
+    if iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(
+            *args: Any,  # noqa: ANN401
+            **kwargs: Any,  # noqa: ANN401
+        ) -> Any:  # noqa: ANN401
+            token, span, start_time = enter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                leave(token, span, start_time)
+
+        return async_wrapper
+
     # Define wrapper function
-    def wrapper(*args: Any, **kwargs: Any) -> Callable[..., Any]:# noqa: ANN401
-        # Log message for entering method
-        log_txt = f"Enter {func.__qualname__} method."
-        logger.debug(log_txt)
-
-        # Execute function and evaluate execution time
-        start_time = time.perf_counter()
-        result     = func(*args, **kwargs)
-        end_time   = time.perf_counter()
-
-        # Print log message
-        log_txt  = f"Method ({func.__qualname__}) was executed in "
-        log_txt += f"{end_time - start_time:.2f} sec."
-        logger.debug(log_txt)
-
-        # Log message for exiting method
-        log_txt = f"Exit {func.__qualname__} method."
-        logger.debug(log_txt)
-
-        return result
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        token, span, start_time = enter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            leave(token, span, start_time)
 
     return wrapper
@@ -0,0 +1,162 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+
+# Import libraries and objects
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+import numpy as np
+from loguru import logger
+from pandas import DataFrame, Series, to_numeric
+from pandas.api.types import (
+    infer_dtype,
+    is_bool_dtype,
+    is_float_dtype,
+    is_integer_dtype,
+    is_object_dtype,
+    is_string_dtype,
+)
+
+from pyclinsci._settings import import_optional
+
+
+@dataclass
+class MemoryReport:
+    """Memory footprint of data before and after compaction."""
+
+    before  : int                        = 0
+    """Memory used by the data before compaction (in bytes)."""
+
+    after   : int                        = 0
+    """Memory used by the data after compaction (in bytes)."""
+
+    columns : dict[str, tuple[str, str]] = field(default_factory=dict)
+    """Previous and new data types, indexed by converted column."""
+
+    @property
+    def ratio(self: "MemoryReport") -> float:
+        """Ratio of memory used after compaction to memory used before."""
+        return self.after / self.before if self.before else 1.0
+
+    def __str__(self: "MemoryReport") -> str:
+        """Summarize the memory footprint in a single line."""
+        log_txt  = f"{self.before / 1024**2:.2f} MB -> "
+        log_txt += f"{self.after / 1024**2:.2f} MB ({self.ratio:.1%}, "
+        log_txt += f"{len(self.columns)} columns converted)"
+        return log_txt
+
+
+def _compact_numbers(series: Series) -> Series:
+    """Downcast a numeric column to the smallest lossless data type."""
+    # Downcast integers to smallest signed integers (so that differences of
+    # values do not wrap around)
+    if is_integer_dtype(series.dtype):
+        return to_numeric(series, downcast="integer")
+
+    # Downcast floats only if all values are kept unchanged
+    compact = to_numeric(series, downcast="float")
+    if compact.dtype == series.dtype:
+        return series
+    values, compact_values = series.to_numpy(), compact.to_numpy()
+    lossless = np.array_equal(
+        values,
+        compact_values.astype(values.dtype),
+        equal_nan=True,
+    )
+    return compact if lossless else series
+
+
+def _compact_strings(
+    series: Series,
+    max_category_ratio: float,
+    arrow_strings: bool,  # noqa: FBT001
+) -> Series:
+    """Convert a string column to categorical or pyarrow-backed strings."""
+    # Keep columns mixing strings and other objects unchanged
+    if infer_dtype(series, skipna=True) not in {"string", "empty"}:
+        return series
+
+    # Convert column with few distinct values to categorical
+    if series.nunique(dropna=True) <= max_category_ratio * len(series):
+        return series.astype("category")
+    if arrow_strings:
+        return series.astype("string[pyarrow]")
+    return series
+
+
+def compact_frame(
+    data: DataFrame,
+    max_category_ratio: float = 0.5,
+    arrow_strings: bool = False,  # noqa: FBT001, FBT002
+    exclude: Iterable[str] = (),
+) -> tuple[DataFrame, MemoryReport]:
+    """Reduce the memory footprint of a DataFrame.
+
+    Numeric columns are downcast to the smallest data type holding their
+    values without loss. String columns with few distinct values (such as
+    countries, sites or arms) are converted to categorical columns, and other
+    string columns are optionally converted to pyarrow-backed strings.
+    Columns of the input DataFrame are not modified.
+
+    Parameters:
+        data (DataFrame): The DataFrame to be compacted.
+        max_category_ratio (float, default=0.5): Maximum ratio of distinct
+            values to rows for a string column to be converted to a
+            categorical column (0 to disable categorical conversion).
+        arrow_strings (bool, default=False): Whether other string columns are
+            converted to pyarrow-backed strings (requires `pyarrow` package).
+        exclude (Iterable[str], default=()): Columns kept unchanged.
+
+    Returns:
+        tuple[DataFrame, MemoryReport]: The compacted DataFrame and its memory
+            footprint before and after compaction.
+
+    .. code-block:: python
+        :linenos:
+        :caption: Code example
+
+        data, report = compact_frame(data, arrow_strings=True)
+        print(report)
+
+    """
+    # Import pyarrow if needed
+    if arrow_strings:
+        import_optional("pyarrow", "Converting to pyarrow strings")
+
+    # Convert columns one by one
+    report = MemoryReport(before=int(data.memory_usage(deep=True).sum()))
+    columns = {}
+    exclude = set(exclude)
+    for col in data.columns:
+        series = data[col]
+        if col in exclude or is_bool_dtype(series.dtype):
+            continue
+
+        # Downcast numeric columns
+        if is_integer_dtype(series.dtype) or is_float_dtype(series.dtype):
+            compact = _compact_numbers(series)
+
+        # Convert string columns to categorical or pyarrow-backed strings
+        elif is_object_dtype(series.dtype) or is_string_dtype(series.dtype):
+            compact = _compact_strings(
+                series,
+                max_category_ratio,
+                arrow_strings,
+            )
+        else:
+            continue
+
+        # Store converted column
+        if compact.dtype != series.dtype:
+            columns[col] = compact
+            report.columns[col] = (str(series.dtype), str(compact.dtype))
+
+    # Build compacted DataFrame without copying unchanged columns
+    if columns:
+        data = data.copy(deep=False)
+        for col, val in columns.items():
+            data[col] = val
+    report.after = int(data.memory_usage(deep=True).sum())
+    logger.debug(f"Data were compacted: {report}.")
+
+    return data, report
+
@@ -2,10 +2,10 @@
 
 # Import libraries and objects
 import os
+import re
 from pathlib import Path
 
 from loguru import logger
-from PyQt6 import QtWidgets
 
 
 def dialog_select_file_dir(
@@ -31,8 +31,11 @@ def dialog_select_file_dir(
         ValueError: If the function parameter 'func' is not valid.
 
     """
-    # Test if path is a directory
-    qt_app = QtWidgets.QApplication([])
+    # Import PyQt6 only when a dialog box is needed
+    from PyQt6 import QtWidgets
+
+    # Test if path is a directory (reusing running application if any)
+    qt_app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
     if not Path(dir_path).is_dir():
         log_error = "No valid folder path was provided."
         logger.error(log_error)
@@ -83,3 +86,49 @@ def dialog_select_file_dir(
     # Return path
     qt_app.closeAllWindows()
     return path
+
+
+def select_files(
+    dir_path: str = Path.cwd(),
+    pattern : str = "*",
+    regex   : str | None = None,
+    recursive: bool = False,  # noqa: FBT001, FBT002
+) -> list[Path]:
+    """Select files in a directory without any dialog box.
+
+    This function is the headless counterpart of `dialog_select_file_dir`,
+    to be used on machines without display (e.g. batch nodes).
+
+    Parameters:
+        dir_path (str, default=Path.cwd()): The directory where files are
+            selected.
+        pattern (str, default="*"): Glob pattern of the file names (e.g.
+            "*.xlsx" or "site_*.csv").
+        regex (str, default=None): Regular expression that the file names
+            must fully match, in addition to the glob pattern.
+        recursive (bool, default=False): Whether files are also selected in
+            sub-directories.
+
+    Returns:
+        list[Path]: The selected file paths, sorted by name.
+
+    Raises:
+        FileNotFoundError: If the provided directory path is not valid.
+
+    """
+    # Test if path is a directory
+    if not Path(dir_path).is_dir():
+        log_error = "No valid folder path was provided."
+        logger.error(log_error)
+        raise FileNotFoundError(log_error)
+
+    # Select files matching patterns
+    paths = Path(dir_path).rglob(pattern) if recursive \
+        else Path(dir_path).glob(pattern)
+    paths = sorted(
+        path for path in paths
+        if path.is_file() and (regex is None or re.fullmatch(regex, path.name))
+    )
+    logger.info(f"Selected {len(paths)} files in <{dir_path}>.")
+
+    return paths
@@ -0,0 +1,240 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+
+# Import libraries and objects
+import os
+import stat
+import sys
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import RLock
+from types import MappingProxyType
+
+from loguru import logger
+
+from pyclinsci._settings import MODULE_PATH
+
+ISO3_FILE_PATH = Path(MODULE_PATH / "ini_files/geodata.iso3.ini")
+"""Path to the ISO-3 file of the package."""
+
+
+@contextmanager
+def file_lock(file_path: Path) -> Iterator[None]:
+    """Hold an exclusive inter-process lock associated with a file.
+
+    The lock is taken on a `.lock` file next to the file, so that the file
+    itself can be replaced while the lock is held.
+
+    Parameters:
+        file_path (Path): Path to the file to be locked.
+
+    """
+    lock_path = Path(file_path).with_name(f"{Path(file_path).name}.lock")
+    with lock_path.open(mode="a") as lock_file:
+        if sys.platform == "win32":
+            import msvcrt
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if sys.platform == "win32":
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+@dataclass
+class Iso3Transaction:
+    """Batch of changes to be applied to the ISO-3 dictionary."""
+
+    add_codes    : dict[str, str] = field(default_factory=dict)
+    """ISO-3 codes to be added, indexed by country name."""
+
+    remove_codes : list[str]      = field(default_factory=list)
+    """ISO-3 codes to be removed."""
+
+    def add(self: "Iso3Transaction", country: str, iso3: str) -> None:
+        """Add or replace an ISO-3 code for a country in the batch."""
+        self.add_codes[country] = iso3
+
+    def remove(self: "Iso3Transaction", iso3: str) -> None:
+        """Remove an ISO-3 code in the batch."""
+        self.remove_codes.append(iso3)
+
+
+@dataclass
+class Iso3Registry:
+    """In-memory registry of the ISO-3 dictionary.
+
+    The registry parses the ISO-3 file once and keeps two indexes: country
+    names to ISO-3 codes, and ISO-3 codes to country names. It is shared by
+    all GeoData instances of the process, and is reloaded only when the size
+    or modification time of the file changes.
+
+    """
+
+    file_path : Path = ISO3_FILE_PATH
+    """Path to the ISO-3 file, with one `ISO3:Country` entry per line."""
+
+    _stat : tuple[int, int] | None = field(default=None, init=False)
+    _country_to_iso3 : dict[str, str] = field(default_factory=dict,init=False)
+    _iso3_to_countries : dict[str, tuple[str, ...]] = \
+        field(default_factory=dict, init=False)
+    _lock : RLock = field(default_factory=RLock, init=False, repr=False)
+
+    @property
+    def country_to_iso3(self: "Iso3Registry") -> MappingProxyType[str, str]:
+        """Read-only mapping of country names to ISO-3 codes."""
+        self.refresh()
+        return MappingProxyType(self._country_to_iso3)
+
+    @property
+    def iso3_to_countries(
+        self: "Iso3Registry",
+    ) -> MappingProxyType[str, tuple[str, ...]]:
+        """Read-only mapping of ISO-3 codes to country names."""
+        self.refresh()
+        return MappingProxyType(self._iso3_to_countries)
+
+    def countries(self: "Iso3Registry", iso3: str) -> tuple[str, ...]:
+        """Return the country names of an ISO-3 code.
+
+        Parameters:
+            iso3 (str): The ISO-3 code.
+
+        Returns:
+            tuple[str, ...]: Country names set to this ISO-3 code (empty if
+                the code does not exist).
+
+        """
+        return self.iso3_to_countries.get(iso3, ())
+
+    def refresh(self: "Iso3Registry") -> None:
+        """Reload the ISO-3 file if it changed since it was parsed."""
+        stat = self.file_path.stat()
+        if (stat.st_size, stat.st_mtime_ns) == self._stat:
+            return
+
+        with self._lock:
+            # Open ISO-3 file and build both indexes
+            country_to_iso3, iso3_to_countries = {}, {}
+            with self.file_path.open() as file:
+                for line in file:
+                    iso3, country = line.strip().split(":")
+                    country_to_iso3[country] = iso3
+                    iso3_to_countries.setdefault(iso3, []).append(country)
+
+            # Replace indexes
+            self._country_to_iso3 = country_to_iso3
+            self._iso3_to_countries = {
+                key: tuple(val) for key, val in iso3_to_countries.items()
+            }
+            self._stat = (stat.st_size, stat.st_mtime_ns)
+            log_txt = f"ISO-3 dictionary was loaded from <{self.file_path}>."
+            logger.debug(log_txt)
+
+    def invalidate(self: "Iso3Registry") -> None:
+        """Force the ISO-3 file to be parsed on next access."""
+        self._stat = None
+
+    def update(
+        self: "Iso3Registry",
+        add: Mapping[str, str] | None = None,
+        remove: Iterable[str] | None = None,
+    ) -> None:
+        """Apply a batch of changes to the ISO-3 file in a single write.
+
+        Changes are applied under an inter-process lock, on the latest
+        content of the file, so that concurrent processes do not lose
+        updates. The file is written to a temporary file and then atomically
+        renamed, so that readers never see a partially written file. ISO-3
+        codes are removed before new codes are added.
+
+        Parameters:
+            add (Mapping[str, str], default=None): ISO-3 codes to be added or
+                replaced, indexed by country name.
+            remove (Iterable[str], default=None): ISO-3 codes to be removed.
+
+        Raises:
+            ValueError: If an ISO-3 code to be added already exists for
+                another country. No change is written in this case.
+
+        """
+        add, remove = dict(add or {}), set(remove or ())
+        with self._lock, file_lock(self.file_path):
+            # Load latest content of the ISO-3 file
+            self.invalidate()
+            iso3_code = {
+                key: val for key, val in self.country_to_iso3.items()
+                if val not in remove
+            }
+
+            # Control if ISO codes already exist for other countries
+            owners = {}
+            for country, iso3 in [*iso3_code.items(), *add.items()]:
+                if country not in add or add[country] == iso3:
+                    owners.setdefault(iso3, set()).add(country)
+            for country, iso3 in add.items():
+                if keys := sorted(owners[iso3] - {country}):
+                    log_error = f"<{iso3}> is already set to <{keys}>"
+                    logger.error(log_error)
+                    raise ValueError(log_error)
+
+            # Write updated ISO-3 file atomically
+            iso3_code.update(add)
+            with NamedTemporaryFile(
+                mode="w",
+                dir=self.file_path.parent,
+                prefix=f".{self.file_path.name}.",
+                delete=False,
+            ) as file:
+                for key, value in iso3_code.items():
+                    file.write(f"{value}:{key}\n")
+                file.flush()
+                os.fsync(file.fileno())
+
+            # Keep permissions of the ISO-3 file (temporary files are 0600)
+            try:
+                mode = stat.S_IMODE(self.file_path.stat().st_mode)
+            except FileNotFoundError:
+                mode = 0o644
+            Path(file.name).chmod(mode)
+            Path(file.name).replace(self.file_path)
+            self.invalidate()
+
+        log_txt  = f"Updated ISO-3 dictionary ({len(add)} added, "
+        log_txt += f"{len(remove)} removed)."
+        logger.debug(log_txt)
+
+    @contextmanager
+    def transaction(self: "Iso3Registry") -> Iterator[Iso3Transaction]:
+        """Gather changes of the ISO-3 file and apply them in a single write.
+
+        Changes are applied when the context exits without exception.
+
+        Yields:
+            Iso3Transaction: The batch of changes to be filled.
+
+        .. code-block:: python
+            :linenos:
+            :caption: Code example
+
+            with ISO3_REGISTRY.transaction() as batch:
+                batch.add("Great Britain", "GBR")
+                batch.remove("NCO")
+
+        """
+        batch = Iso3Transaction()
+        yield batch
+        self.update(add=batch.add_codes, remove=batch.remove_codes)
+
+
+ISO3_REGISTRY = Iso3Registry()
+"""ISO-3 registry shared by GeoData instances."""
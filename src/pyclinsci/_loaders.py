@@ -0,0 +1,682 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+
+# Import libraries and objects
+import operator
+from collections.abc import Callable, Iterator, Sequence
+from importlib.util import find_spec
+from itertools import islice
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from loguru import logger
+from pandas import DataFrame, concat, read_csv, read_excel
+
+from pyclinsci._settings import import_optional
+
+LOADERS: dict[str, Callable[..., DataFrame]] = {}
+"""Registered loaders, indexed by file format."""
+
+EXTENSIONS: dict[str, str] = {}
+"""File formats of the registered loaders, indexed by file extension."""
+
+STREAMERS: dict[str, Callable[..., Iterator[DataFrame]]] = {}
+"""Registered streamers yielding chunks of data, indexed by file format."""
+
+FILTER_OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    "=="     : operator.eq,
+    "="      : operator.eq,
+    "!="     : operator.ne,
+    "<"      : operator.lt,
+    "<="     : operator.le,
+    ">"      : operator.gt,
+    ">="     : operator.ge,
+    "in"     : lambda col, val: col.isin(val),
+    "not in" : lambda col, val: ~col.isin(val),
+}
+"""Operators supported in predicate filters."""
+
+
+def register_loader(
+    file_format: str,
+    extensions: Sequence[str] = (),
+    label: str | None = None,
+) -> Callable[[Callable[..., DataFrame]], Callable[..., DataFrame]]:
+    """Register a loader function for a file format.
+
+    A loader takes the file path as first argument, accepts the `usecols`,
+    `nrows` and `filters` keyword arguments, and returns a DataFrame. Other
+    keyword arguments are specific to the loader.
+
+    Parameters:
+        file_format (str): Name of the file format (e.g. "csv").
+        extensions (Sequence[str], default=()): File extensions handled by the
+            loader (e.g. [".csv", ".txt"]).
+        label (str, default=None): Description of the file format displayed
+            in file dialog boxes.
+
+    Returns:
+        Callable: Decorator registering the loader function.
+
+    .. code-block:: python
+        :linenos:
+        :caption: Code example
+
+        @register_loader("json", extensions=[".json"], label="JSON files")
+        def load_json(file_path, usecols=None, nrows=None, filters=None):
+            return read_json(file_path)
+
+    """
+    # Define decorator function
+    def decorator(func: Callable[..., DataFrame]) -> Callable[..., DataFrame]:
+        func.label = label or f"{file_format.capitalize()} files"
+        func.extensions = tuple(ext.lower() for ext in extensions)
+        LOADERS[file_format] = func
+        for ext in func.extensions:
+            EXTENSIONS[ext] = file_format
+        return func
+
+    return decorator
+
+
+def get_file_format(file_path: Path, file_format: str | None = None) -> str:
+    """Identify the file format of a file.
+
+    Parameters:
+        file_path (Path): Path to the file.
+        file_format (str, default=None): Explicit file format. If not set, the
+            format is identified from the file extension.
+
+    Returns:
+        str: The file format.
+
+    Raises:
+        ValueError: If no loader is registered for the file format.
+
+    """
+    # Identify file format from file extension
+    if file_format is None:
+        file_format = EXTENSIONS.get(Path(file_path).suffix.lower())
+
+    # Control if a loader is registered for the file format
+    if file_format not in LOADERS:
+        log_error  = f"File ({file_path}) cannot be loaded. Supported formats "
+        log_error += f"are {sorted(LOADERS)}."
+        logger.error(log_error)
+        raise ValueError(log_error)
+
+    return file_format
+
+
+def load_file(
+    file_path: Path,
+    file_format: str | None = None,
+    **kwargs: Any,  # noqa: ANN401
+) -> DataFrame:
+    """Load a file in a DataFrame with the loader of its file format.
+
+    Parameters:
+        file_path (Path): Path to the file.
+        file_format (str, default=None): Explicit file format. If not set, the
+            format is identified from the file extension.
+        **kwargs (Any): Keyword arguments passed to the loader (e.g.
+            `usecols`, `nrows`, `filters`).
+
+    Returns:
+        DataFrame: The loaded data.
+
+    """
+    file_format = get_file_format(file_path, file_format)
+    return LOADERS[file_format](file_path, **kwargs)
+
+
+def register_streamer(
+    file_format: str,
+) -> Callable[
+    [Callable[..., Iterator[DataFrame]]],
+    Callable[..., Iterator[DataFrame]],
+]:
+    """Register a streamer function for a file format.
+
+    A streamer takes the file path as first argument, accepts the
+    `chunk_size`, `usecols`, `nrows`, `filters` and `offset` (number of first
+    rows to be skipped) keyword arguments, and yields DataFrames of at most
+    `chunk_size` rows.
+
+    Parameters:
+        file_format (str): Name of the file format (e.g. "csv").
+
+    Returns:
+        Callable: Decorator registering the streamer function.
+
+    """
+    # Define decorator function
+    def decorator(
+        func: Callable[..., Iterator[DataFrame]],
+    ) -> Callable[..., Iterator[DataFrame]]:
+        STREAMERS[file_format] = func
+        return func
+
+    return decorator
+
+
+def stream_file(
+    file_path: Path,
+    file_format: str | None = None,
+    chunk_size: int = 100_000,
+    **kwargs: Any,  # noqa: ANN401
+) -> Iterator[DataFrame]:
+    """Read a file by chunks with the streamer of its file format.
+
+    Parameters:
+        file_path (Path): Path to the file.
+        file_format (str, default=None): Explicit file format. If not set, the
+            format is identified from the file extension.
+        chunk_size (int, default=100_000): Maximum number of rows per chunk.
+        **kwargs (Any): Keyword arguments passed to the streamer (e.g.
+            `usecols`, `nrows`, `filters`, `offset`).
+
+    Yields:
+        DataFrame: The successive chunks of data.
+
+    Raises:
+        ValueError: If the file format cannot be read by chunks.
+
+    """
+    # Control if a streamer is registered for the file format
+    file_format = get_file_format(file_path, file_format)
+    if file_format not in STREAMERS:
+        log_error  = f"File ({file_path}) cannot be read by chunks. Supported "
+        log_error += f"formats are {sorted(STREAMERS)}."
+        logger.error(log_error)
+        raise ValueError(log_error)
+
+    streamer = STREAMERS[file_format]
+    yield from streamer(file_path, chunk_size=chunk_size, **kwargs)
+
+
+def file_filters() -> dict[str, str]:
+    """Build file type filters of the registered loaders for dialog boxes.
+
+    Returns:
+        dict[str, str]: File patterns and their description.
+
+    """
+    # Gather all supported extensions in a first filter
+    filters = {" ".join(f"*{ext}" for ext in EXTENSIONS): "Data files"}
+
+    # Add one filter per file format
+    for loader in LOADERS.values():
+        if loader.extensions:
+            patterns = " ".join(f"*{ext}" for ext in loader.extensions)
+            filters[patterns] = loader.label
+
+    return filters
+
+
+def apply_filters(
+    data: DataFrame,
+    filters: list[tuple] | list[list[tuple]] | None,
+) -> DataFrame:
+    """Filter rows of a DataFrame with predicate filters.
+
+    Filters follow the disjunctive normal form used by `pyarrow`: a list of
+    `(column, operator, value)` tuples is combined with AND, and a list of
+    such lists is combined with OR.
+
+    Parameters:
+        data (DataFrame): Data to be filtered.
+        filters (list[tuple] | list[list[tuple]]): Predicate filters.
+
+    Returns:
+        DataFrame: The filtered data.
+
+    """
+    # Nothing to filter
+    if not filters:
+        return data
+
+    # Combine filters
+    if isinstance(filters[0], tuple):
+        filters = [filters]
+    mask = False
+    for conjunction in filters:
+        sub_mask = True
+        for column, op, value in conjunction:
+            sub_mask &= FILTER_OPERATORS[op](data[column], value)
+        mask |= sub_mask
+
+    return data[mask].reset_index(drop=True)
+
+
+@register_loader("excel", extensions=[".xlsx", ".xlsm"], label="Excel files")
+def load_excel(
+    file_path: Path,
+    usecols: list[str] | None = None,
+    nrows: int | None = None,
+    filters: list[tuple] | list[list[tuple]] | None = None,
+    sheet_name: str | int | list[str | int] | None = 0,
+    **kwargs: Any,  # noqa: ANN401
+) -> DataFrame:
+    """Load an Excel workbook.
+
+    Parameters:
+        file_path (Path): Path to the workbook.
+        usecols (list[str], default=None): Columns to be loaded.
+        nrows (int, default=None): Number of rows to be loaded.
+        filters (list[tuple] | list[list[tuple]], default=None): Predicate
+            filters applied to loaded rows.
+        sheet_name (str | int | list[str | int] | None, default=0): Sheet(s) to
+            be loaded. If several sheets are loaded (list or None for all
+            sheets), they are concatenated with a `Sheet` column.
+        **kwargs (Any): Keyword arguments passed to `pandas.read_excel`.
+
+    Returns:
+        DataFrame: The loaded data.
+
+    """
+    # Load sheets
+    data = read_excel(
+        file_path,
+        sheet_name=sheet_name,
+        usecols=usecols,
+        nrows=nrows,
+        **kwargs,
+    )
+
+    # Concatenate sheets
+    if isinstance(data, dict):
+        data = concat(
+            [frame.assign(Sheet=name) for name, frame in data.items()],
+            ignore_index=True,
+        )
+
+    return apply_filters(data, filters)
+
+
+def excel_sheet_names(file_path: Path | BinaryIO) -> list[str]:
+    """List the sheet names of an Excel workbook without parsing its sheets.
+
+    Parameters:
+        file_path (Path | BinaryIO): Path to the workbook, or its content.
+
+    Returns:
+        list[str]: The sheet names, in workbook order.
+
+    """
+    openpyxl = import_optional("openpyxl", "Listing Excel sheets")
+    workbook = openpyxl.load_workbook(file_path, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+@register_streamer("excel")
+def stream_excel(  # noqa: PLR0913
+    file_path: Path,
+    chunk_size: int = 100_000,
+    usecols: list[str] | None = None,
+    nrows: int | None = None,
+    filters: list[tuple] | list[list[tuple]] | None = None,
+    sheet_name: str | int = 0,
+    offset: int = 0,
+) -> Iterator[DataFrame]:
+    """Read an Excel worksheet by chunks.
+
+    The workbook is opened in read-only mode so that rows are parsed lazily
+    and memory usage is bounded by the chunk size. The first row of the
+    worksheet is used as header.
+
+    Parameters:
+        file_path (Path): Path to the workbook.
+        chunk_size (int, default=100_000): Maximum number of rows per chunk.
+        usecols (list[str], default=None): Columns to be loaded.
+        nrows (int, default=None): Number of rows to be loaded.
+        filters (list[tuple] | list[list[tuple]], default=None): Predicate
+            filters applied to each chunk.
+        sheet_name (str | int, default=0): Name or index of the worksheet.
+        offset (int, default=0): Number of first rows to be skipped (after
+            the header row).
+
+    Yields:
+        DataFrame: The successive chunks of data.
+
+    """
+    # Open workbook in read-only mode
+    openpyxl = import_optional("openpyxl", "Reading Excel files by chunks")
+    workbook = openpyxl.load_workbook(
+        file_path,
+        read_only=True,
+        data_only=True,
+    )
+    try:
+        # Select worksheet and read header
+        if isinstance(sheet_name, int):
+            sheet = workbook.worksheets[sheet_name]
+        else:
+            sheet = workbook[sheet_name]
+        rows = sheet.iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        rows = islice(rows, offset, None)
+        columns = [
+            idx for idx, col in enumerate(header)
+            if usecols is None or col in usecols
+        ]
+
+        # Yield chunks of rows
+        chunk = []
+        for count, row in enumerate(rows):
+            if nrows is not None and count >= nrows:
+                break
+            chunk.append([row[idx] for idx in columns])
+            if len(chunk) == chunk_size:
+                frame = DataFrame(chunk, columns=[header[i] for i in columns])
+                yield apply_filters(frame, filters)
+                chunk = []
+        if chunk:
+            frame = DataFrame(chunk, columns=[header[i] for i in columns])
+            yield apply_filters(frame, filters)
+
+    finally:
+        workbook.close()
+
+
+@register_loader("csv", extensions=[".csv", ".txt"], label="CSV files")
+def load_csv(
+    file_path: Path,
+    usecols: list[str] | None = None,
+    nrows: int | None = None,
+    filters: list[tuple] | list[list[tuple]] | None = None,
+    **kwargs: Any,  # noqa: ANN401
+) -> DataFrame:
+    """Load a CSV file.
+
+    The multithreaded `pyarrow` engine is used if available, unless `nrows`
+    is set (not supported by this engine).
+
+    Parameters:
+        file_path (Path): Path to the CSV file.
+        usecols (list[str], default=None): Columns to be loaded.
+        nrows (int, default=None): Number of rows to be loaded.
+        filters (list[tuple] | list[list[tuple]], default=None): Predicate
+            filters applied to loaded rows.
+        **kwargs (Any): Keyword arguments passed to `pandas.read_csv`.
+
+    Returns:
+        DataFrame: The loaded data.
+
+    """
+    # Select CSV engine
+    if "engine" not in kwargs:
+        use_arrow = find_spec("pyarrow") is not None and nrows is None
+        kwargs["engine"] = "pyarrow" if use_arrow else "c"
+
+    # Load data
+    data = read_csv(file_path, usecols=usecols, nrows=nrows, **kwargs)
+
+    return apply_filters(data, filters)
+
+
+def is_line_start(file_path: Path, position: int) -> bool:
+    """Control if a position of a file is at the beginning of a line.
+
+    Parameters:
+        file_path (Path): Path to the file.
+        position (int): Position in the file (in bytes).
+
+    Returns:
+        bool: Whether the position is the start of the file or follows a line
+            break.
+
+    """
+    if position <= 0:
+        return True
+    with Path(file_path).open(mode="rb") as file:
+        file.seek(position - 1)
+        return file.read(1) in (b"\n", b"\r")
+
+
+@register_streamer("csv")
+def stream_csv(  # noqa: PLR0913
+    file_path: Path,
+    chunk_size: int = 100_000,
+    usecols: list[str] | None = None,
+    nrows: int | None = None,
+    filters: list[tuple] | list[list[tuple]] | None = None,
+    offset: int = 0,
+    start_byte: int = 0,
+    **kwargs: Any,  # noqa: ANN401
+) -> Iterator[DataFrame]:
+    """Read a CSV file by chunks.
+
+    Parameters:
+        file_path (Path): Path to the CSV file.
+        chunk_size (int, default=100_000): Maximum number of rows per chunk.
+        usecols (list[str], default=None): Columns to be loaded.
+        nrows (int, default=None): Number of rows to be loaded.
+        filters (list[tuple] | list[list[tuple]], default=None): Predicate
+            filters applied to each chunk.
+        offset (int, default=0): Number of first rows to be skipped (after
+            the header line, or after `start_byte`).
+        start_byte (int, default=0): Position in the file where reading
+            starts, at the beginning of a line (e.g. size of an append-only
+            file when it was last read). Rows before this position are not
+            parsed at all.
+        **kwargs (Any): Keyword arguments passed to `pandas.read_csv` (the
+            "pyarrow" engine, which cannot read by chunks, is ignored).
+
+    Yields:
+        DataFrame: The successive chunks of data.
+
+    Raises:
+        ValueError: If `start_byte` is not at the beginning of a line.
+
+    """
+    # Control if reading starts at the beginning of a line
+    if not is_line_start(file_path, start_byte):
+        log_error  = f"File ({file_path}) cannot be read from byte "
+        log_error += f"{start_byte}, which does not start a line."
+        logger.error(log_error)
+        raise ValueError(log_error)
+    if kwargs.get("engine") == "pyarrow":
+        del kwargs["engine"]
+
+    # Read header separately if first rows are skipped
+    if offset or start_byte:
+        header = read_csv(file_path, nrows=0, **kwargs).columns
+        kwargs.update(
+            header=None,
+            names=list(header),
+            skiprows=offset if start_byte else offset + 1,
+        )
+
+    # Read file from start position
+    with Path(file_path).open(mode="rb") as file:
+        file.seek(start_byte)
+        with read_csv(
+            file,
+            usecols=usecols,
+            nrows=nrows,
+            chunksize=chunk_size,
+            **kwargs,
+        ) as reader:
+            for chunk in reader:
+                yield apply_filters(chunk.reset_index(drop=True), filters)
+
+
+def _stream_dataset(  # noqa: PLR0913
+    file_path: Path,
+    dataset_format: str,
+    chunk_size: int = 100_000,
+    usecols: list[str] | None = None,
+    nrows: int | None = None,
+    filters: list[tuple] | list[list[tuple]] | None = None,
+    offset: int = 0,
+    **kwargs: Any,  # noqa: ANN401
+) -> Iterator[DataFrame]:
+    """Read a columnar file by record batches with pushdown."""
+    # Import pyarrow modules
+    feature = f"Reading {dataset_format} files by chunks"
+    dataset = import_optional("pyarrow.dataset", feature)
+    parquet = import_optional("pyarrow.parquet", feature)
+
+    # Build dataset scanner with pushed down columns and filters
+    source = dataset.dataset(file_path, format=dataset_format)
+    scan_args = {"columns": usecols, "batch_size": chunk_size}
+    if filters:
+        scan_args["filter"] = parquet.filters_to_expression(filters)
+
+    # Yield record batches
+    count = 0
+    for batch in source.to_batches(**scan_args):
+        if offset:
+            skipped = min(offset, batch.num_rows)
+            batch = batch.slice(skipped)  # noqa: PLW2901
+            offset -= skipped
+        if nrows is not None:
+            batch = batch.slice(0, nrows - count)  # noqa: PLW2901
+        if batch.num_rows > 0:
+            count += batch.num_rows
+            yield batch.to_pandas(**kwargs)
+        if nrows is not None and count >= nrows:
+            break
+
+
+@register_streamer("parquet")
+def stream_parquet(
+    file_path: Path,
+    chunk_size: int = 100_000,
+    **kwargs: Any,  # noqa: ANN401
+) -> Iterator[DataFrame]:
+    """Read a Parquet file by chunks of row groups.
+
+    Parameters:
+        file_path (Path): Path to the Parquet file.
+        chunk_size (int, default=100_000): Maximum number of rows per chunk.
+        **kwargs (Any): Keyword arguments (`usecols`, `nrows`, `filters`,
+            `offset`) pushed down to the reader.
+
+    Yields:
+        DataFrame: The successive chunks of data.
+
+    """
+    yield from _stream_dataset(file_path, "parquet", chunk_size, **kwargs)
+
+
+@register_streamer("feather")
+def stream_feather(
+    file_path: Path,
+    chunk_size: int = 100_000,
+    **kwargs: Any,  # noqa: ANN401
+) -> Iterator[DataFrame]:
+    """Read a Feather (Arrow IPC) file by chunks of record batches.
+
+    Parameters:
+        file_path (Path): Path to the Feather file.
+        chunk_size (int, default=100_000): Maximum number of rows per chunk.
+        **kwargs (Any): Keyword arguments (`usecols`, `nrows`, `filters`,
+            `offset`) pushed down to the reader.
+
+    Yields:
+        DataFrame: The successive chunks of data.
+
+    """
+    yield from _stream_dataset(file_path, "feather", chunk_size, **kwargs)
+
+
+def _load_dataset(
+    file_path: Path,
+    dataset_format: str,
+    usecols: list[str] | None = None,
+    nrows: int | None = None,
+    filters: list[tuple] | list[list[tuple]] | None = None,
+    **kwargs: Any,  # noqa: ANN401
+) -> DataFrame:
+    """Load a columnar file with column, row and filter pushdown."""
+    # Import pyarrow modules
+    feature = f"Loading {dataset_format} files"
+    dataset = import_optional("pyarrow.dataset", feature)
+    parquet = import_optional("pyarrow.parquet", feature)
+
+    # Build dataset scanner with pushed down columns and filters
+    source = dataset.dataset(file_path, format=dataset_format)
+    scan_args = {"columns": usecols}
+    if filters:
+        scan_args["filter"] = parquet.filters_to_expression(filters)
+
+    # Read only needed rows
+    if nrows is None:
+        table = source.to_table(**scan_args)
+    else:
+        table = source.head(nrows, **scan_args)
+
+    return table.to_pandas(**kwargs)
+
+
+@register_loader("parquet", extensions=[".parquet", ".pq"])
+def load_parquet(
+    file_path: Path,
+    usecols: list[str] | None = None,
+    nrows: int | None = None,
+    filters: list[tuple] | list[list[tuple]] | None = None,
+    **kwargs: Any,  # noqa: ANN401
+) -> DataFrame:
+    """Load a Parquet file.
+
+    Columns, rows and filters are pushed down to the Parquet reader, so that
+    only needed row groups and columns are read.
+
+    Parameters:
+        file_path (Path): Path to the Parquet file.
+        usecols (list[str], default=None): Columns to be loaded.
+        nrows (int, default=None): Number of rows to be loaded.
+        filters (list[tuple] | list[list[tuple]], default=None): Predicate
+            filters pushed down to the reader.
+        **kwargs (Any): Keyword arguments passed to `pyarrow.Table.to_pandas`.
+
+    Returns:
+        DataFrame: The loaded data.
+
+    """
+    return _load_dataset(
+        file_path,
+        "parquet",
+        usecols,
+        nrows,
+        filters,
+        **kwargs,
+    )
+
+
+@register_loader("feather", extensions=[".feather", ".arrow"])
+def load_feather(
+    file_path: Path,
+    usecols: list[str] | None = None,
+    nrows: int | None = None,
+    filters: list[tuple] | list[list[tuple]] | None = None,
+    **kwargs: Any,  # noqa: ANN401
+) -> DataFrame:
+    """Load a Feather (Arrow IPC) file.
+
+    Columns, rows and filters are pushed down to the Arrow IPC reader.
+
+    Parameters:
+        file_path (Path): Path to the Feather file.
+        usecols (list[str], default=None): Columns to be loaded.
+        nrows (int, default=None): Number of rows to be loaded.
+        filters (list[tuple] | list[list[tuple]], default=None): Predicate
+            filters pushed down to the reader.
+        **kwargs (Any): Keyword arguments passed to `pyarrow.Table.to_pandas`.
+
+    Returns:
+        DataFrame: The loaded data.
+
+    """
+    return _load_dataset(
+        file_path,
+        "feather",
+        usecols,
+        nrows,
+        filters,
+        **kwargs,
+    )
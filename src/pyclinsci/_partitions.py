@@ -0,0 +1,228 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+
+# Import libraries and objects
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from functools import partial
+from itertools import pairwise
+from typing import Any
+
+import numpy as np
+from loguru import logger
+from pandas import DataFrame, Series, concat, factorize
+
+from pyclinsci._decorators import method_exec_dur, profiler
+from pyclinsci._shared import SharedData, publish_frame
+
+
+def make_executor(
+    executor: str,
+    max_workers: int | None,
+    initializer: Callable[..., None] | None = None,
+    initargs: tuple = (),
+) -> Executor:
+    """Create a pool of workers out of its type ("thread" or "process").
+
+    Parameters:
+        executor (str): Type of workers - "thread" or "process".
+        max_workers (int, default=None): Maximum number of workers.
+        initializer (Callable[..., None], default=None): Function called once
+            by each worker when it starts (e.g. to receive large arguments
+            once per process instead of once per task).
+        initargs (tuple, default=()): Arguments of the initializer.
+
+    Returns:
+        Executor: The pool of workers.
+
+    Raises:
+        ValueError: If the executor parameter is not valid.
+
+    """
+    executors = {
+        "thread" : ThreadPoolExecutor,
+        "process": ProcessPoolExecutor,
+    }
+    if executor not in executors:
+        log_error  = f"Method cannot handle '{executor}' "
+        log_error += "executor-parameter."
+        logger.error(log_error)
+        raise ValueError(log_error)
+    return executors[executor](
+        max_workers=max_workers,
+        initializer=initializer,
+        initargs=initargs,
+    )
+
+
+def split_rows(
+    data: DataFrame,
+    partitions: int,
+    by: str | None = None,
+) -> tuple[DataFrame, list[tuple[int, int]]]:
+    """Split rows of a DataFrame into contiguous partitions.
+
+    Rows are split into partitions of equal size, or by key so that all rows
+    of a key belong to the same partition. Keys are dealt to partitions from
+    the largest to the smallest (back and forth), so that partitions have
+    similar sizes, and rows are reordered by partition. Rows with a missing
+    key are dropped.
+
+    Parameters:
+        data (DataFrame): The data to be split.
+        partitions (int): Maximum number of partitions.
+        by (str, default=None): Column of the keys (rows are split by
+            position if not set).
+
+    Returns:
+        tuple[DataFrame, list[tuple[int, int]]]: The data (reordered by
+            partition if split by key) and the start and stop positions of
+            non-empty partitions.
+
+    """
+    partitions = max(min(partitions, len(data)), 1)
+
+    # Split rows by position
+    if by is None:
+        edges = np.linspace(0, len(data), partitions + 1).astype("int64")
+        return data, list(pairwise(edges))
+
+    # Deal keys to partitions from the largest to the smallest
+    codes, uniques = factorize(data[by])
+    sizes = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    rank = np.empty(len(sizes), dtype="int64")
+    rank[np.argsort(-sizes, kind="stable")] = np.arange(len(sizes))
+    cycle, pos = np.divmod(rank, partitions)
+    owner = np.where(cycle % 2 == 0, pos, partitions - 1 - pos)
+
+    # Reorder rows by partition
+    rows = np.flatnonzero(codes >= 0)
+    row_owner = owner[codes[rows]]
+    order = rows[np.argsort(row_owner, kind="stable")]
+    edges = np.cumsum([0, *np.bincount(row_owner, minlength=partitions)])
+    bounds = [
+        (int(start), int(stop))
+        for start, stop in pairwise(edges)
+        if stop > start
+    ]
+    return data.take(order), bounds
+
+
+@method_exec_dur
+def run_partition(
+    source: DataFrame | tuple[SharedData, int, int],
+    func: Callable[..., Any],
+    args: tuple,
+    kwargs: dict[str, Any],
+) -> tuple[Any, float]:
+    """Run a function on a partition (used by executor workers).
+
+    Parameters:
+        source (DataFrame | tuple[SharedData, int, int]): The partition, or
+            the shared data with the start and stop positions of the
+            partition.
+        func (Callable[..., Any]): The function, called with the partition
+            as first argument.
+        args (tuple): Additional positional arguments of the function.
+        kwargs (dict[str, Any]): Keyword arguments of the function.
+
+    Returns:
+        tuple[Any, float]: The result of the function and its execution
+            duration (in seconds).
+
+    """
+    start_time = time.perf_counter()
+    if isinstance(source, tuple):
+        shared, start, stop = source
+        source = shared.to_frame(start, stop - start)
+    return func(source, *args, **kwargs), time.perf_counter() - start_time
+
+
+def run_partitions(  # noqa: PLR0913
+    data: DataFrame,
+    func: Callable[..., Any],
+    args: tuple = (),
+    kwargs: dict[str, Any] | None = None,
+    partitions: int | None = None,
+    by: str | None = None,
+    max_workers: int | None = None,
+    executor: str = "process",
+) -> list[Any]:
+    """Run a function on partitions of a DataFrame in a pool of workers.
+
+    With processes, the data are published once in a memory-mapped file
+    (see `SharedData`), and workers only receive the positions of their
+    partition, which they read without copy. Execution durations of
+    partitions are recorded by the profiler of the main process.
+
+    Parameters:
+        data (DataFrame): The data.
+        func (Callable[..., Any]): The function, called with a partition as
+            first argument (a module-level function with processes).
+        args (tuple, default=()): Additional positional arguments of the
+            function.
+        kwargs (dict[str, Any], default=None): Keyword arguments of the
+            function.
+        partitions (int, default=None): Maximum number of partitions (number
+            of workers if not set).
+        by (str, default=None): Column of the keys, so that all rows of a key
+            belong to the same partition (rows are split by position if not
+            set).
+        max_workers (int, default=None): Maximum number of workers (number of
+            CPUs if not set).
+        executor (str, default="process"): Type of workers - "thread" or
+            "process".
+
+    Returns:
+        list[Any]: The results of the function, by partition.
+
+    """
+    # Split rows into partitions
+    max_workers = max_workers or os.cpu_count() or 1
+    data, bounds = split_rows(data, partitions or max_workers, by)
+    worker = partial(run_partition, func=func, args=args, kwargs=kwargs or {})
+
+    # Run function on partitions (published in a file for processes)
+    with make_executor(executor, max_workers) as pool:
+        if executor == "thread":
+            outputs = list(pool.map(
+                worker,
+                [data.iloc[start:stop] for start, stop in bounds],
+            ))
+        else:
+            with publish_frame(data, DataFrame) as shared:
+                outputs = list(pool.map(
+                    worker,
+                    [(shared, start, stop) for start, stop in bounds],
+                ))
+            for _, duration in outputs:
+                profiler.record(run_partition.__qualname__, duration)
+
+    # Log durations of partitions
+    durations = [duration for _, duration in outputs]
+    log_txt  = f"{len(bounds)} partitions were executed in "
+    log_txt += f"{min(durations, default=0):.2f} to "
+    log_txt += f"{max(durations, default=0):.2f} sec."
+    logger.debug(log_txt)
+
+    return [result for result, _ in outputs]
+
+
+def combine_results(results: list[Any]) -> Any:  # noqa: ANN401
+    """Concatenate results of partitions if they are DataFrames or Series.
+
+    Parameters:
+        results (list[Any]): The results of partitions.
+
+    Returns:
+        Any: The concatenated results, or the list of results otherwise.
+
+    """
+    if results and all(isinstance(val, DataFrame | Series) for val in results):
+        return concat(results)
+    return results
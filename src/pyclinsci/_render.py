@@ -0,0 +1,170 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+
+# Import libraries and objects
+import time
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+from pandas import DataFrame
+from plotly.offline import get_plotlyjs
+
+from pyclinsci._data import GenericData, GeoData
+from pyclinsci._shared import SharedData
+
+PLOTLYJS_FILE = "plotly.min.js"
+"""Name of the plotly.js bundle shared by HTML files."""
+
+
+@dataclass
+class FigureSpec:
+    """Specification of a figure to be rendered in batch.
+
+    The data are loaded from `file_path` (or taken from `data`) with
+    `data_cls`, or attached to data published with `GenericData.publish`
+    (without copy in each process), then the figure is built with
+    `figure_args`.
+
+    .. code-block:: python
+        :linenos:
+        :caption: Code example
+
+        spec = FigureSpec(
+            name="enrollment_europe",
+            file_path="data/enrollment.xlsx",
+            figure_args={"scope": "europe", "title": "Enrollment"},
+        )
+
+    """
+
+    name        : str
+    """Name of the figure, used as name of the output files."""
+
+    file_path   : Path | None       = None
+    """Path to the file containing the data."""
+
+    data        : DataFrame | None  = None
+    """Data of the figure (used instead of `file_path` if set)."""
+
+    shared      : SharedData | None = None
+    """Published data of the figure (used instead of `data` and `file_path`
+    if set)."""
+
+    data_cls    : type[GenericData] = GeoData
+    """Class used to load the data and build the figure."""
+
+    data_args   : dict[str, Any]    = field(default_factory=dict)
+    """Keyword arguments passed to the class constructor."""
+
+    figure_args : dict[str, Any]    = field(default_factory=dict)
+    """Keyword arguments passed to the `build_figure` method."""
+
+
+def render_figure(
+    spec: FigureSpec,
+    output_dir: Path,
+    formats: Sequence[str] = ("html",),
+    include_plotlyjs: bool | str = PLOTLYJS_FILE,
+) -> list[Path]:
+    """Build a figure and save it in several formats.
+
+    Parameters:
+        spec (FigureSpec): Specification of the figure.
+        output_dir (Path): Directory where output files are saved.
+        formats (Sequence[str], default=("html",)): Output formats (e.g.
+            "html", "json", "png", "svg").
+        include_plotlyjs (bool | str, default="plotly.min.js"): How plotly.js
+            is included in HTML files (see `GenericData.save_figure`).
+
+    Returns:
+        list[Path]: Paths to the output files.
+
+    """
+    # Load data
+    if spec.shared is not None:
+        instance = spec.shared.attach()
+    elif spec.data is not None:
+        instance = spec.data_cls(data=spec.data, **spec.data_args)
+    else:
+        instance = spec.data_cls(file_path=spec.file_path, **spec.data_args)
+
+    # Build and save figure
+    instance.build_figure(**spec.figure_args)
+    return [
+        instance.save_figure(
+            Path(output_dir) / f"{spec.name}.{fmt}",
+            include_plotlyjs=include_plotlyjs,
+        )
+        for fmt in formats
+    ]
+
+
+def render_figures(
+    specs: Sequence[FigureSpec],
+    output_dir: Path,
+    formats: Sequence[str] = ("html",),
+    max_workers: int | None = None,
+) -> dict[str, list[Path]]:
+    """Build and save a batch of figures across a pool of processes.
+
+    HTML files reference a single plotly.js bundle saved in `output_dir`
+    instead of embedding it, which saves several megabytes per figure.
+
+    Parameters:
+        specs (Sequence[FigureSpec]): Specifications of the figures.
+        output_dir (Path): Directory where output files are saved.
+        formats (Sequence[str], default=("html",)): Output formats (e.g.
+            "html", "json", "png", "svg"). Static images require the
+            `kaleido` package.
+        max_workers (int, default=None): Maximum number of processes (number
+            of CPUs if not set). Figures are built in the current process if
+            set to 1.
+
+    Returns:
+        dict[str, list[Path]]: Paths to the output files, indexed by figure
+            name.
+
+    .. code-block:: python
+        :linenos:
+        :caption: Code example
+
+        specs = [
+            FigureSpec(
+                name=f"enrollment_{scope}",
+                file_path="data/enrollment.xlsx",
+                figure_args={"scope": scope},
+            )
+            for scope in ["europe", "asia", "africa"]
+        ]
+        render_figures(specs, output_dir="output", formats=["html", "json"])
+
+    """
+    # Save shared plotly.js bundle
+    start_time = time.perf_counter()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if "html" in formats:
+        plotlyjs_path = output_dir / PLOTLYJS_FILE
+        if not plotlyjs_path.is_file():
+            plotlyjs_path.write_text(get_plotlyjs(), encoding="utf-8")
+
+    # Build and save figures
+    args = (output_dir, tuple(formats))
+    if max_workers == 1 or len(specs) <= 1:
+        paths = [render_figure(spec, *args) for spec in specs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(render_figure, spec, *args) for spec in specs
+            ]
+            paths = [future.result() for future in futures]
+
+    # Log rendering duration
+    log_txt  = f"Rendered {len(specs)} figures in <{output_dir}> in "
+    log_txt += f"{time.perf_counter() - start_time:.2f} sec."
+    logger.info(log_txt)
+
+    return {spec.name: path for spec, path in zip(specs, paths, strict=True)}
@@ -1,12 +1,15 @@
 # Copyright 2024 pyclinsci authors. See license.md file for details.
 
 # Import libraries and objects
+from importlib import import_module
 from importlib.metadata import version
 from importlib.util import find_spec
 from pathlib import Path
 from re import Match, match
 from sys import modules, stderr
-from typing import cast
+from time import monotonic
+from types import ModuleType
+from typing import Any, cast
 
 from loguru import logger
 
@@ -18,50 +21,212 @@ MODULE_NAME = modules[__name__].__name__.split(".")[0]
 MODULE_PATH: str = Path(find_spec(MODULE_NAME).origin).parent
 """Absolute path of the module."""
 
-# Extract version information
-__version__: str = version(MODULE_NAME)
-"""Version of the module."""
+# Set logging constants
+WARNING_LEVEL = 30
+"""Severity of the WARNING logging level."""
 
-# Build version information string
-result = cast(Match[str], match(r"(\d+\.\d+\.\d+).*", __version__))
-__version_info__: tuple[str] = tuple(result.group(1).split("."))
-"""Version information of the module"""
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Extract version information of the module on first access.
 
-def config_logging(
+    Querying package metadata is slow, so that `__version__` and
+    `__version_info__` are only computed when they are accessed.
+
+    Parameters:
+        name (str): Name of the module attribute.
+
+    Returns:
+        Any: The module attribute.
+
+    Raises:
+        AttributeError: If the module has no such attribute.
+
+    """
+    # Extract version information
+    if name == "__version__":
+        value = version(MODULE_NAME)
+
+    # Build version information string
+    elif name == "__version_info__":
+        version_txt = __getattr__("__version__")
+        result = cast(Match[str], match(r"(\d+\.\d+\.\d+).*", version_txt))
+        value = tuple(result.group(1).split("."))
+
+    else:
+        err_msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(err_msg)
+
+    globals()[name] = value
+    return value
+
+
+class RateSampler:
+    """Logging filter sampling messages emitted at a high rate.
+
+    Messages below the WARNING level are limited to `rate` messages per
+    second for each source code line, so that logging in hot loops does not
+    slow down execution. Warnings and errors are never sampled.
+
+    Parameters:
+        rate (float): Maximum number of messages per second and per line.
+
+    """
+
+    def __init__(self: "RateSampler", rate: float) -> None:
+        """Initialize the sampler with its maximum rate."""
+        self.rate = rate
+        self.windows: dict[tuple[str, int], tuple[float, int]] = {}
+
+    def __call__(self: "RateSampler", record: dict[str, Any]) -> bool:
+        """Return whether a log record should be emitted."""
+        # Never sample warnings and errors
+        if record["level"].no >= WARNING_LEVEL:
+            return True
+
+        # Count messages of the source line in the current 1-second window
+        key = (record["name"], record["line"])
+        now = monotonic()
+        start, count = self.windows.get(key, (now, 0))
+        if now - start >= 1.0:
+            start, count = now, 0
+        self.windows[key] = (start, count + 1)
+
+        return count < self.rate
+
+
+def config_logging(  # noqa: PLR0913
     console: str = "NONE",
     file: str = "NONE",
+    *,
+    json_file: str = "NONE",
+    enqueue: bool = False,
+    rotation: str | int | None = None,
+    retention: str | int | None = None,
+    compression: str | None = None,
+    sample_rate: float | None = None,
 ) -> logger:
     """Configure logging settings for the application.
 
+    By default, messages are written synchronously. With `enqueue=True`
+    (high-throughput mode), messages are sent to a queue and written by a
+    background thread, so that file I/O is moved out of the hot path, and
+    messages of child processes which inherit the configured logger (e.g.
+    forked executor workers) are written by the parent process only. In this
+    mode, log files are rotated by size, kept for a limited time and
+    compressed. Processes which each call `config_logging` rotate and
+    compress the same files independently, so they should log in separate
+    files (e.g. separate working directories).
+
     Parameters:
         console (str): The logging level for console output. Default is "NONE".
         file (str): The logging level for file output. Default is "NONE".
+        json_file (str): The logging level for structured JSON output in
+            `pyclinsci.json.log`. Default is "NONE".
+        enqueue (bool): Whether messages are written by a background thread.
+            Default is False.
+        rotation (str | int): Condition to rotate log files (e.g. "50 MB" or
+            "1 day"). Default is "50 MB" with `enqueue`, "5 seconds" otherwise.
+        retention (str | int): Retention of rotated log files (e.g. "10 days"
+            or 5 files). Default is "10 days" with `enqueue`, None otherwise.
+        compression (str): Compression format of rotated log files (e.g.
+            "zip" or "gz"). Default is "zip" with `enqueue`, None otherwise.
+        sample_rate (float): Maximum number of messages per second emitted by
+            each source code line, for messages below the WARNING level.
+            Default is None (no sampling).
 
     Returns:
         loguru.logger: The configured logger instance.
 
+    .. code-block:: python
+        :linenos:
+        :caption: Code example
+
+        # Log in files from a background thread, with sampling of hot loops
+        logger = config_logging(
+            file="DEBUG",
+            json_file="INFO",
+            enqueue=True,
+            sample_rate=10,
+        )
+
     """
     # Reset logging handlers
     logger.remove()
 
+    # Set common sink options
+    if rotation is None:
+        rotation = "50 MB" if enqueue else "5 seconds"
+    if retention is None and enqueue:
+        retention = "10 days"
+    if compression is None and enqueue:
+        compression = "zip"
+    file_args = {
+        "rotation"   : rotation,
+        "retention"  : retention,
+        "compression": compression,
+    }
+
+    # Set a dedicated sampler for each sink
+    def sink_args() -> dict[str, Any]:
+        if sample_rate is None:
+            return {"enqueue": enqueue}
+        return {"enqueue": enqueue, "filter": RateSampler(sample_rate)}
+
     # Define logging to a rotating file
     if file != "NONE":
         logger.add(
             "pyclinsci.log",
-            rotation="5 seconds",
             level=file,
             format="{time:MMMM D, YYYY > HH:mm:ss!UTC} | {level}\n{message}\n",
+            **file_args,
+            **sink_args(),
         )
         logger.info("Configured logging in file `pyclinsci.log`.")
 
+    # Define structured logging to a rotating JSON file
+    if json_file != "NONE":
+        logger.add(
+            "pyclinsci.json.log",
+            level=json_file,
+            serialize=True,
+            **file_args,
+            **sink_args(),
+        )
+        logger.info("Configured logging in file `pyclinsci.json.log`.")
+
     # Define logging to console
     if console != "NONE":
         logger.add(
             stderr,
             level=console,
             format="{time:MMMM D, YYYY > HH:mm:ss!UTC} | {level}\n{message}\n",
+            **sink_args(),
         )
         logger.info("Configured logging in console.")
 
     # Return logger handler
     return logger
+
+
+def import_optional(name: str, feature: str) -> ModuleType:
+    """Import an optional dependency of the package.
+
+    Parameters:
+        name (str): Name of the module to import.
+        feature (str): Description of the feature requiring the module.
+
+    Returns:
+        ModuleType: The imported module.
+
+    Raises:
+        ImportError: If the module is not installed.
+
+    """
+    # Control if module is installed
+    if find_spec(name.split(".")[0]) is None:
+        log_error  = f"{feature} requires <{name.split('.')[0]}> package. "
+        log_error += "You should install it to use this feature."
+        logger.error(log_error)
+        raise ImportError(log_error)
+
+    # Import module
+    return import_module(name)
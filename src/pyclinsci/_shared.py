@@ -0,0 +1,243 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+
+# Import libraries and objects
+import tempfile
+import uuid
+import weakref
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from loguru import logger
+from pandas import ArrowDtype, DataFrame, RangeIndex, StringDtype
+
+from pyclinsci._settings import import_optional
+
+SHM_DIR = "/dev/shm"  # noqa: S108
+"""Memory-backed file system of Linux systems."""
+
+SHARED_DIR = Path(SHM_DIR if Path(SHM_DIR).is_dir() else tempfile.gettempdir())
+"""Directory of published files (memory-backed file system if available)."""
+
+
+def _unlink(path: Path) -> None:
+    """Remove a published file (mapped data stay valid on POSIX systems)."""
+    try:
+        Path(path).unlink(missing_ok=True)
+        logger.debug(f"Shared data <{path}> were removed.")
+    except OSError as err:
+        logger.warning(f"Shared data <{path}> cannot be removed: {err}.")
+
+
+@dataclass
+class SharedData:
+    """Handle of data published in a memory-mapped Arrow IPC file.
+
+    The handle is small and can be sent to worker processes, which attach to
+    the published data without copying them: columns of attached instances
+    are read-only views of the memory-mapped file, shared by all processes
+    through the page cache. Only the publishing handle (the owner) removes
+    the file, when it is unlinked, when its context exits, or when it is
+    garbage collected.
+
+    .. code-block:: python
+        :linenos:
+        :caption: Code example
+
+        def analyse(shared: SharedData) -> int:
+            geo_data = shared.attach()
+            return len(geo_data.data)
+
+        with geo_data.publish() as shared, ProcessPoolExecutor() as pool:
+            results = list(pool.map(analyse, [shared] * 8))
+
+    """
+
+    path   : Path
+    """Path to the published Arrow IPC file."""
+
+    cls    : type
+    """Class of attached instances (GenericData subclass)."""
+
+    kwargs : dict[str, Any] = field(default_factory=dict)
+    """Keyword arguments passed to the class constructor of attached
+    instances."""
+
+    owner  : bool           = field(default=False, compare=False)
+    """Whether the handle removes the published file (only the publishing
+    handle, copies sent to other processes are never owners)."""
+
+    _finalizer : weakref.finalize | None = \
+        field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self: "SharedData") -> None:
+        """Remove the published file when the owner is garbage collected."""
+        self.path = Path(self.path)
+        if self.owner:
+            self._finalizer = weakref.finalize(self, _unlink, self.path)
+
+    def __getstate__(self: "SharedData") -> dict[str, Any]:
+        """Return the state of a non-owner copy of the handle."""
+        return {**self.__dict__, "owner": False, "_finalizer": None}
+
+    def __enter__(self: "SharedData") -> "SharedData":
+        """Enter the context of the handle."""
+        return self
+
+    def __exit__(
+        self: "SharedData",
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Remove the published file when the context exits."""
+        self.unlink()
+
+    def table(self: "SharedData") -> Any:  # noqa: ANN401
+        """Memory-map the published data as an Arrow table (without copy).
+
+        Returns:
+            pyarrow.Table: The published data.
+
+        Raises:
+            ValueError: If the published file was removed.
+
+        """
+        # Control if published file exists
+        if not self.path.is_file():
+            log_error  = f"Shared data ({self.path}) cannot be attached. The "
+            log_error += "publishing handle may have been unlinked."
+            logger.error(log_error)
+            raise ValueError(log_error)
+
+        # Memory-map Arrow IPC file
+        pyarrow = import_optional("pyarrow", "Attaching shared data")
+        ipc = import_optional("pyarrow.ipc", "Attaching shared data")
+        with pyarrow.memory_map(str(self.path), "r") as source:
+            return ipc.open_file(source).read_all()
+
+    def to_frame(
+        self: "SharedData",
+        offset: int = 0,
+        length: int | None = None,
+        arrow_dtypes: bool = False,  # noqa: FBT001, FBT002
+    ) -> DataFrame:
+        """Convert published rows to a DataFrame of read-only views.
+
+        Numerical columns without missing values and string columns
+        (converted to pyarrow-backed strings) are views of the memory-mapped
+        file. Categorical columns only copy their codes.
+
+        Parameters:
+            offset (int, default=0): Position of the first row.
+            length (int, default=None): Number of rows (all rows following
+                `offset` if not set).
+            arrow_dtypes (bool, default=False): Whether all columns keep Arrow
+                dtypes, so that no column is copied.
+
+        Returns:
+            DataFrame: The published rows, with their original index.
+
+        """
+        # Slice table without copy
+        pyarrow = import_optional("pyarrow", "Attaching shared data")
+        table = self.table()
+        if offset or length is not None:
+            table = table.slice(offset, length)
+
+        # Convert table to DataFrame
+        if arrow_dtypes:
+            data = table.to_pandas(types_mapper=ArrowDtype)
+        else:
+            strings = {
+                pyarrow.string()      : StringDtype("pyarrow"),
+                pyarrow.large_string(): StringDtype("pyarrow"),
+            }
+            data = table.to_pandas(
+                split_blocks=True,
+                types_mapper=strings.get,
+            )
+
+        # Restore range index of sliced rows (stored as metadata only)
+        index = (table.schema.pandas_metadata or {}).get("index_columns")
+        if offset and index and isinstance(index[0], dict):
+            start, step = index[0]["start"], index[0]["step"]
+            data.index = RangeIndex(
+                start + offset * step,
+                start + (offset + len(data)) * step,
+                step,
+                name=index[0]["name"],
+            )
+
+        return data
+
+    def attach(
+        self: "SharedData",
+        arrow_dtypes: bool = False,  # noqa: FBT001, FBT002
+    ) -> Any:  # noqa: ANN401
+        """Create a read-only instance attached to the published data.
+
+        Columns are read-only views of the memory-mapped file (see
+        `to_frame`). Modifications such as `append` build new local columns,
+        and leave published data unchanged.
+
+        Parameters:
+            arrow_dtypes (bool, default=False): Whether all columns keep Arrow
+                dtypes, so that no column is copied.
+
+        Returns:
+            GenericData: The instance attached to the published data.
+
+        """
+        data = self.to_frame(arrow_dtypes=arrow_dtypes)
+        logger.debug(f"Shared data <{self.path}> were attached.")
+        return self.cls(data=data, **self.kwargs)
+
+    def unlink(self: "SharedData") -> None:
+        """Remove the published file if the handle is the owner.
+
+        Instances already attached stay valid on POSIX systems, as mapped
+        memory is released when the last instance is garbage collected.
+        """
+        if self._finalizer is not None:
+            self._finalizer()
+
+
+def publish_frame(
+    data: DataFrame,
+    cls: type,
+    path: Path | None = None,
+    **kwargs: Any,  # noqa: ANN401
+) -> SharedData:
+    """Publish a DataFrame in an uncompressed Arrow IPC file.
+
+    Parameters:
+        data (DataFrame): The data to be published.
+        cls (type): Class of attached instances (e.g. GenericData subclass),
+            built out of the `data` keyword argument.
+        path (Path, default=None): Path to the published file (a new file of
+            `SHARED_DIR` if not set).
+        **kwargs (Any): Keyword arguments passed to the class constructor of
+            attached instances.
+
+    Returns:
+        SharedData: The owner handle of the published data.
+
+    """
+    # Convert data to an Arrow table
+    pyarrow = import_optional("pyarrow", "Publishing shared data")
+    ipc = import_optional("pyarrow.ipc", "Publishing shared data")
+    table = pyarrow.Table.from_pandas(data)
+
+    # Write uncompressed Arrow IPC file, so that it can be memory-mapped
+    if path is None:
+        path = SHARED_DIR / f"pyclinsci-{uuid.uuid4().hex}.arrow"
+    path = Path(path)
+    with ipc.new_file(str(path), table.schema) as writer:
+        writer.write_table(table)
+    log_txt  = f"Data were published in <{path}> "
+    log_txt += f"({path.stat().st_size / 1024**2:.2f} MB)."
+    logger.info(log_txt)
+
+    return SharedData(path=path, cls=cls, kwargs=kwargs, owner=True)
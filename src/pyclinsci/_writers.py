@@ -0,0 +1,401 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+
+# Import libraries and objects
+import bz2
+import gzip
+import lzma
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import IO, Any
+
+from loguru import logger
+from pandas import DataFrame
+
+from pyclinsci._loaders import EXTENSIONS
+from pyclinsci._settings import import_optional
+
+WRITERS: dict[str, Callable[..., int]] = {}
+"""Registered writers, indexed by file format."""
+
+EXCEL_MAX_ROWS = 1_048_575
+"""Maximum number of data rows of an Excel worksheet (besides header)."""
+
+CSV_COMPRESSIONS: dict[str, Callable[..., IO]] = {
+    "gzip": gzip.open,
+    "bz2" : bz2.open,
+    "xz"  : lzma.open,
+}
+"""Functions opening compressed CSV files, indexed by compression."""
+
+
+def register_writer(
+    file_format: str,
+    tables: bool = False,  # noqa: FBT001, FBT002
+) -> Callable[[Callable[..., int]], Callable[..., int]]:
+    """Register a writer function for a file format.
+
+    A writer takes the file path and an iterator of DataFrames (chunks of
+    the data, sharing the same columns) as first arguments, accepts the
+    `compression` keyword argument, and returns the number of written rows.
+    Writers of formats holding several tables (such as Excel sheets) also
+    accept the `tables` keyword argument.
+
+    Parameters:
+        file_format (str): Name of the file format (e.g. "csv").
+        tables (bool, default=False): Whether the writer accepts additional
+            tables. Otherwise, additional tables are written in separate files.
+
+    Returns:
+        Callable: Decorator registering the writer function.
+
+    .. code-block:: python
+        :linenos:
+        :caption: Code example
+
+        @register_writer("json")
+        def write_json(file_path, chunks, compression=None):
+            data = concat(chunks)
+            data.to_json(file_path, compression=compression)
+            return len(data)
+
+    """
+    # Define decorator function
+    def decorator(func: Callable[..., int]) -> Callable[..., int]:
+        func.tables = tables
+        WRITERS[file_format] = func
+        return func
+
+    return decorator
+
+
+def iter_frame(data: DataFrame, chunk_size: int) -> Iterator[DataFrame]:
+    """Split a DataFrame into chunks of at most `chunk_size` rows.
+
+    Parameters:
+        data (DataFrame): The DataFrame to be split.
+        chunk_size (int): Maximum number of rows per chunk.
+
+    Yields:
+        DataFrame: The successive chunks (views of the DataFrame).
+
+    """
+    for start in range(0, max(len(data), 1), chunk_size):
+        yield data.iloc[start:start + chunk_size]
+
+
+def write_file(  # noqa: PLR0913
+    data: DataFrame | Iterable[DataFrame],
+    file_path: Path,
+    file_format: str | None = None,
+    chunk_size: int = 100_000,
+    compression: str | None = None,
+    tables: Mapping[str, DataFrame] | None = None,
+    **kwargs: Any,  # noqa: ANN401
+) -> list[Path]:
+    """Write data in a file by chunks with the writer of its file format.
+
+    Data are converted and written chunk by chunk, so that memory used on top
+    of the data is bounded by the chunk size. Data can also be given as an
+    iterator of chunks, so that a file larger than memory is converted with
+    bounded memory.
+
+    Parameters:
+        data (DataFrame | Iterable[DataFrame]): The data, or chunks of data
+            sharing the same columns.
+        file_path (Path): Path to the file.
+        file_format (str, default=None): Explicit file format. If not set, the
+            format is identified from the file extension.
+        chunk_size (int, default=100_000): Maximum number of rows per chunk
+            if data are given as a DataFrame.
+        compression (str, default=None): Compression codec - "gzip", "bz2"
+            or "xz" for CSV files, "snappy", "gzip", "brotli", "lz4" or "zstd"
+            for Parquet files and "lz4" or "zstd" for Feather files (Excel
+            files are always compressed).
+        tables (Mapping[str, DataFrame], default=None): Additional tables
+            (e.g. diagnostics), written as sheets of Excel files, or in files
+            named `<stem>.<table>.<ext>` for other formats.
+        **kwargs (Any): Keyword arguments passed to the writer.
+
+    Returns:
+        list[Path]: Paths to the written files.
+
+    Raises:
+        ValueError: If no writer is registered for the file format.
+
+    .. code-block:: python
+        :linenos:
+        :caption: Code example
+
+        # Convert a large CSV file into Parquet with bounded memory
+        write_file(
+            stream_file("data/enrollment.csv"),
+            "data/enrollment.parquet",
+            compression="zstd",
+        )
+
+    """
+    # Identify file format and control if a writer is registered
+    file_path = Path(file_path)
+    if file_format is None:
+        file_format = EXTENSIONS.get(file_path.suffix.lower())
+    if file_format not in WRITERS:
+        log_error  = f"File ({file_path}) cannot be written. Supported "
+        log_error += f"formats are {sorted(WRITERS)}."
+        logger.error(log_error)
+        raise ValueError(log_error)
+    writer = WRITERS[file_format]
+
+    # Split data into chunks
+    if isinstance(data, DataFrame):
+        data = iter_frame(data, chunk_size)
+    tables = dict(tables or {})
+
+    # Write data (and additional tables if supported by the writer)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    if writer.tables:
+        kwargs["tables"] = tables
+    rows = writer(file_path, iter(data), compression=compression, **kwargs)
+    logger.info(f"{rows} rows were written in <{file_path}>.")
+    file_paths = [file_path]
+
+    # Write additional tables in separate files
+    if not writer.tables:
+        for name, table in tables.items():
+            table_path = file_path.with_name(
+                f"{file_path.stem}.{name}{file_path.suffix}",
+            )
+            writer(table_path, iter([table]), compression=compression)
+            file_paths.append(table_path)
+
+    return file_paths
+
+
+@register_writer("excel", tables=True)
+def write_excel(
+    file_path: Path,
+    chunks: Iterator[DataFrame],
+    compression: str | None = None,  # noqa: ARG001
+    tables: Mapping[str, DataFrame] | None = None,
+    sheet_name: str = "Data",
+) -> int:
+    """Write an Excel workbook by chunks.
+
+    The workbook is created in write-only mode, so that rows are streamed to
+    the file instead of being kept in memory. Rows beyond the capacity of a
+    worksheet are written in continuation sheets (`Data (2)`...).
+
+    Parameters:
+        file_path (Path): Path to the workbook.
+        chunks (Iterator[DataFrame]): Chunks of data.
+        compression (str, default=None): Ignored (Excel files are always
+            compressed).
+        tables (Mapping[str, DataFrame], default=None): Additional tables,
+            written in separate sheets.
+        sheet_name (str, default="Data"): Name of the data sheet.
+
+    Returns:
+        int: The number of written rows.
+
+    """
+    # Create workbook in write-only mode
+    openpyxl = import_optional("openpyxl", "Writing Excel files")
+    workbook = openpyxl.Workbook(write_only=True)
+
+    # Write rows of data, starting a new sheet when a sheet is full
+    rows, sheet, sheet_rows, header = 0, None, EXCEL_MAX_ROWS, None
+    for chunk in chunks:
+        header = list(chunk.columns)
+        for row in _excel_rows(chunk):
+            if sheet_rows == EXCEL_MAX_ROWS:
+                suffix = f" ({rows // EXCEL_MAX_ROWS + 1})" if rows else ""
+                sheet = workbook.create_sheet(f"{sheet_name}{suffix}")
+                sheet.append(header)
+                sheet_rows = 0
+            sheet.append(row)
+            sheet_rows += 1
+            rows += 1
+    if sheet is None:
+        workbook.create_sheet(sheet_name).append(header or [])
+
+    # Write additional tables
+    for name, table in (tables or {}).items():
+        table_sheet = workbook.create_sheet(name)
+        table_sheet.append(list(table.columns))
+        for row in _excel_rows(table):
+            table_sheet.append(row)
+
+    workbook.save(file_path)
+    return rows
+
+
+def _excel_rows(data: DataFrame) -> list[list[Any]]:
+    """Convert a DataFrame into rows of Python values (None if missing)."""
+    values = data.astype(object)
+    return values.where(values.notna(), None).to_numpy().tolist()
+
+
+@register_writer("csv")
+def write_csv(
+    file_path: Path,
+    chunks: Iterator[DataFrame],
+    compression: str | None = None,
+    **kwargs: Any,  # noqa: ANN401
+) -> int:
+    """Write a CSV file by chunks.
+
+    Parameters:
+        file_path (Path): Path to the CSV file.
+        chunks (Iterator[DataFrame]): Chunks of data.
+        compression (str, default=None): Compression codec ("gzip", "bz2" or
+            "xz").
+        **kwargs (Any): Keyword arguments passed to `DataFrame.to_csv`.
+
+    Returns:
+        int: The number of written rows.
+
+    Raises:
+        ValueError: If the compression is not supported.
+
+    """
+    # Select function opening the file
+    if compression is not None and compression not in CSV_COMPRESSIONS:
+        log_error  = f"CSV files cannot be compressed with '{compression}'. "
+        log_error += f"Supported compressions are {sorted(CSV_COMPRESSIONS)}."
+        logger.error(log_error)
+        raise ValueError(log_error)
+    open_file = CSV_COMPRESSIONS.get(compression, open)
+
+    # Append chunks, with header before the first one
+    rows = 0
+    with open_file(file_path, mode="wt", newline="", encoding="utf-8") as file:
+        for idx, chunk in enumerate(chunks):
+            chunk.to_csv(file, header=idx == 0, index=False, **kwargs)
+            rows += len(chunk)
+
+    return rows
+
+
+def _write_arrow(
+    file_path: Path,
+    chunks: Iterator[DataFrame],
+    open_writer: Callable[[Any], Any],
+    schema: Any = None,  # noqa: ANN401
+) -> int:
+    """Write chunks of data with an Arrow writer opened out of the schema.
+
+    If the schema is not set, the schema of the first chunk is used. Chunks
+    with other column types (e.g. missing values only) are cast to the schema
+    if no value is lost. The partial file is removed if a chunk cannot be
+    written.
+    """
+    pyarrow = import_optional("pyarrow", "Writing columnar files")
+
+    # Convert chunks to Arrow tables cast to the schema
+    rows, writer = 0, None
+    try:
+        for chunk in chunks:
+            table = pyarrow.Table.from_pandas(chunk, preserve_index=False)
+            schema = table.schema if schema is None else schema
+            if not table.schema.equals(schema, check_metadata=False):
+                table = _cast_table(table, schema, rows)
+            if writer is None:
+                writer = open_writer(schema)
+            writer.write_table(table)
+            rows += len(chunk)
+    except Exception:
+        if writer is not None:
+            writer.close()
+            Path(file_path).unlink(missing_ok=True)
+        raise
+    if writer is not None:
+        writer.close()
+
+    return rows
+
+
+def _cast_table(table: Any, schema: Any, start: int) -> Any:  # noqa: ANN401
+    """Cast an Arrow table to a schema, refusing lossy conversions."""
+    pyarrow = import_optional("pyarrow", "Writing columnar files")
+    try:
+        return table.cast(schema, safe=True)
+    except pyarrow.ArrowException as err:
+        log_error  = f"Rows from {start} cannot be converted to the schema of "
+        log_error += f"previous rows ({err}). Set the `schema` argument to "
+        log_error += "write columns with other types."
+        logger.error(log_error)
+        raise ValueError(log_error) from err
+
+
+@register_writer("parquet")
+def write_parquet(
+    file_path: Path,
+    chunks: Iterator[DataFrame],
+    compression: str | None = None,
+    schema: Any = None,  # noqa: ANN401
+    **kwargs: Any,  # noqa: ANN401
+) -> int:
+    """Write a Parquet file by chunks, with one row group per chunk.
+
+    Parameters:
+        file_path (Path): Path to the Parquet file.
+        chunks (Iterator[DataFrame]): Chunks of data.
+        compression (str, default=None): Compression codec ("snappy" if not
+            set).
+        schema (pyarrow.Schema, default=None): Schema of the file (schema of
+            the first chunk if not set).
+        **kwargs (Any): Keyword arguments passed to
+            `pyarrow.parquet.ParquetWriter`.
+
+    Returns:
+        int: The number of written rows.
+
+    """
+    parquet = import_optional("pyarrow.parquet", "Writing Parquet files")
+    return _write_arrow(
+        file_path,
+        chunks,
+        lambda file_schema: parquet.ParquetWriter(
+            file_path,
+            file_schema,
+            compression=compression or "snappy",
+            **kwargs,
+        ),
+        schema,
+    )
+
+
+@register_writer("feather")
+def write_feather(
+    file_path: Path,
+    chunks: Iterator[DataFrame],
+    compression: str | None = None,
+    schema: Any = None,  # noqa: ANN401
+) -> int:
+    """Write a Feather (Arrow IPC) file by chunks of record batches.
+
+    Parameters:
+        file_path (Path): Path to the Feather file.
+        chunks (Iterator[DataFrame]): Chunks of data.
+        compression (str, default=None): Compression codec ("lz4" or "zstd").
+        schema (pyarrow.Schema, default=None): Schema of the file (schema of
+            the first chunk if not set).
+
+    Returns:
+        int: The number of written rows.
+
+    """
+    ipc = import_optional("pyarrow.ipc", "Writing Feather files")
+    options = ipc.IpcWriteOptions(
+        compression=compression,
+        unify_dictionaries=True,
+    )
+    return _write_arrow(
+        file_path,
+        chunks,
+        lambda file_schema: ipc.new_file(
+            file_path,
+            file_schema,
+            options=options,
+        ),
+        schema,
+    )
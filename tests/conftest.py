@@ -0,0 +1,17 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+"""Shared fixtures of pyclinsci tests."""
+
+# Import modules, functions, constants
+from pathlib import Path
+
+import pytest
+from pyclinsci._cache import DATA_CACHE
+
+
+# Keep the default data cache out of the user cache directory
+@pytest.fixture(autouse=True)
+def _data_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Store the default data cache of each test in a temporary directory."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("PYCLINSCI_CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(DATA_CACHE, "cache_dir", cache_dir)
@@ -0,0 +1,57 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+"""Test data cache from pyclinsci package."""
+
+# Import modules, functions, constants
+from pathlib import Path
+
+from pandas import DataFrame
+from pyclinsci import (
+    DataCache,
+    GeoData,
+    config_logging,
+)
+from pyclinsci._cache import DATA_CACHE
+
+# Initialize logging in this file
+logger = config_logging(console="TRACE")
+
+# Store and reload data from the cache
+def test_data_cache(tmp_path: Path) -> None:
+    """Test DataCache class from pyclinsci package."""
+    # Import data twice through the same cache
+    cache = DataCache(cache_dir=tmp_path, max_entries=1)
+    file_path = "examples/output/geodata_europe.xlsx"
+    tmp_data = GeoData(file_path=file_path, cache=cache)
+    assert len(list(tmp_path.glob("*.json"))) == 1  # noqa: S101
+    cached_data = GeoData(file_path=file_path, cache=cache)
+    assert cached_data.data.equals(tmp_data.data)  # noqa: S101
+
+    # Evict entries exceeding the cache limits
+    cache.put(Path("readme.md"), tmp_data.data)
+    assert cache.get("readme.md") is not None  # noqa: S101
+    assert len(list(tmp_path.glob("*.json"))) == 1  # noqa: S101
+
+    # Clear the cache
+    cache.clear()
+    assert cache.get("readme.md") is None  # noqa: S101
+
+    # Load data without cache if the cache directory cannot be written
+    cache = DataCache(cache_dir=Path("readme.md") / "cache")
+    tmp_data = GeoData(file_path=file_path, cache=cache)
+    assert cached_data.data.equals(tmp_data.data)  # noqa: S101
+    assert cache.get(file_path) is None  # noqa: S101
+
+# Use the default cache only for file formats slow to parse
+def test_default_cache(tmp_path: Path) -> None:
+    """Test default data cache of GeoData class from pyclinsci package."""
+    # Store Excel files in the default cache
+    GeoData(file_path="examples/output/geodata_europe.xlsx")
+    assert len(list(DATA_CACHE.cache_dir.glob("*.json"))) == 1  # noqa: S101
+
+    # Read CSV files from their source, unless the cache is enabled
+    file_path = tmp_path / "geo.csv"
+    DataFrame({"Country": ["France"], "Data": [1]}).to_csv(file_path)
+    GeoData(file_path=file_path)
+    assert len(list(DATA_CACHE.cache_dir.glob("*.json"))) == 1  # noqa: S101
+    GeoData(file_path=file_path, cache=True)
+    assert len(list(DATA_CACHE.cache_dir.glob("*.json"))) == 2  # noqa: PLR2004, S101
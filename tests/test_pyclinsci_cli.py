@@ -0,0 +1,139 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+"""Test command-line batch pipeline from pyclinsci package."""
+
+# Import modules, functions, constants
+import json
+import shutil
+from pathlib import Path
+
+from pandas import DataFrame, read_csv
+from pyclinsci import GeoData, config_logging
+from pyclinsci._cli import main
+
+# Initialize logging in this file
+logger = config_logging(console="TRACE")
+
+JOB_FILE = """
+[settings]
+output_dir  = "output"
+max_workers = 1
+
+[sources.europe]
+file_path   = "geodata_europe.xlsx"
+export      = "europe.csv"
+
+[sources.counts]
+file_path   = "geodata_europe.xlsx"
+aggregate   = {{ Patients = "count" }}
+
+[figures.europe_map]
+source      = "europe"
+scope       = "europe"
+title       = "{title}"
+
+[figures.counts_map]
+source      = "counts"
+color       = "Patients"
+formats     = ["json"]
+"""
+
+
+def _run(tmp_path: Path, *args: str, code: int = 0) -> dict[str, str]:
+    """Run the pipeline and return the status of steps by target."""
+    report_path = tmp_path / "report.json"
+    assert main([  # noqa: S101
+        str(tmp_path / "jobs.toml"),
+        "--report",
+        str(report_path),
+        *args,
+    ]) == code
+    reports = json.loads(report_path.read_text(encoding="utf-8"))
+    return {report["target"]: report["status"] for report in reports}
+
+
+# Rebuild only outdated targets of a job file
+def test_pipeline(tmp_path: Path) -> None:
+    """Test main function of command-line batch pipeline."""
+    # Build all targets of a job file
+    shutil.copy("examples/output/geodata_europe.xlsx", tmp_path)
+    job_path = tmp_path / "jobs.toml"
+    job_path.write_text(JOB_FILE.format(title="Europe"), encoding="utf-8")
+    assert _run(tmp_path) == {  # noqa: S101
+        "europe"       : "built",
+        "europe.export": "built",
+        "europe_map"   : "built",
+        "counts"       : "built",
+        "counts_map"   : "built",
+    }
+    assert (tmp_path / "output" / "europe_map.html").is_file()  # noqa: S101
+    assert (tmp_path / "output" / "counts_map.json").is_file()  # noqa: S101
+
+    # Skip up-to-date targets
+    assert set(_run(tmp_path).values()) == {"up-to-date"}  # noqa: S101
+
+    # Rebuild only a modified figure (dry run first)
+    job_path.write_text(JOB_FILE.format(title="Map"), encoding="utf-8")
+    statuses = _run(tmp_path, "--dry-run")
+    assert statuses["europe_map"] == "planned"  # noqa: S101
+    statuses = _run(tmp_path)
+    assert statuses["europe_map"] == "built"  # noqa: S101
+    assert statuses["europe.export"] == "up-to-date"  # noqa: S101
+    assert statuses["counts_map"] == "up-to-date"  # noqa: S101
+
+    # Rebuild a deleted output, and all targets when forced
+    (tmp_path / "output" / "counts_map.json").unlink()
+    assert _run(tmp_path)["counts_map"] == "built"  # noqa: S101
+    assert set(_run(tmp_path, "--force").values()) == {"built"}  # noqa: S101
+
+
+# Isolate sources of a job file from each other
+def test_pipeline_sources(tmp_path: Path) -> None:
+    """Test failures and aliases of sources of command-line batch pipeline."""
+    # Declare a source with aliases, a source with a missing file and a
+    # source with an unreadable file
+    DataFrame({"Country": ["Atlantis"], "Data": [1]}).to_csv(
+        tmp_path / "atlantis.csv",
+        index=False,
+    )
+    (tmp_path / "broken.xlsx").write_bytes(b"Not a workbook")
+    (tmp_path / "jobs.toml").write_text("""
+[settings]
+max_workers   = 1
+
+[sources.atlantis]
+file_path     = "atlantis.csv"
+resolve_names = true
+aliases       = { Atlantis = "GRC" }
+export        = "atlantis.csv"
+
+[sources.missing]
+file_path     = "missing.csv"
+
+[figures.missing_map]
+source        = "missing"
+
+[sources.broken]
+file_path     = "broken.xlsx"
+export        = "broken.csv"
+
+[figures.broken_map]
+source        = "broken"
+""", encoding="utf-8")
+
+    # Report failed sources with all their targets and build other targets
+    statuses = _run(tmp_path, code=1)
+    assert statuses == {  # noqa: S101
+        "missing_map"     : "failed",
+        "atlantis"        : "built",
+        "atlantis.export" : "built",
+        "broken"          : "failed",
+        "broken.export"   : "failed",
+        "broken_map"      : "failed",
+    }
+    export = read_csv(tmp_path / "output" / "atlantis.csv")
+    assert list(export["ISO3"]) == ["GRC"]  # noqa: S101
+
+    # Keep aliases of a source out of other data
+    data = DataFrame({"Country": ["Atlantis"], "Data": [1]})
+    geo_data = GeoData.from_frame(data, resolve_names=True)
+    assert list(geo_data.data["ISO3"]) == ["Atlantis"]  # noqa: S101
@@ -2,10 +2,23 @@
 """Test settings from pyclinsci package."""
 
 # Import modules, functions, constants
+import asyncio
+import operator
+import shutil
+import stat
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pandas import DataFrame, Series
 from pyclinsci import (
     GeoData,
+    Metric,
+    SharedData,
     config_logging,
 )
+from pyclinsci._iso3 import ISO3_FILE_PATH, Iso3Registry
 
 # Initialize logging in this file
 logger = config_logging(console="TRACE")
@@ -27,3 +40,359 @@ def test_geodata() -> None:
         color_continuous_scale    = ["#00485E", "#00485E"],
         marker                    ={"line": {"color": "#000709"}},
     )
+
+# Map country names to categorical ISO-3 codes
+def test_iso3_mapping() -> None:
+    """Test ISO-3 mapping of GeoData class from pyclinsci package."""
+    countries = Series(["France", None, "Atlantis", "France", "Germany"])
+    country, iso3 = GeoData.map_iso3_codes(countries, {"France": "FRA"})
+    assert list(iso3.categories) == ["FRA", "Atlantis", "Germany"]  # noqa: S101
+    assert iso3.isna().tolist() == [False, True, False, False, False]  # noqa: S101
+    assert len(country.categories) == 3  # noqa: PLR2004, S101
+
+# Look up an ISO-3 dictionary in both directions
+def test_iso3_registry(tmp_path: Path) -> None:
+    """Test ISO-3 registry of GeoData class from pyclinsci package."""
+    # Edit a copy of the ISO-3 file of the package
+    file_path = tmp_path / "geodata.iso3.ini"
+    shutil.copy(ISO3_FILE_PATH, file_path)
+    file_path.chmod(0o644)
+    registry = Iso3Registry(file_path=file_path)
+    assert GeoData.find_countries("FRA") == ("France",)  # noqa: S101
+    assert registry.countries("FRA") == ("France",)  # noqa: S101
+    registry.update(add={"New Country": "NCO"})
+    assert registry.countries("NCO") == ("New Country",)  # noqa: S101
+    registry.update(remove=["NCO"])
+    assert registry.countries("NCO") == ()  # noqa: S101
+    assert "New Country" not in registry.country_to_iso3  # noqa: S101
+
+    # Keep permissions of the ISO-3 file
+    assert stat.S_IMODE(file_path.stat().st_mode) == 0o644  # noqa: PLR2004, S101
+
+# Apply batches of changes to an ISO-3 dictionary
+def test_iso3_batch(tmp_path: Path) -> None:
+    """Test ISO-3 batch updates of GeoData class from pyclinsci package."""
+    # Apply changes in a single write
+    file_path = tmp_path / "geodata.iso3.ini"
+    shutil.copy(ISO3_FILE_PATH, file_path)
+    registry = Iso3Registry(file_path=file_path)
+    registry.update(add={"New Country": "NCO", "Other": "OTH"})
+    assert registry.countries("OTH") == ("Other",)  # noqa: S101
+
+    # Reject conflicting changes without writing them
+    with pytest.raises(ValueError, match="NCO"):
+        registry.update(add={"Third": "NCO"}, remove=["OTH"])
+    assert registry.countries("OTH") == ("Other",)  # noqa: S101
+
+    # Gather changes in a transaction
+    with registry.transaction() as batch:
+        batch.remove("NCO")
+        batch.remove("OTH")
+    assert registry.countries("NCO") == ()  # noqa: S101
+
+# Reuse figures built out of unchanged data and parameters
+def test_figure_cache() -> None:
+    """Test figure cache of GeoData class from pyclinsci package."""
+    # Build the same figure twice
+    tmp_data = GeoData(file_path="examples/output/geodata_europe.xlsx")
+    tmp_data.build_figure(scope="europe", marker={"line": {"width": 2}})
+    first_fig = tmp_data.fig
+    tmp_data.build_figure(scope="europe", marker={"line": {"width": 2}})
+    assert tmp_data.fig is not first_fig  # noqa: S101
+    assert list(tmp_data.fig.data[0].z) == list(first_fig.data[0].z)  # noqa: S101
+    assert tmp_data.fig.layout.geo.scope == "europe"  # noqa: S101
+    assert len(tmp_data._fig_cache) == 1  # noqa: S101, SLF001
+
+    # Rebuild figure after data were modified
+    tmp_data.data["Data"] = tmp_data.data["Data"] * 2
+    tmp_data.build_figure(scope="europe", marker={"line": {"width": 2}})
+    assert len(tmp_data._fig_cache) == 2  # noqa: PLR2004, S101, SLF001
+    tmp_data.invalidate_figure_cache()
+    assert len(tmp_data._fig_cache) == 0  # noqa: S101, SLF001
+
+# Wrap in-memory data without file I/O
+def test_from_memory() -> None:
+    """Test in-memory constructors of GeoData class from pyclinsci package."""
+    # Wrap a DataFrame without modifying it
+    frame = DataFrame({"Country": ["France", "Spain"], "Data": [1.0, 2.0]})
+    tmp_data = GeoData.from_frame(frame)
+    assert "ISO3" not in frame  # noqa: S101
+    assert np.shares_memory(tmp_data.data["Data"], frame["Data"])  # noqa: S101
+    assert tmp_data.data["ISO3"].tolist() == ["FRA", "ESP"]  # noqa: S101
+
+    # Wrap arrays and Arrow tables
+    values = np.array([1.0, 2.0])
+    tmp_data = GeoData.from_records({"Country": ["Peru"] * 2, "Data": values})
+    assert np.shares_memory(tmp_data.data["Data"], values)  # noqa: S101
+    pa = pytest.importorskip("pyarrow")
+    tmp_data = GeoData.from_arrow(pa.table(frame), arrow_dtypes=True)
+    assert tmp_data.data["ISO3"].tolist() == ["FRA", "ESP"]  # noqa: S101
+
+# Load files concurrently from an event loop
+def test_async_load() -> None:
+    """Test asyncio loading of GeoData class from pyclinsci package."""
+    file_path = "examples/output/geodata_europe.xlsx"
+    tmp_data = asyncio.run(
+        GeoData.aload_many([file_path] * 3, max_concurrency=2),
+    )
+    assert len(tmp_data) == 3  # noqa: PLR2004, S101
+    assert "ISO3" in tmp_data[0].data  # noqa: S101
+
+# Compact data to reduce their memory footprint
+def test_compact_data() -> None:
+    """Test compact_data method of GenericData class from pyclinsci package."""
+    pytest.importorskip("pyarrow")
+
+    # Load data with compaction
+    data = DataFrame({
+        "Country": ["France", "Spain", "Italy", "Germany"] * 250,
+        "Site"   : [f"Site {idx}" for idx in range(1000)],
+        "Data"   : np.arange(1000, dtype="int64"),
+        "Rate"   : np.linspace(0, 1, 1000),
+        "Score"  : np.full(1000, 0.5),
+    })
+    geo_data = GeoData.from_frame(data, compact={"arrow_strings": True})
+    assert data["Country"].dtype == object  # noqa: S101
+    assert geo_data.data["Country"].dtype == "category"  # noqa: S101
+    assert geo_data.data["Site"].dtype == "string"  # noqa: S101
+    assert geo_data.data["Data"].dtype == "int16"  # noqa: S101
+    assert geo_data.data["Rate"].dtype == "float64"  # noqa: S101
+    assert geo_data.data["Score"].dtype == "float32"  # noqa: S101
+
+    # Report memory footprint
+    report = GeoData.from_frame(data).compact_data()
+    assert report.after < report.before  # noqa: S101
+    assert "Site" not in report.columns  # noqa: S101
+
+# Add rows without reloading existing rows
+def test_append_refresh(tmp_path: Path) -> None:
+    """Test append and refresh methods of GeoData class from pyclinsci."""
+    # Load data from a CSV file
+    file_path = tmp_path / "enrollment.csv"
+    DataFrame({
+        "Country": ["France", "Spain"],
+        "Data"   : [1, 2],
+    }).to_csv(file_path, index=False)
+    geo_data = GeoData(file_path=file_path, cache=False)
+    geo_data.build_figure()
+    assert geo_data.refresh() == 0  # noqa: S101
+
+    # Append rows to the file and refresh data
+    with file_path.open("a") as file:
+        file.write("Italy,3\nGermany,4\nFrance,5\n")
+    assert geo_data.refresh() == 3  # noqa: PLR2004, S101
+    assert list(geo_data.data["Data"]) == [1, 2, 3, 4, 5]  # noqa: S101
+    assert geo_data.data["ISO3"].dtype == "category"  # noqa: S101
+    assert list(geo_data.data["ISO3"]) == [  # noqa: S101
+        "FRA", "ESP", "ITA", "DEU", "FRA",
+    ]
+    assert not geo_data._fig_cache  # noqa: S101, SLF001
+
+    # Append rows from records
+    geo_data.append([{"Country": "Poland", "Data": 6}])
+    assert geo_data.data["ISO3"].iloc[-1] == "POL"  # noqa: S101
+    assert len(geo_data.data) == 6  # noqa: PLR2004, S101
+
+# Reload files whose new rows cannot be read by chunks
+def test_refresh_reload(tmp_path: Path) -> None:
+    """Test refresh method of GeoData class with full reloads."""
+    # Load a CSV file not ending with a line break with pyarrow
+    pytest.importorskip("pyarrow")
+    file_path = tmp_path / "enrollment.csv"
+    file_path.write_text("Country,Data\nFrance,5\nSpain,6")
+    arrow_data = GeoData(
+        file_path=file_path,
+        read_args={"engine": "pyarrow"},
+        cache=False,
+        resolve_names=True,
+    )
+
+    # Reload the whole file with its loaded state, then read appended rows
+    with file_path.open("a") as file:
+        file.write("\nAtlantis,7\n")
+    assert arrow_data.refresh() == 3  # noqa: PLR2004, S101
+    assert arrow_data._source_rows == 3  # noqa: PLR2004, S101, SLF001
+    assert arrow_data.resolution_report.unresolved == {  # noqa: S101
+        "Atlantis": 1,
+    }
+    with file_path.open("a") as file:
+        file.write("Peru,8\n")
+    assert arrow_data.refresh() == 1  # noqa: S101
+    assert list(arrow_data.data["Data"])[-3:] == [6, 7, 8]  # noqa: S101
+
+# Aggregate patient-level data into per-country metrics
+def test_aggregate(tmp_path: Path) -> None:
+    """Test aggregate methods of GeoData class from pyclinsci package."""
+    # Aggregate patient-level data in memory
+    patients = DataFrame({
+        "Country" : ["France", "France", "France", "Spain", "Spain"],
+        "Age"     : [30, 40, 80, 50, None],
+        "Event"   : [True, False, False, True, True],
+        "Exposure": [1.0, 1.0, 2.0, 1.0, 3.0],
+    })
+    metrics = {
+        "Data"  : "count",
+        "Age"   : ("median", "Age"),
+        "Events": Metric("rate", "Event", scale=100),
+        "WAge"  : Metric("weighted_mean", "Age", weights="Exposure"),
+    }
+    geo_data = GeoData.from_frame(patients).aggregate(metrics)
+    result = geo_data.data.set_index("ISO3")
+    assert result.loc["FRA", "Data"] == 3  # noqa: PLR2004, S101
+    assert result.loc["FRA", "Age"] == 40  # noqa: PLR2004, S101
+    assert result.loc["ESP", "Age"] == 50  # noqa: PLR2004, S101
+    assert result.loc["ESP", "Events"] == 100  # noqa: PLR2004, S101
+    assert result.loc["FRA", "WAge"] == 57.5  # noqa: PLR2004, S101
+    geo_data.build_figure(hover_data=["Age", "Events"])
+
+    # Aggregate the same data by chunks
+    patients.to_csv(tmp_path / "patients.csv", index=False)
+    stream_data = GeoData.aggregate_stream(
+        tmp_path / "patients.csv",
+        metrics,
+        chunk_size=2,
+    )
+    assert stream_data.data.equals(geo_data.data)  # noqa: S101
+
+# Resolve messy country names to ISO-3 codes
+def test_resolve_names() -> None:
+    """Test country resolver of GeoData class from pyclinsci package."""
+    # Resolve names, aliases, codes and misspellings
+    data = DataFrame({
+        "Country": [
+            "Côte d'Ivoire", "COTE D IVOIRE", "UNITED KINGDOM", "UK", "FR",
+            "250", "Korea, Republic of", "Germny", "Atlantis", "Atlantis",
+        ],
+        "Data"   : range(10),
+    })
+    geo_data = GeoData.from_frame(data, resolve_names=True)
+    assert list(geo_data.data["ISO3"]) == [  # noqa: S101
+        "CIV", "CIV", "GBR", "GBR", "FRA", "FRA", "KOR", "DEU", "Atlantis",
+        "Atlantis",
+    ]
+
+    # Report approximate matches and unresolved names
+    report = geo_data.resolution_report
+    assert report.fuzzy["Germny"][0] == "DEU"  # noqa: S101
+    assert report.unresolved == {"Atlantis": 2}  # noqa: S101
+    assert len(report.to_frame()) == 9  # noqa: PLR2004, S101
+
+    # Keep names of loaded rows in the report after rows were appended
+    geo_data.append(DataFrame({"Country": ["Spain", "Atlantis"], "Data": 1}))
+    report = geo_data.diagnostics()["Countries"].set_index("Name")["Method"]
+    assert report["Spain"] == "exact"  # noqa: S101
+    assert report["Germny"] == "fuzzy"  # noqa: S101
+    assert geo_data.resolution_report.unresolved == {"Atlantis": 3}  # noqa: S101
+
+    # Exact matching keeps names unresolved
+    geo_data = GeoData.from_frame(data)
+    assert geo_data.data["ISO3"].iloc[2] == "UNITED KINGDOM"  # noqa: S101
+
+# Animate geographical data over periods
+def test_animation() -> None:
+    """Test animated maps of GeoData class from pyclinsci package."""
+    # Build one frame per period carrying only values
+    data = DataFrame({
+        "Country"         : ["France", "Spain", "Italy"] * 3,
+        "Enrollment Month": [f"2024-0{idx // 3 + 1}" for idx in range(9)],
+        "Data"            : range(9),
+        "Sites"           : range(10, 19),
+    })
+    geo_data = GeoData.from_frame(data)
+    geo_data.build_figure(period="Enrollment Month", hover_data=["Sites"])
+    fig = geo_data.fig
+    assert [frame.name for frame in fig.frames] == [  # noqa: S101
+        "2024-01", "2024-02", "2024-03",
+    ]
+    assert list(fig.frames[2].data[0].z) == [7, 6, 8]  # noqa: S101
+    assert fig.frames[2].data[0].locations is None  # noqa: S101
+    assert fig.layout.coloraxis.cmax == 8  # noqa: PLR2004, S101
+    assert len(fig.layout.sliders[0].steps) == 3  # noqa: PLR2004, S101
+
+    # Rebuild figure after periods were modified
+    geo_data.data["Enrollment Month"] = \
+        geo_data.data["Enrollment Month"].str.replace("2024", "2025")
+    geo_data.build_figure(period="Enrollment Month", hover_data=["Sites"])
+    assert geo_data.fig.frames[0].name == "2025-01"  # noqa: S101
+
+    # Accept a single column name as hover data
+    geo_data.build_figure(period="Enrollment Month", hover_data="Sites")
+    assert list(geo_data.fig.frames[2].data[0].customdata[:, 0]) == [  # noqa: S101
+        17, 16, 18,
+    ]
+
+    # Refuse several rows for a country and a period
+    geo_data = GeoData.from_frame(data.assign(Month="2024-01"))
+    with pytest.raises(ValueError, match="several rows"):
+        geo_data.build_figure(period="Month")
+
+# Share data with worker processes without copy
+def _count_rows(shared: SharedData) -> int:
+    """Attach to shared data in a worker process and count rows."""
+    return len(shared.attach().data)
+
+
+def test_publish() -> None:
+    """Test publish method of GeoData class from pyclinsci package."""
+    pytest.importorskip("pyarrow")
+
+    # Publish data and attach them in worker processes
+    geo_data = GeoData(file_path="examples/output/geodata_europe.xlsx")
+    with geo_data.publish() as shared:
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            counts = list(pool.map(_count_rows, [shared] * 2))
+        assert counts == [len(geo_data.data)] * 2  # noqa: S101
+
+        # Attach read-only views of the published data
+        attached = shared.attach()
+        assert attached.data["ISO3"].equals(geo_data.data["ISO3"])  # noqa: S101
+        assert not attached.data["Data"].to_numpy().flags.writeable  # noqa: S101
+
+    # Remove published file when the owner handle exits
+    assert not shared.path.exists()  # noqa: S101
+    assert len(attached.data) == len(geo_data.data)  # noqa: S101
+    with pytest.raises(ValueError, match="cannot be attached"):
+        shared.attach()
+
+# Run partitioned functions across processes
+def _double(data: DataFrame) -> Series:
+    """Double data of a partition."""
+    return data["Data"] * 2
+
+
+def _country_count(data: DataFrame) -> int:
+    """Count countries of a partition."""
+    return data["Country"].nunique()
+
+
+def test_partitions() -> None:
+    """Test partitioned execution of GeoData class from pyclinsci package."""
+    pytest.importorskip("pyarrow")
+
+    # Map partitions by rows, keeping the index of rows
+    geo_data = GeoData(file_path="examples/output/geodata_europe.xlsx")
+    doubled = geo_data.map_partitions(_double, partitions=3, max_workers=2)
+    assert doubled.equals(geo_data.data["Data"] * 2)  # noqa: S101
+
+    # Reduce partitions split by key, so that keys are not shared
+    for executor in ["thread", "process"]:
+        countries = geo_data.reduce(
+            _country_count,
+            operator.add,
+            partitions=3,
+            by="Country",
+            max_workers=2,
+            executor=executor,
+        )
+        assert countries == geo_data.data["Country"].nunique()  # noqa: S101
+
+    # Aggregate metrics by group across partitions
+    data = DataFrame({"Site": [1, 2, 1, 2, 1], "Age": [30, 40, 50, 60, 70]})
+    result = GeoData.from_frame(data.assign(Country="France")).groupby_agg(
+        "Site",
+        {"Patients": "count", "Age": ("median", "Age")},
+        partitions=2,
+        max_workers=2,
+    )
+    assert list(result["Patients"]) == [3, 2]  # noqa: S101
+    assert list(result["Age"]) == [50, 50]  # noqa: S101
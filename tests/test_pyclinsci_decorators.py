@@ -0,0 +1,63 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+"""Test decorators from pyclinsci package."""
+
+# Import modules, functions, constants
+import asyncio
+import json
+import tracemalloc
+
+from pyclinsci import (
+    config_logging,
+    method_exec_dur,
+    profiler,
+)
+
+# Initialize logging in this file
+logger = config_logging(console="TRACE")
+
+# Define profiled functions
+@method_exec_dur
+def inner(size: int) -> list[int]:
+    """Allocate a list of integers."""
+    return list(range(size))
+
+@method_exec_dur
+def outer(size: int) -> int:
+    """Call inner function twice."""
+    return len(inner(size)) + len(inner(size))
+
+@method_exec_dur
+async def outer_async(size: int) -> int:
+    """Call inner function from a coroutine."""
+    await asyncio.sleep(0)
+    return len(inner(size))
+
+# Aggregate execution statistics of decorated functions
+def test_profiler() -> None:
+    """Test profiler of method_exec_dur decorator from pyclinsci package."""
+    # Record calls of decorated functions
+    profiler.reset()
+    outer(10)
+    assert profiler.stats == {}  # noqa: S101
+    with profiler.profile(trace_memory=True):
+        outer(100_000)
+        asyncio.run(outer_async(10))
+
+    # Control aggregated statistics
+    summary = json.loads(profiler.report(fmt="json"))
+    assert outer.__name__ == "outer"  # noqa: S101
+    assert summary["inner"]["calls"] == 3  # noqa: PLR2004, S101
+    assert summary["inner"]["parents"] == {"outer": 2, "outer_async": 1}  # noqa: S101
+    assert summary["outer"]["peak_memory"] > 0  # noqa: S101
+    assert "outer_async" in profiler.report()  # noqa: S101
+    profiler.reset()
+
+    # Leave memory tracing started by the caller running
+    tracemalloc.start()
+    try:
+        with profiler.profile(trace_memory=True):
+            outer(10)
+        assert tracemalloc.is_tracing()  # noqa: S101
+    finally:
+        tracemalloc.stop()
+    profiler.reset()
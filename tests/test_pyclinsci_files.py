@@ -0,0 +1,110 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+"""Test file selection and parallel ingestion from pyclinsci package."""
+
+# Import modules, functions, constants
+from pathlib import Path
+
+from openpyxl import load_workbook
+from pandas import ExcelWriter
+from pyclinsci import (
+    GeoData,
+    config_logging,
+    select_files,
+)
+
+# Initialize logging in this file
+logger = config_logging(console="TRACE")
+
+# Select files of a directory and load them in parallel
+def test_load_many(tmp_path: Path) -> None:
+    """Test select_files function and load_many method of GeoData class."""
+    # Split reference data in several files
+    ref_data = GeoData(
+        file_path="examples/output/geodata_europe.xlsx",
+        cache=False,
+    )
+    columns = [col for col in ref_data.data.columns if col != "ISO3"]
+    (tmp_path / "sub").mkdir()
+    for idx, file_name in enumerate(["a.csv", "b.csv", "sub/c.csv"]):
+        ref_data.data[columns].iloc[idx::3].to_csv(
+            tmp_path / file_name,
+            index=False,
+        )
+    (tmp_path / "notes.txt").write_text("Not a data file")
+
+    # Select files with glob pattern, regex and recursion
+    assert [  # noqa: S101
+        path.name for path in select_files(tmp_path, pattern="*.csv")
+    ] == ["a.csv", "b.csv"]
+    assert len(select_files(tmp_path, "*.csv", recursive=True)) == 3  # noqa: PLR2004, S101
+    assert [  # noqa: S101
+        path.name for path in select_files(tmp_path, regex=r"[ab]\.csv")
+    ] == ["a.csv", "b.csv"]
+
+    # Load files with threads and processes
+    file_paths = select_files(tmp_path, "*.csv", recursive=True)
+    for executor in ["thread", "process"]:
+        instances = GeoData.load_many(
+            file_paths,
+            max_workers=2,
+            executor=executor,
+            cache=False,
+        )
+        assert sum(len(inst.data) for inst in instances) == len(ref_data.data)  # noqa: S101
+
+    # Load and concatenate files, keeping categorical columns
+    geo_data = GeoData.load_many(file_paths, concat=True, cache=False)
+    assert len(geo_data.data) == len(ref_data.data)  # noqa: S101
+    assert geo_data.data["ISO3"].dtype == "category"  # noqa: S101
+    assert set(geo_data.data["Source"]) == {str(p) for p in file_paths}  # noqa: S101
+
+# Load sheets of a workbook in parallel
+def test_load_sheets(tmp_path: Path) -> None:
+    """Test load_sheets method of GeoData class from pyclinsci package."""
+    # Split reference data in one sheet per site
+    ref_data = GeoData(
+        file_path="examples/output/geodata_europe.xlsx",
+        cache=False,
+    )
+    columns = [col for col in ref_data.data.columns if col != "ISO3"]
+    file_path = tmp_path / "sites.xlsx"
+    with ExcelWriter(file_path) as writer:
+        for idx in range(3):
+            ref_data.data[columns].iloc[idx::3].to_excel(
+                writer,
+                sheet_name=f"Site {idx}",
+                index=False,
+            )
+
+    # Load selected sheets by name and index
+    sheets = GeoData.load_sheets(file_path, sheet_names=["Site 2", 0])
+    assert list(sheets) == ["Site 2", "Site 0"]  # noqa: S101
+    assert len(sheets["Site 0"].data) == len(ref_data.data[::3])  # noqa: S101
+    assert "ISO3" in sheets["Site 2"].data  # noqa: S101
+
+    # Refresh a sheet after rows were appended
+    workbook = load_workbook(file_path)
+    workbook["Site 0"].append(["France", 1.0])
+    workbook.save(file_path)
+    assert sheets["Site 0"].refresh() == 1  # noqa: S101
+
+    # Load and concatenate all sheets with threads
+    geo_data = GeoData.load_sheets(
+        file_path,
+        executor="thread",
+        concat=True,
+        key_name="Site",
+    )
+    assert len(geo_data.data) == len(ref_data.data) + 1  # noqa: S101
+    assert geo_data.data["Site"].nunique() == 3  # noqa: PLR2004, S101
+
+    # Reload a sheet read with arguments not supported by chunks
+    typed_data = GeoData(
+        file_path=file_path,
+        read_args={"dtype": {"Data": "float64"}},
+        cache=False,
+    )
+    workbook["Site 0"].append(["Spain", 2.0])
+    workbook.save(file_path)
+    assert typed_data.refresh() == len(sheets["Site 0"].data) + 1  # noqa: S101
+
@@ -0,0 +1,29 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+"""Test import of pyclinsci package."""
+
+# Import modules, functions, constants
+import json
+import subprocess
+import sys
+
+
+# Import package without its heavy dependencies
+def test_lazy_import() -> None:
+    """Test lazy import of pyclinsci package."""
+    # Import package in a fresh interpreter
+    code  = "import sys, json\n"
+    code += "import pyclinsci\n"
+    code += "modules = [mod for mod in ('PyQt6', 'plotly', 'pandas') "
+    code += "if mod in sys.modules]\n"
+    code += "print(json.dumps({'modules': modules}))\n"
+    code += "pyclinsci.GeoData\n"
+    result = subprocess.run(
+        [sys.executable, "-c", code],  # noqa: S603
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    result = json.loads(result.stdout)
+
+    # Control imported modules (import duration is measured by benchmarks)
+    assert result["modules"] == []  # noqa: S101
@@ -0,0 +1,78 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+"""Test file loaders from pyclinsci package."""
+
+# Import modules, functions, constants
+from pathlib import Path
+
+import pytest
+from pandas import DataFrame
+from pyclinsci import (
+    GeoData,
+    config_logging,
+)
+
+# Initialize logging in this file
+logger = config_logging(console="TRACE")
+
+# Load the same data from different file formats
+def test_loaders(tmp_path: Path) -> None:
+    """Test loaders of GenericData class from pyclinsci package."""
+    pytest.importorskip("pyarrow")
+
+    # Export reference data in different formats
+    ref_data = GeoData(
+        file_path="examples/output/geodata_europe.xlsx",
+        cache=False,
+    )
+    columns = [col for col in ref_data.data.columns if col != "ISO3"]
+    ref_data.data[columns].to_csv(tmp_path / "geo.csv", index=False)
+    ref_data.data[columns].to_parquet(tmp_path / "geo.parquet")
+    ref_data.data[columns].to_feather(tmp_path / "geo.data")
+
+    # Load data with column, row and filter pushdown
+    country = ref_data.data["Country"].iloc[0]
+    for file_name, file_format in [
+        ("geo.csv"    , None     ),
+        ("geo.parquet", None     ),
+        ("geo.data"   , "feather"),
+    ]:
+        tmp_data = GeoData(
+            file_path  =tmp_path / file_name,
+            file_format=file_format,
+            read_args  ={"filters": [("Country", "==", country)]},
+            cache      =False,
+        )
+        assert tmp_data.data["Country"].tolist() == [country]  # noqa: S101
+        tmp_data = GeoData(
+            file_path  =tmp_path / file_name,
+            file_format=file_format,
+            read_args  ={"usecols": ["Country"], "nrows": 2},
+            cache      =False,
+        )
+        assert tmp_data.data.shape == (2, 2)  # noqa: S101
+
+# Fold files read by chunks into per-country counts
+def test_stream(tmp_path: Path) -> None:
+    """Test streaming of GeoData class from pyclinsci package."""
+    pytest.importorskip("pyarrow")
+
+    # Build patient-level data from reference data
+    ref_data = GeoData.from_stream(
+        file_path ="examples/output/geodata_europe.xlsx",
+        chunk_size=7,
+    )
+    countries = ref_data.data["Country"].tolist()
+    patients = DataFrame({"Country": countries * 3, "Age": 50})
+    patients.to_csv(tmp_path / "patients.csv", index=False)
+    patients.to_parquet(tmp_path / "patients.parquet", row_group_size=5)
+
+    # Read patient-level data by chunks
+    assert set(ref_data.data["Data"]) == {1}  # noqa: S101
+    for file_name in ["patients.csv", "patients.parquet"]:
+        tmp_data = GeoData.from_stream(
+            file_path =tmp_path / file_name,
+            chunk_size=4,
+            read_args ={"usecols": ["Country"]},
+        )
+        assert set(tmp_data.data["Data"]) == {3}  # noqa: S101
+        assert "ISO3" in tmp_data.data  # noqa: S101
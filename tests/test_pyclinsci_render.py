@@ -0,0 +1,35 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+"""Test batch rendering from pyclinsci package."""
+
+# Import modules, functions, constants
+from pathlib import Path
+
+from pyclinsci import (
+    FigureSpec,
+    config_logging,
+    render_figures,
+)
+
+# Initialize logging in this file
+logger = config_logging(console="TRACE")
+
+# Build and save figures across processes
+def test_render_figures(tmp_path: Path) -> None:
+    """Test render_figures function from pyclinsci package."""
+    # Render one figure per scope
+    specs = [
+        FigureSpec(
+            name       =f"geodata_{scope}",
+            file_path  ="examples/output/geodata_europe.xlsx",
+            figure_args={"scope": scope},
+        )
+        for scope in ["europe", "world"]
+    ]
+    paths = render_figures(specs, tmp_path, formats=["html", "json"])
+
+    # Control HTML files reference the shared plotly.js bundle
+    assert (tmp_path / "plotly.min.js").is_file()  # noqa: S101
+    html_path = paths["geodata_europe"][0]
+    assert html_path.stat().st_size < 100_000  # noqa: PLR2004, S101
+    assert 'src="plotly.min.js"' in html_path.read_text()  # noqa: S101
+    assert paths["geodata_world"][1].suffix == ".json"  # noqa: S101
@@ -2,6 +2,10 @@
 """Test settings from pyclinsci package."""
 
 # Import modules, functions, constants
+import json
+from pathlib import Path
+
+import pytest
 from pyclinsci import (
     MODULE_PATH,
     __version__,
@@ -28,3 +32,31 @@ def test_package_version() -> None:
     log_txt  = f"MODULE_PATH: {MODULE_PATH}\n__version__: {__version__}\n"
     log_txt += f"__version_info__: {__version_info__}"
     logger.info(log_txt)
+
+# Log from a background thread with sampling of hot loops
+def test_queued_logging(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test high-throughput logging mode from pyclinsci package."""
+    # Log messages in a hot loop
+    monkeypatch.chdir(tmp_path)
+    queued_logger = config_logging(
+        file       ="DEBUG",
+        json_file  ="DEBUG",
+        enqueue    =True,
+        sample_rate=5,
+    )
+    for idx in range(100):
+        log_txt = f"Message {idx}"
+        queued_logger.debug(log_txt)
+    queued_logger.warning("A warning message.")
+    queued_logger.complete()
+    config_logging(console="TRACE")
+
+    # Control sampled messages in structured log file
+    lines = (tmp_path / "pyclinsci.json.log").read_text().splitlines()
+    messages = [json.loads(line)["record"]["message"] for line in lines]
+    assert "Message 4" in messages  # noqa: S101
+    assert "Message 5" not in messages  # noqa: S101
+    assert "A warning message." in messages  # noqa: S101
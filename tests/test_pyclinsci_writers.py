@@ -0,0 +1,108 @@
+# Copyright 2024 pyclinsci authors. See license.md file for details.
+"""Test file writers from pyclinsci package."""
+
+# Import modules, functions, constants
+from pathlib import Path
+
+import pytest
+from pandas import (
+    DataFrame,
+    read_csv,
+    read_excel,
+    read_feather,
+    read_parquet,
+)
+from pyclinsci import (
+    GeoData,
+    config_logging,
+    write_file,
+)
+
+# Initialize logging in this file
+logger = config_logging(console="TRACE")
+
+# Export the same data in different file formats
+def test_export(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test export method of GeoData class from pyclinsci package."""
+    pytest.importorskip("pyarrow")
+
+    # Add an unknown country to reference data
+    ref_data = GeoData(
+        file_path="examples/output/geodata_europe.xlsx",
+        cache=False,
+    )
+    data = DataFrame({"Country": ["Atlantis"], "Data": [1]})
+    ref_data.append(data)
+
+    # Export data by chunks and load them back
+    for file_name, compression in [
+        ("geo.xlsx"   , None  ),
+        ("geo.csv"    , "gzip"),
+        ("geo.parquet", "zstd"),
+        ("geo.feather", "lz4" ),
+    ]:
+        file_paths = ref_data.export(
+            tmp_path / file_name,
+            chunk_size=10,
+            compression=compression,
+        )
+        tmp_data = GeoData(
+            file_path  =file_paths[0],
+            file_format="csv" if compression == "gzip" else None,
+            read_args  ={"compression": "gzip"} if compression == "gzip" \
+                else {},
+            cache      =False,
+        )
+        assert len(tmp_data.data) == len(ref_data.data)  # noqa: S101
+        assert list(tmp_data.data["ISO3"].astype(str)) == \
+            list(ref_data.data["ISO3"].astype(str))  # noqa: S101
+
+    # Export diagnostics in a sheet or in a separate file
+    diagnostics = read_excel(tmp_path / "geo.xlsx", sheet_name="Countries")
+    assert list(diagnostics["Name"]) == ["Atlantis"]  # noqa: S101
+    assert file_paths[1] == tmp_path / "geo.Countries.feather"  # noqa: S101
+
+    # Split rows of full sheets in continuation sheets
+    monkeypatch.setattr("pyclinsci._writers.EXCEL_MAX_ROWS", 10)
+    write_file(iter([data] * 25), tmp_path / "split.xlsx")
+    sheets = read_excel(tmp_path / "split.xlsx", sheet_name=None)
+    assert list(sheets) == ["Data", "Data (2)", "Data (3)"]  # noqa: S101
+    assert len(sheets["Data (3)"]) == 5  # noqa: PLR2004, S101
+
+    # Write chunks to a CSV file and refuse unknown formats
+    write_file(iter([data, data]), tmp_path / "rows.csv")
+    assert len(read_csv(tmp_path / "rows.csv")) == 2  # noqa: PLR2004, S101
+    with pytest.raises(ValueError, match="cannot be written"):
+        write_file(data, tmp_path / "data.json")
+
+# Write chunks with different column types in columnar files
+def test_export_types(tmp_path: Path) -> None:
+    """Test columnar writers with chunks of different column types."""
+    pyarrow = pytest.importorskip("pyarrow")
+    first = DataFrame({"Country": ["France"], "Data": [1]})
+    missing = DataFrame({"Country": [None], "Data": [float("nan")]})
+    decimal = DataFrame({"Country": ["Spain"], "Data": [1.5]})
+
+    # Cast missing values to the schema of the first chunk
+    write_file(iter([first, missing]), tmp_path / "geo.parquet")
+    data = read_parquet(tmp_path / "geo.parquet")
+    assert list(data["Country"]) == ["France", None]  # noqa: S101
+    assert data["Data"].isna().tolist() == [False, True]  # noqa: S101
+
+    # Refuse lossy conversions and remove the partial file
+    with pytest.raises(ValueError, match="cannot be converted"):
+        write_file(iter([first, decimal]), tmp_path / "lossy.feather")
+    assert not (tmp_path / "lossy.feather").exists()  # noqa: S101
+
+    # Write the same chunks with an explicit schema
+    schema = pyarrow.schema([
+        ("Country", pyarrow.string()),
+        ("Data"   , pyarrow.float64()),
+    ])
+    write_file(
+        iter([first, decimal]),
+        tmp_path / "schema.feather",
+        schema=schema,
+    )
+    data = read_feather(tmp_path / "schema.feather")
+    assert list(data["Data"]) == [1.0, 1.5]  # noqa: S101